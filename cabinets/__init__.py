@@ -1,11 +1,15 @@
 import os
 from pathlib import Path, PurePath
-from typing import Union, Type, Any, List
+from typing import Union, Type, Any, List, Iterable, Tuple, BinaryIO, Iterator
 
 from cabinets import plugins
+from cabinets.batch import BatchResult, run_batch
 from cabinets.cabinet import (
     Cabinet,
     CabinetError,
+    DEFAULT_CHUNK_SIZE,
+    FileInfo,
+    NotModified,
     register_protocols,
     SUPPORTED_PROTOCOLS,
 )
@@ -15,22 +19,33 @@ from cabinets.parser import (
     register_extensions,
     SUPPORTED_EXTENSIONS,
 )
+from cabinets.syncing import SyncResult, is_modified
 
 __all__ = [
+    BatchResult,
     Cabinet,
     CabinetError,
+    FileInfo,
+    NotModified,
     Parser,
     register_protocols,
     register_extensions,
     SUPPORTED_PROTOCOLS,
     SUPPORTED_EXTENSIONS,
+    SyncResult,
 ]
 
 PLUGIN_PATH = os.environ.get('PLUGIN_PATH', os.path.join(os.getcwd(), 'cabinets'))
 if PLUGIN_PATH == os.path.dirname(__file__):
     PLUGIN_PATH = None
 
-PROTOCOLS, EXTENSIONS = plugins.discover_all(custom_plugin_path=PLUGIN_PATH)
+# directory of the plugin discovery index, set to an empty string to disable it
+PLUGIN_INDEX_DIR = os.environ.get('PLUGIN_INDEX_DIR', os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+    'cabinets'))
+
+PROTOCOLS, EXTENSIONS = plugins.discover_all(custom_plugin_path=PLUGIN_PATH,
+                                             index_dir=PLUGIN_INDEX_DIR or None)
 # TODO: May want to ensure that there is no overlap in keys
 SUPPORTED_PROTOCOLS.update(PROTOCOLS)
 SUPPORTED_EXTENSIONS.update(EXTENSIONS)
@@ -99,8 +114,58 @@ def set_configuration(protocol, **kwargs):
     return cabinet_cls.set_configuration(**kwargs)
 
 
+def set_cache(protocol: str, max_bytes: Union[int, None], ttl: float = None):
+    """
+    Cache raw file contents read using a protocol in memory. See
+    `Cabinet.set_cache`.
+
+    :param str protocol: Protocol identifier of Cabinet
+    :param Union[int, None] max_bytes: Maximum total size of cached files, `None` to
+        disable caching
+    :param float ttl: Seconds after which a cached file is read again, `None` to
+        keep files until evicted
+    :return LRUCache: New cache, whose `stats()` reports hits, misses and
+        evictions, or `None` if caching was disabled
+    """
+    cabinet_cls = SUPPORTED_PROTOCOLS.get(protocol)
+    if not cabinet_cls:
+        raise CabinetError(f"Unsupported protocol: '{protocol}'")
+    return cabinet_cls.set_cache(max_bytes, ttl=ttl)
+
+
+def set_coalescing(protocol: str, enabled: bool = True, parse: bool = False):
+    """
+    Coalesce concurrent reads of the same file using a protocol. See
+    `Cabinet.set_coalescing`.
+
+    :param str protocol: Protocol identifier of Cabinet
+    :param bool enabled: `True` to coalesce reads, `False` to stop
+    :param bool parse: `True` to also parse the file only once for concurrent reads
+    """
+    cabinet_cls = SUPPORTED_PROTOCOLS.get(protocol)
+    if not cabinet_cls:
+        raise CabinetError(f"Unsupported protocol: '{protocol}'")
+    cabinet_cls.set_coalescing(enabled, parse=parse)
+
+
+def set_memoization(max_bytes: Union[int, None], copy: bool = True):
+    """
+    Memoize parsed objects, so byte-identical content is only parsed once. See
+    `Parser.set_memoization`.
+
+    :param Union[int, None] max_bytes: Maximum total size of content whose parsed
+        objects are kept, `None` to disable memoization
+    :param bool copy: `True` to return a deep copy of the memoized object on every
+        read, `False` to return the memoized object itself, which must then not be
+        modified
+    :return LRUCache: New cache, or `None` if memoization was disabled
+    """
+    return Parser.set_memoization(max_bytes, copy=copy)
+
+
 def read(uri: Union[str, Path], parser: Union[bool, Type[Parser]] = True,
-         **kwargs: Any):
+         byte_range: Tuple[int, Union[int, None]] = None, if_none_match: str = None,
+         if_modified_since: float = None, with_info: bool = False, **kwargs: Any):
     """
     Read file contents.
 
@@ -109,12 +174,107 @@ def read(uri: Union[str, Path], parser: Union[bool, Type[Parser]] = True,
     :param Union[bool, Type[Parser]] parser: `True` for parsing using default
         file extension Parser, `False` for no parsing, a `Parser` subclass for
         parsing using given parser
+    :param Tuple[int, Union[int, None]] byte_range: Only read bytes `start` up to
+        but excluding `end` of the file, or up to the end of the file if `end` is
+        `None`
+    :param str if_none_match: Only read the file if its ETag is different
+    :param float if_modified_since: Only read the file if it was modified after this
+        time, in seconds since the epoch
+    :param bool with_info: `True` to also return the `FileInfo` of the version read,
+        whose `etag` and `last_modified` can be passed back as conditions
     :param kwargs: Extra keyword arguments for `Cabinet` or `Parser` subclass
         methods
-    :return Any: Parsed object read from file
+    :raises NotModified: If the file is unchanged according to the conditions
+    :return Any: Parsed object read from file, or a tuple of it and its `FileInfo`
+        if `with_info`
+    """
+    cabinet_, path = from_uri(uri)
+    return cabinet_.read(path, parser=parser, byte_range=byte_range,
+                         if_none_match=if_none_match,
+                         if_modified_since=if_modified_since, with_info=with_info,
+                         **kwargs)
+
+
+def open(uri: Union[str, Path], **kwargs: Any) -> BinaryIO:
+    """
+    Open a file for streaming its raw contents.
+
+    :param Union[str, Path] uri: Path to file including protocol identifier prefix (
+        protocol://) or Path object
+    :param kwargs: Extra keyword arguments for `Cabinet` subclass methods
+    :return BinaryIO: Binary file-like object, to be closed by the caller
+    """
+    cabinet_, path = from_uri(uri)
+    return cabinet_.open_content(path, **kwargs)
+
+
+def read_stream(uri: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                **kwargs: Any) -> Iterator[bytes]:
+    """
+    Read raw file contents in chunks, holding about one chunk in memory at a
+    time.
+
+    :param Union[str, Path] uri: Path to file including protocol identifier prefix (
+        protocol://) or Path object
+    :param int chunk_size: Maximum size of each chunk in bytes
+    :param kwargs: Extra keyword arguments for `Cabinet` subclass methods
+    :return Iterator[bytes]: Chunks of raw file contents
     """
     cabinet_, path = from_uri(uri)
-    return cabinet_.read(path, parser=parser, **kwargs)
+    return cabinet_.read_stream(path, chunk_size=chunk_size, **kwargs)
+
+
+def read_many(uris: Iterable[Union[str, Path]],
+              parser: Union[bool, Type[Parser]] = True, max_workers: int = None,
+              ordered: bool = True, **kwargs: Any):
+    """
+    Read the contents of many files concurrently.
+
+    Raw contents are fetched on a bounded thread pool and parsed using the same
+    rules as `read`. A failure is reported in the `BatchResult` of its URI and
+    does not abort the rest of the batch.
+
+    :param Iterable[Union[str, Path]] uris: Paths to files including protocol
+        identifier prefix (protocol://) or Path objects
+    :param Union[bool, Type[Parser]] parser: `True` for parsing using default
+        file extension Parser, `False` for no parsing, a `Parser` subclass for
+        parsing using given parser
+    :param int max_workers: Maximum number of concurrent reads
+    :param bool ordered: `True` to return a list in input order, `False` to
+        return an iterator yielding results as they complete
+    :param kwargs: Extra keyword arguments for `Cabinet` or `Parser` subclass
+        methods
+    :return: `BatchResult` for each URI, holding the parsed object as its value
+    """
+    tasks = [(str(uri), _reader(uri, parser, kwargs)) for uri in uris]
+    return run_batch(tasks, max_workers=max_workers, ordered=ordered)
+
+
+def iter_read(directory_uri: Union[str, Path],
+              parser: Union[bool, Type[Parser]] = True, prefetch: int = 4,
+              **kwargs: Any) -> Iterator[Tuple[str, Any]]:
+    """
+    Read every file in a directory, yielding each filename and parsed object in
+    listing order. Up to `prefetch` files are fetched and parsed ahead of the
+    caller, so reading overlaps with whatever the caller does with each object,
+    while holding at most `prefetch + 1` objects in memory.
+
+    :param Union[str, Path] directory_uri: Path to directory including protocol
+        identifier prefix (protocol://) or Path object
+    :param Union[bool, Type[Parser]] parser: `True` for parsing using default
+        file extension Parser, `False` for no parsing, a `Parser` subclass for
+        parsing using given parser
+    :param int prefetch: Maximum number of files read ahead of the caller
+    :param kwargs: Extra keyword arguments for `Cabinet` or `Parser` subclass
+        methods
+    :return Iterator[Tuple[str, Any]]: Pairs of filename and parsed object
+    """
+    cabinet_, dir = from_uri(directory_uri)
+    return cabinet_.iter_read(dir, parser=parser, prefetch=prefetch, **kwargs)
+
+
+def _reader(uri, parser, kwargs):
+    return lambda: read(uri, parser=parser, **kwargs)
 
 
 def create(uri: Union[str, Path], content: Any,
@@ -137,6 +297,157 @@ def create(uri: Union[str, Path], content: Any,
     return cabinet_.create(path, content, parser=parser, **kwargs)
 
 
+def create_many(items: Iterable[Tuple[Union[str, Path], Any]],
+                parser: Union[bool, Type[Parser]] = True, max_workers: int = None,
+                ordered: bool = True, **kwargs: Any):
+    """
+    Create many files concurrently.
+
+    Each item is serialized and written by its own task on a bounded thread
+    pool, so serializing one payload overlaps with uploading others. A failure
+    is reported in the `BatchResult` of its URI and does not abort the rest of
+    the batch. A `Cabinet` reporting failure by returning `False` from
+    `create_content` is treated as failed.
+
+    :param Iterable[Tuple[Union[str, Path], Any]] items: Pairs of path to file
+        including protocol identifier prefix (protocol://) or Path object, and
+        content to write
+    :param Union[bool, Type[Parser]] parser: `True` for parsing using default
+        file extension Parser, `False` for no parsing, a `Parser` subclass for
+        parsing using given parser
+    :param int max_workers: Maximum number of concurrent writes
+    :param bool ordered: `True` to return a list in input order, `False` to
+        return an iterator yielding results as they complete
+    :param kwargs: Extra keyword arguments for `Cabinet` or `Parser` subclass
+        methods
+    :return: `BatchResult` for each URI
+    """
+    tasks = [(str(uri), _creator(uri, content, parser, kwargs))
+             for uri, content in items]
+    return run_batch(tasks, max_workers=max_workers, ordered=ordered)
+
+
+def _creator(uri, content, parser, kwargs):
+    def create_():
+        result = create(uri, content, parser=parser, **kwargs)
+        if result is False:
+            raise CabinetError(f"Cannot create '{uri}'")
+        return result
+
+    return create_
+
+
+def copy(src_uri: Union[str, Path], dst_uri: Union[str, Path],
+         chunk_size: int = DEFAULT_CHUNK_SIZE, **kwargs: Any):
+    """
+    Copy a file without parsing it. Within one protocol the cabinet copies the file
+    itself (server-side on S3, inside the kernel locally); across protocols the file
+    is streamed in chunks, holding only a bounded amount of it in memory.
+
+    :param Union[str, Path] src_uri: Path to source file including protocol
+        identifier prefix (protocol://) or Path object
+    :param Union[str, Path] dst_uri: Path to destination file including protocol
+        identifier prefix (protocol://) or Path object
+    :param int chunk_size: Size of chunks streamed between protocols in bytes
+    :param kwargs: Extra keyword arguments for `Cabinet` subclass methods
+    :return: Result of the copy; `False` if the cabinet reported failure
+    """
+    src_cabinet, src = from_uri(src_uri)
+    dst_cabinet, dst = from_uri(dst_uri)
+    if src_cabinet is dst_cabinet:
+        return src_cabinet.copy(src, dst, **kwargs)
+    chunks = src_cabinet.read_stream(src, chunk_size=chunk_size, **kwargs)
+    return dst_cabinet.create(dst, chunks, parser=False, **kwargs)
+
+
+def move(src_uri: Union[str, Path], dst_uri: Union[str, Path],
+         chunk_size: int = DEFAULT_CHUNK_SIZE, **kwargs: Any):
+    """
+    Move a file without parsing it. Within one protocol the cabinet moves the file
+    itself (a rename locally, a server-side copy and delete on S3); across
+    protocols the file is copied as with `copy`, then deleted. The source is kept
+    if the copy fails.
+
+    :param Union[str, Path] src_uri: Path to source file including protocol
+        identifier prefix (protocol://) or Path object
+    :param Union[str, Path] dst_uri: Path to destination file including protocol
+        identifier prefix (protocol://) or Path object
+    :param int chunk_size: Size of chunks streamed between protocols in bytes
+    :param kwargs: Extra keyword arguments for `Cabinet` subclass methods
+    :return: Result of the copy; `False` if the cabinet reported failure
+    """
+    src_cabinet, src = from_uri(src_uri)
+    dst_cabinet, dst = from_uri(dst_uri)
+    if src_cabinet is dst_cabinet:
+        return src_cabinet.move(src, dst, **kwargs)
+    result = copy(src_uri, dst_uri, chunk_size=chunk_size, **kwargs)
+    if result is not False:
+        src_cabinet.delete(src, **kwargs)
+    return result
+
+
+def sync(src_dir_uri: Union[str, Path], dst_dir_uri: Union[str, Path],
+         delete: bool = False, max_workers: int = None, **kwargs: Any) -> SyncResult:
+    """
+    Make a destination directory match a source directory, copying only files
+    which are missing or changed. Both directories are listed recursively, and
+    files are compared by size, then ETag or modification time (see
+    `cabinets.syncing.is_modified`), without reading them. Changed files are copied
+    concurrently with `copy`, so they are copied server-side within S3.
+
+    :param Union[str, Path] src_dir_uri: Path to source directory including
+        protocol identifier prefix (protocol://) or Path object
+    :param Union[str, Path] dst_dir_uri: Path to destination directory including
+        protocol identifier prefix (protocol://) or Path object
+    :param bool delete: `True` to also delete destination files missing from the
+        source
+    :param int max_workers: Maximum number of concurrent listings and copies
+    :param kwargs: Extra keyword arguments for `Cabinet` subclass methods
+    :return SyncResult: Results of the copies and deletes
+    """
+    src_files = _walk_detailed(src_dir_uri, max_workers)
+    try:
+        dst_files = _walk_detailed(dst_dir_uri, max_workers)
+    except FileNotFoundError:
+        dst_files = {}
+
+    changed = [name for name, info in src_files.items()
+               if name not in dst_files or is_modified(info, dst_files[name])]
+    tasks = [(_join_uri(dst_dir_uri, name),
+              _copier(_join_uri(src_dir_uri, name), _join_uri(dst_dir_uri, name),
+                      kwargs))
+             for name in changed]
+    copied = run_batch(tasks, max_workers=max_workers)
+
+    deleted = []
+    if delete:
+        deleted = delete_many([_join_uri(dst_dir_uri, name)
+                               for name in dst_files if name not in src_files],
+                              max_workers=max_workers, **kwargs)
+    return SyncResult(copied, deleted, len(src_files) - len(changed))
+
+
+def _walk_detailed(directory_uri, max_workers):
+    cabinet_, dir = from_uri(directory_uri)
+    # relative paths use '/' whatever the protocol, so that both sides compare
+    return {info.name.replace(os.sep, '/'): info
+            for info in cabinet_.walk(dir, max_workers=max_workers, detailed=True)}
+
+
+def _join_uri(directory_uri, name):
+    return f"{str(directory_uri).rstrip('/')}/{name}"
+
+
+def _copier(src_uri, dst_uri, kwargs):
+    def copy_():
+        result = copy(src_uri, dst_uri, **kwargs)
+        if result is False:
+            raise CabinetError(f"Cannot copy '{src_uri}' to '{dst_uri}'")
+        return result
+
+    return copy_
+
+
 def delete(uri: Union[str, Path], **kwargs: Any):
     """
     Delete a file.
@@ -150,6 +461,56 @@ def delete(uri: Union[str, Path], **kwargs: Any):
     return cabinet_.delete(path, **kwargs)
 
 
+def delete_many(uris: Iterable[Union[str, Path]], max_workers: int = None,
+                **kwargs: Any) -> List[BatchResult]:
+    """
+    Delete many files, using the bulk delete API of a protocol where there is one
+    (such as S3 `DeleteObjects`) and concurrent deletes otherwise. A file which
+    cannot be deleted is reported in its `BatchResult` and does not abort the rest
+    of the batch.
+
+    :param Iterable[Union[str, Path]] uris: Paths to files including protocol
+        identifier prefix (protocol://) or Path objects
+    :param int max_workers: Maximum number of concurrent requests per protocol
+    :param kwargs: Extra keyword arguments for `Cabinet` subclass methods
+    :return List[BatchResult]: Result for each URI, in input order
+    """
+    uris = [*uris]
+    results = [None] * len(uris)
+    groups = {}
+    for index, uri in enumerate(uris):
+        try:
+            cabinet_, path = from_uri(uri)
+        except Exception as ex:
+            results[index] = BatchResult(str(uri), error=ex)
+            continue
+        groups.setdefault(cabinet_, []).append((index, path))
+    for cabinet_, items in groups.items():
+        cabinet_results = cabinet_.delete_many([path for _, path in items],
+                                               max_workers=max_workers, **kwargs)
+        for (index, _), result in zip(items, cabinet_results):
+            results[index] = result._replace(uri=str(uris[index]))
+    return results
+
+
+def delete_prefix(directory_uri: Union[str, Path], max_workers: int = None,
+                  **kwargs: Any) -> List[BatchResult]:
+    """
+    Delete all files below a directory, including those in subdirectories. On S3,
+    this deletes every object whose key starts with the directory, one page of the
+    listing at a time.
+
+    :param Union[str, Path] directory_uri: Path to directory including protocol
+        identifier prefix (protocol://) or Path object
+    :param int max_workers: Maximum number of concurrent requests
+    :param kwargs: Extra keyword arguments for `Cabinet` subclass methods
+    :return List[BatchResult]: Result for each file found, identified by its path
+        within the protocol's cabinet
+    """
+    cabinet_, dir = from_uri(directory_uri)
+    return cabinet_.delete_prefix(dir, max_workers=max_workers, **kwargs)
+
+
 def list(directory_uri: Union[str, Path], **kwargs: Any) -> List[str]:
     """
     List files in a directory. Will not include subdirectories.
@@ -162,3 +523,70 @@ def list(directory_uri: Union[str, Path], **kwargs: Any) -> List[str]:
     """
     cabinet_, dir = from_uri(directory_uri)
     return cabinet_.list(dir, **kwargs)
+
+
+def list_detailed(directory_uri: Union[str, Path], **kwargs: Any) -> List[FileInfo]:
+    """
+    List files in a directory along with their size, modification time and ETag,
+    in a single listing rather than one request per file. Will not include
+    subdirectories.
+
+    :param Union[str, Path] directory_uri: Path to directory including protocol
+        identifier prefix (protocol://) or Path object
+    :param kwargs: Extra keyword arguments for `Cabinet` subclass methods
+    :return List[FileInfo]: Metadata of the files in directory
+    """
+    cabinet_, dir = from_uri(directory_uri)
+    return cabinet_.list_detailed(dir, **kwargs)
+
+
+def stat(uri: Union[str, Path], **kwargs: Any) -> FileInfo:
+    """
+    Get the size, modification time and ETag of a file without reading it.
+
+    :param Union[str, Path] uri: Path to file including protocol identifier prefix (
+        protocol://) or Path object
+    :param kwargs: Extra keyword arguments for `Cabinet` subclass methods
+    :return FileInfo: Metadata of the file
+    """
+    cabinet_, path = from_uri(uri)
+    return cabinet_.stat(path, **kwargs)
+
+
+def iter_list(directory_uri: Union[str, Path], **kwargs: Any) -> Iterator[str]:
+    """
+    Lazily list files in a directory, yielding filenames as they are found, so that
+    very large directories can be processed without holding the whole listing in
+    memory. Will not include subdirectories.
+
+    :param Union[str, Path] directory_uri: Path to directory including protocol
+        identifier prefix (protocol://) or Path object
+    :param kwargs: Extra keyword arguments for `Cabinet` subclass methods
+    :return Iterator[str]: Filenames in directory
+    """
+    cabinet_, dir = from_uri(directory_uri)
+    return cabinet_.iter_list(dir, **kwargs)
+
+
+def walk(directory_uri: Union[str, Path], max_depth: int = None,
+         max_workers: int = None, detailed: bool = False,
+         **kwargs: Any) -> Iterator[Union[str, FileInfo]]:
+    """
+    Recursively list files below a directory. Subdirectories are scanned
+    concurrently, and files are yielded as soon as their directory is scanned, in
+    no particular order.
+
+    :param Union[str, Path] directory_uri: Path to directory including protocol
+        identifier prefix (protocol://) or Path object
+    :param int max_depth: Maximum number of subdirectory levels to descend into,
+        `None` for no limit
+    :param int max_workers: Maximum number of directories scanned at once
+    :param bool detailed: `True` to yield the metadata of each file, as
+        `list_detailed` does, rather than its path
+    :param kwargs: Extra keyword arguments for `Cabinet` subclass methods
+    :return Iterator[Union[str, FileInfo]]: File paths relative to the directory,
+        or metadata named by those paths
+    """
+    cabinet_, dir = from_uri(directory_uri)
+    return cabinet_.walk(dir, max_depth=max_depth, max_workers=max_workers,
+                         detailed=detailed, **kwargs)
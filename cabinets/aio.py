@@ -0,0 +1,46 @@
+"""
+Asyncio interface to `cabinets`.
+
+Each function mirrors the function of the same name in the top-level `cabinets`
+module as a coroutine, so file operations can be awaited without blocking the
+event loop.
+"""
+from pathlib import Path
+from typing import Union, Type, Any, List
+
+from cabinets import from_uri
+from cabinets.parser import Parser
+
+
+async def read(uri: Union[str, Path], parser: Union[bool, Type[Parser]] = True,
+               **kwargs: Any):
+    """
+    Read file contents. See `cabinets.read`.
+    """
+    cabinet_, path = from_uri(uri)
+    return await cabinet_.read_async(path, parser=parser, **kwargs)
+
+
+async def create(uri: Union[str, Path], content: Any,
+                 parser: Union[bool, Type[Parser]] = True, **kwargs: Any):
+    """
+    Create a file. See `cabinets.create`.
+    """
+    cabinet_, path = from_uri(uri)
+    return await cabinet_.create_async(path, content, parser=parser, **kwargs)
+
+
+async def delete(uri: Union[str, Path], **kwargs: Any):
+    """
+    Delete a file. See `cabinets.delete`.
+    """
+    cabinet_, path = from_uri(uri)
+    return await cabinet_.delete_async(path, **kwargs)
+
+
+async def list(directory_uri: Union[str, Path], **kwargs: Any) -> List[str]:
+    """
+    List files in a directory. See `cabinets.list`.
+    """
+    cabinet_, dir = from_uri(directory_uri)
+    return await cabinet_.list_async(dir, **kwargs)
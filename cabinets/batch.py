@@ -0,0 +1,137 @@
+import itertools
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, ThreadPoolExecutor, as_completed,
+                                wait)
+from typing import (Any, Callable, Hashable, Iterable, Iterator, NamedTuple, Optional,
+                    Tuple)
+
+
+class BatchResult(NamedTuple):
+    """
+    Outcome of a single item of a batch operation.
+
+    :param str uri: URI (or path) the item refers to
+    :param Any value: Value produced for the item, if it succeeded
+    :param Exception error: Exception raised for the item, if it failed
+    """
+    uri: str
+    value: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def iter_batch(tasks: Iterable[Tuple[str, Callable[[], Any]]],
+               max_workers: int = None) -> Iterator[Tuple[int, BatchResult]]:
+    """
+    Run tasks concurrently on a bounded thread pool, yielding results in
+    completion order. A failing task is reported through its `BatchResult`
+    instead of aborting the remaining tasks.
+
+    :param tasks: Pairs of URI and zero-argument callable producing its value
+    :param int max_workers: Maximum number of tasks run at once
+    :return: Iterator of input index and `BatchResult` pairs
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fn): (index, uri)
+                   for index, (uri, fn) in enumerate(tasks)}
+        for future in as_completed(futures):
+            index, uri = futures[future]
+            try:
+                yield index, BatchResult(uri, value=future.result())
+            except Exception as ex:
+                yield index, BatchResult(uri, error=ex)
+
+
+def run_batch(tasks: Iterable[Tuple[str, Callable[[], Any]]],
+              max_workers: int = None, ordered: bool = True):
+    """
+    Run tasks concurrently, returning results in input order or as a
+    completion-ordered iterator.
+
+    :param tasks: Pairs of URI and zero-argument callable producing its value
+    :param int max_workers: Maximum number of tasks run at once
+    :param bool ordered: `True` for a list in input order, `False` for an
+        iterator yielding results as they complete
+    :return: List or iterator of `BatchResult`
+    """
+    tasks = [*tasks]
+    if not ordered:
+        return (result for _, result in iter_batch(tasks, max_workers))
+    results = [None] * len(tasks)
+    for index, result in iter_batch(tasks, max_workers):
+        results[index] = result
+    return results
+
+
+def iter_prefetched(tasks: Iterable[Tuple[Hashable, Callable[[], Any]]],
+                    prefetch: int) -> Iterator[Tuple[Hashable, Any]]:
+    """
+    Run tasks ahead of the caller, yielding results in input order. While the
+    caller handles one result, up to `prefetch` further tasks run or wait with
+    their result, so at most `prefetch + 1` results are held at a time. Tasks are
+    taken from `tasks` lazily, as room frees up.
+
+    :param tasks: Pairs of key and zero-argument callable producing its value
+    :param int prefetch: Maximum number of tasks run ahead of the caller
+    :return: Iterator of key and value pairs
+    :raises Exception: Exception of a failed task, once its result is reached
+    """
+    if prefetch < 1:
+        raise ValueError('Argument `prefetch` must be at least 1')
+    tasks = iter(tasks)
+    with ThreadPoolExecutor(max_workers=prefetch) as executor:
+        pending = deque((key, executor.submit(fn))
+                        for key, fn in itertools.islice(tasks, prefetch))
+        try:
+            while pending:
+                key, future = pending.popleft()
+                # refill the window before waiting, so the next task runs while
+                # the caller handles this result
+                for next_key, fn in itertools.islice(tasks, 1):
+                    pending.append((next_key, executor.submit(fn)))
+                yield key, future.result()
+        finally:
+            # stop running tasks once the caller stops iterating or a task fails
+            for _, future in pending:
+                future.cancel()
+
+
+def iter_tree(scan: Callable[[str], Tuple[Iterable[Any], Iterable[str]]],
+              join: Callable[[str, str], str], max_depth: int = None,
+              max_workers: int = None) -> Iterator[Tuple[str, Any]]:
+    """
+    Traverse a tree of directories concurrently, scanning every directory found as
+    soon as a worker is free rather than one level at a time. Files are yielded in
+    completion order, as each directory finishes scanning.
+
+    :param scan: Callable listing the directory at a relative path (`''` for the
+        root), returning its files and the names of its subdirectories
+    :param join: Callable joining a relative path and a subdirectory name
+    :param int max_depth: Maximum number of subdirectory levels to descend into,
+        `None` for no limit
+    :param int max_workers: Maximum number of directories scanned at once
+    :return: Iterator of pairs of relative directory path and file, as returned by
+        `scan`
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(scan, ''): ('', 0)}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    relative, depth = pending.pop(future)
+                    files, subdirectories = future.result()
+                    for file in files:
+                        yield relative, file
+                    if max_depth is not None and depth >= max_depth:
+                        continue
+                    for name in subdirectories:
+                        path = join(relative, name)
+                        pending[executor.submit(scan, path)] = (path, depth + 1)
+        finally:
+            # stop scanning once the caller stops iterating or a scan fails
+            for future in pending:
+                future.cancel()
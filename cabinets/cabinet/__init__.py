@@ -1,17 +1,53 @@
+import copy
+import functools
+import hashlib
 import inspect
+import io
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from contextlib import closing
 from pathlib import Path
-from typing import Union, Type, Any, List
+from typing import (Union, Type, Any, List, BinaryIO, Hashable, Iterator, Iterable,
+                    NamedTuple, Optional, Tuple)
 
-from cabinets.parser import Parser
+from cabinets import metrics
+from cabinets.batch import BatchResult, iter_prefetched, iter_tree, run_batch
+from cabinets.cache import LRUCache
+from cabinets.logger import debug
+from cabinets.parser import Parser, is_bytes_like
+from cabinets.registry import LazyRegistry
+from cabinets.singleflight import SingleFlight
 
-SUPPORTED_PROTOCOLS = {}
+SUPPORTED_PROTOCOLS = LazyRegistry()
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
 
 
 class CabinetError(Exception):
     pass
 
 
+class NotModified(CabinetError):
+    """Raised by a conditional read when the file has not changed"""
+
+
+class FileInfo(NamedTuple):
+    """
+    Metadata of a file, as returned by `stat` and `list_detailed`.
+
+    :param str name: Name of the file, relative to the listed directory
+    :param int size: Size of the file in bytes
+    :param float last_modified: Time of last modification in seconds since the
+        epoch, `None` if unknown
+    :param str etag: Entity tag or checksum of the contents, `None` if the cabinet
+        does not provide one
+    """
+    name: str
+    size: int
+    last_modified: Optional[float] = None
+    etag: Optional[str] = None
+
+
 def register_protocols(*protocols):
     def decorate_cabinet(cabinet):
         try:
@@ -48,8 +84,80 @@ def _separate_kwargs(**kwargs):
     return cabinet_kwargs, parser_kwargs
 
 
+def _check_byte_range(byte_range) -> Tuple[int, Union[int, None]]:
+    """Validate a `(start, end)` byte range, where `end` may be `None`"""
+    try:
+        start, end = byte_range
+    except (TypeError, ValueError):
+        raise CabinetError("Argument `byte_range` must be a `(start, end)` pair")
+    if start < 0 or (end is not None and end < start):
+        raise CabinetError(f"Invalid byte range {tuple(byte_range)}")
+    return start, end
+
+
+def _check_modified(path, info: FileInfo, if_none_match: str = None,
+                    if_modified_since: float = None):
+    """
+    Raise `NotModified` if a file is unchanged according to the conditions. As in
+    HTTP, `if_modified_since` is ignored when `if_none_match` is given.
+    """
+    if if_none_match is not None:
+        if info.etag == if_none_match:
+            raise NotModified(f'{path} matches ETag {if_none_match}')
+    elif if_modified_since is not None and info.last_modified is not None:
+        if info.last_modified <= if_modified_since:
+            raise NotModified(f'{path} is not modified since {if_modified_since}')
+
+
+def _flight_key(*parts) -> Optional[Hashable]:
+    """Key of a read to coalesce, `None` if its arguments are not hashable"""
+    try:
+        hash(parts)
+    except TypeError:
+        return None
+    return parts
+
+
+def _is_stream(content) -> bool:
+    """Whether content is a file-like object or an iterator of byte chunks"""
+    if isinstance(content, (bytes, bytearray, str)):
+        return False
+    return hasattr(content, 'read') or isinstance(content, Iterator)
+
+
+def _iter_chunks(content, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Iterate over the byte chunks of a file-like object or chunk iterator"""
+    if hasattr(content, 'read'):
+        chunk = content.read(chunk_size)
+        while chunk:
+            yield chunk
+            chunk = content.read(chunk_size)
+    else:
+        yield from content
+
+
+async def _run_in_executor(executor: Executor, fn, *args, **kwargs):
+    # imported here since `asyncio` is slow to import and only needed once an
+    # event loop is running
+    import asyncio
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(executor,
+                                      functools.partial(fn, *args, **kwargs))
+
+
 class Cabinet(ABC):
     _protocols = set()
+    # whether `read_content` accepts a `byte_range` argument, otherwise ranges
+    # are sliced from the whole file
+    _native_byte_range = False
+    # read-through cache of raw file contents, see `set_cache`
+    _cache: LRUCache = None
+    # executor running blocking calls of the async interface, `None` for the
+    # event loop's default executor
+    _executor: Executor = None
+    # coalesces concurrent reads of the same file, see `set_coalescing`
+    _single_flight: SingleFlight = None
+    _coalesce_parse = False
 
     @classmethod
     @abstractmethod
@@ -58,7 +166,9 @@ class Cabinet(ABC):
 
     @classmethod
     def read(cls, path: Union[str, Path], parser: Union[bool, Type[Parser]] = True,
-             **kwargs) -> Any:
+             byte_range: Tuple[int, Union[int, None]] = None,
+             if_none_match: str = None, if_modified_since: float = None,
+             with_info: bool = False, **kwargs) -> Any:
         """
         Read file contents using a specific protocol.
 
@@ -66,25 +176,209 @@ class Cabinet(ABC):
         :param Union[bool, Type[Parser]] parser: `True` for parsing using default
             file extension Parser, `False` for no parsing, a `Parser` subclass for
             parsing using given parser
+        :param Tuple[int, Union[int, None]] byte_range: Only read bytes `start` up to
+            but excluding `end` of the file, or up to the end of the file if `end`
+            is `None`
+        :param str if_none_match: Only read the file if its ETag is different
+        :param float if_modified_since: Only read the file if it was modified after
+            this time, in seconds since the epoch
+        :param bool with_info: `True` to also return the `FileInfo` of the version
+            read, whose `etag` and `last_modified` can be passed back as conditions
         :param dict kwargs: Extra keyword arguments for `Cabinet` or `Parser` subclass
             methods
-        :return Any: Parsed object read from file
+        :raises NotModified: If the file is unchanged according to the conditions
+        :return Any: Parsed object read from file, or a tuple of it and its
+            `FileInfo` if `with_info`
         """
+        plain = if_none_match is None and if_modified_since is None and not with_info
+        if plain and cls._coalesce_parse:
+            return cls._read_coalesced(path, parser, byte_range, **kwargs)
+        cabinet_kwargs, parser_kwargs = _separate_kwargs(**kwargs)
+        if plain:
+            content = cls._fetch_content(path, byte_range=byte_range,
+                                         **cabinet_kwargs)
+            return cls.parse(path, content, parser=parser, **parser_kwargs)
+        if byte_range is not None:
+            byte_range = _check_byte_range(byte_range)
+        # conditional reads bypass the content cache, which keeps no validators
+        content, info = cls.read_content_conditional(
+            path, byte_range=byte_range, if_none_match=if_none_match,
+            if_modified_since=if_modified_since, **cabinet_kwargs)
+        data = cls.parse(path, content, parser=parser, **parser_kwargs)
+        return (data, info) if with_info else data
+
+    @classmethod
+    def _read_coalesced(cls, path, parser, byte_range, **kwargs) -> Any:
+        """Fetch and parse a file once for all concurrent identical reads"""
         cabinet_kwargs, parser_kwargs = _separate_kwargs(**kwargs)
-        content = cls.read_content(path, **cabinet_kwargs)
-        if not isinstance(content, bytes):
-            raise ValueError("Content must have type `bytes`")
+
+        def read():
+            content = cls._fetch_content(path, byte_range=byte_range, **cabinet_kwargs)
+            return cls.parse(path, content, parser=parser, **parser_kwargs)
+
+        key = _flight_key('parsed', cls._normalize_path(path), byte_range, parser,
+                          tuple(sorted(kwargs.items())))
+        if key is None:
+            return read()
+        data, shared = cls._single_flight.do(key, read)
+        # callers may modify the objects they read, so each gets its own
+        return copy.deepcopy(data) if shared else data
+
+    @classmethod
+    def set_coalescing(cls, enabled: bool = True, parse: bool = False):
+        """
+        Coalesce concurrent reads of the same file, so that only the first reads it
+        while the others wait for and share its contents. Reads are only coalesced
+        while in flight: unlike `set_cache`, nothing is kept once they complete.
+
+        :param bool enabled: `True` to coalesce reads, `False` to stop
+        :param bool parse: `True` to also parse the file only once for concurrent
+            reads with the same parser; each caller gets a deep copy of the object
+        """
+        cls._single_flight = SingleFlight() if enabled else None
+        cls._coalesce_parse = enabled and parse
+
+    @classmethod
+    def set_cache(cls, max_bytes: Union[int, None], ttl: float = None) -> LRUCache:
+        """
+        Cache raw file contents read using this cabinet in memory, evicting the
+        least recently used files once their total size exceeds `max_bytes`.
+        Files created or deleted through `cabinets` are removed from the cache.
+
+        :param Union[int, None] max_bytes: Maximum total size of cached files,
+            `None` to disable caching
+        :param float ttl: Seconds after which a cached file is read again, `None`
+            to keep files until evicted
+        :return LRUCache: New cache, or `None` if caching was disabled
+        """
+        cls._cache = None if max_bytes is None else LRUCache(max_bytes, ttl=ttl)
+        return cls._cache
+
+    @classmethod
+    def _normalize_path(cls, path) -> str:
+        """Normalize a path, such that equal paths refer to the same file"""
+        return str(path)
+
+    @classmethod
+    def _invalidate(cls, path):
+        if cls._cache is not None:
+            cls._cache.invalidate(cls._normalize_path(path))
+
+    @classmethod
+    def _fetch_content(cls, path, byte_range=None, **kwargs) -> bytes:
+        if cls._single_flight is not None:
+            key = _flight_key(cls._normalize_path(path), byte_range,
+                              tuple(sorted(kwargs.items())))
+            if key is not None:
+                content, _ = cls._single_flight.do(
+                    key, lambda: cls._fetch_cached(path, byte_range, **kwargs))
+                return content
+        return cls._fetch_cached(path, byte_range, **kwargs)
+
+    @classmethod
+    def _fetch_cached(cls, path, byte_range=None, **kwargs) -> bytes:
+        cache = cls._cache
+        if cache is None:
+            return cls._read_range(path, byte_range, **kwargs)
+        key = cls._normalize_path(path)
+        version = cache.version
+        content = cache.get(key)
+        if content is None:
+            # a byte range does not tell us the whole file, so it is not cached
+            if byte_range is not None:
+                return cls._read_range(path, byte_range, **kwargs)
+            content = cls.read_content(path, **kwargs)
+            # only immutable contents are cached, as every reader shares them;
+            # memory-mapped views would also keep their file open
+            if isinstance(content, bytes):
+                cache.put(key, content, version=version)
+            return content
+        if byte_range is None:
+            return content
+        start, end = _check_byte_range(byte_range)
+        return content[start:end]
+
+    @classmethod
+    def _read_range(cls, path, byte_range=None, **kwargs) -> bytes:
+        if byte_range is None:
+            return cls.read_content(path, **kwargs)
+        start, end = _check_byte_range(byte_range)
+        if cls._native_byte_range:
+            return cls.read_content(path, byte_range=(start, end), **kwargs)
+        debug(f"{cls.__name__} cannot read byte ranges: slicing whole file")
+        metrics.increment('byte_range.fallback')
+        return cls.read_content(path, **kwargs)[start:end]
+
+    @classmethod
+    def parse(cls, path: Union[str, Path], content: bytes,
+              parser: Union[bool, Type[Parser]] = True, **parser_kwargs) -> Any:
+        """
+        Parse raw file contents read from this cabinet.
+
+        :param Union[str, Path] path: Path to file within cabinet
+        :param bytes content: Raw contents of the file, as `bytes` or any other
+            bytes-like object such as a `memoryview`
+        :param Union[bool, Type[Parser]] parser: `True` for parsing using default
+            file extension Parser, `False` for no parsing, a `Parser` subclass for
+            parsing using given parser
+        :param dict parser_kwargs: Extra keyword arguments for `Parser` subclass
+            methods
+        :return Any: Parsed object
+        """
+        if not is_bytes_like(content):
+            raise ValueError("Content must be a bytes-like object")
 
         if parser is True:
             return Parser.load(path, content, **parser_kwargs)
         elif parser is False:
             return content
         elif inspect.isclass(parser) and issubclass(parser, Parser):
-            return parser.load_content(content, **parser_kwargs)
+            return parser._load_content(content, **parser_kwargs)
         else:
             raise CabinetError(
                 'Argument `parser` must be `True`, `False` or a `Parser` subclass')
 
+    @classmethod
+    def iter_read(cls, directory: Union[str, Path],
+                  parser: Union[bool, Type[Parser]] = True, prefetch: int = 4,
+                  **kwargs) -> Iterator[Tuple[str, Any]]:
+        """
+        Read every file in a directory in listing order, fetching and parsing up to
+        `prefetch` files ahead of the caller so that reading overlaps with the
+        caller's work. Subdirectories are not read.
+
+        :param Union[str, Path] directory: Path to directory within cabinet
+        :param Union[bool, Type[Parser]] parser: Parser of each file, as in `read`
+        :param int prefetch: Maximum number of files read ahead of the caller
+        :param dict kwargs: Extra keyword arguments for `Cabinet` or `Parser`
+            subclass methods
+        :return Iterator[Tuple[str, Any]]: Pairs of filename and parsed object
+        :raises Exception: Exception of a failed read, once its file is reached
+        """
+        cabinet_kwargs, _ = _separate_kwargs(**kwargs)
+        tasks = ((name, functools.partial(cls.read, cls._join(directory, name),
+                                          parser=parser, **kwargs))
+                 for name in cls.iter_list(directory, **cabinet_kwargs))
+        return iter_prefetched(tasks, prefetch)
+
+    @classmethod
+    def read_stream(cls, path: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    **kwargs) -> Iterator[bytes]:
+        """
+        Read file contents in chunks using a specific protocol. Only about one
+        chunk is held in memory at a time when the cabinet supports streaming.
+
+        :param Union[str, Path] path: Path to file within cabinet
+        :param int chunk_size: Maximum size of each chunk in bytes
+        :param dict kwargs: Extra keyword arguments for `Cabinet` subclass methods
+        :return Iterator[bytes]: Chunks of raw file contents
+        """
+        with closing(cls.open_content(path, **kwargs)) as file:
+            chunk = file.read(chunk_size)
+            while chunk:
+                yield chunk
+                chunk = file.read(chunk_size)
+
     @classmethod
     def create(cls, path: Union[str, Path], content: Any,
                parser: Union[bool, Type[Parser]] = True, **kwargs):
@@ -92,7 +386,9 @@ class Cabinet(ABC):
         Create a file using a specific protocol.
 
         :param Union[str, Path] path: Path to file within cabinet
-        :param Any content: Content to write
+        :param Any content: Content to write. With `parser=False` this may also be a
+            binary file-like object or an iterator of `bytes` chunks, which is
+            written without loading it into memory all at once.
         :param Union[bool, Type[Parser]] parser: `True` for parsing using default
             file extension Parser, `False` for no parsing, a `Parser` subclass for
             parsing using given parser
@@ -101,6 +397,61 @@ class Cabinet(ABC):
         :return: None
         """
         cabinet_kwargs, parser_kwargs = _separate_kwargs(**kwargs)
+        payload = cls.serialize(path, content, parser=parser, **parser_kwargs)
+        try:
+            if _is_stream(payload):
+                return cls.create_stream(path, _iter_chunks(payload),
+                                         **cabinet_kwargs)
+            return cls.create_content(path, payload, **cabinet_kwargs)
+        finally:
+            cls._invalidate(path)
+
+    @classmethod
+    def copy(cls, src: Union[str, Path], dst: Union[str, Path], **kwargs):
+        """
+        Copy a file to another path within this cabinet, without parsing it.
+
+        :param Union[str, Path] src: Path to source file within cabinet
+        :param Union[str, Path] dst: Path to destination file within cabinet
+        :param dict kwargs: Extra keyword arguments for `Cabinet` subclass methods
+        :return: Result of `copy_content`
+        """
+        try:
+            return cls.copy_content(src, dst, **kwargs)
+        finally:
+            cls._invalidate(dst)
+
+    @classmethod
+    def move(cls, src: Union[str, Path], dst: Union[str, Path], **kwargs):
+        """
+        Move a file to another path within this cabinet, without parsing it.
+
+        :param Union[str, Path] src: Path to source file within cabinet
+        :param Union[str, Path] dst: Path to destination file within cabinet
+        :param dict kwargs: Extra keyword arguments for `Cabinet` subclass methods
+        :return: Result of `move_content`
+        """
+        try:
+            return cls.move_content(src, dst, **kwargs)
+        finally:
+            cls._invalidate(src)
+            cls._invalidate(dst)
+
+    @classmethod
+    def serialize(cls, path: Union[str, Path], content: Any,
+                  parser: Union[bool, Type[Parser]] = True, **parser_kwargs) -> Any:
+        """
+        Serialize content to the payload written by this cabinet.
+
+        :param Union[str, Path] path: Path to file within cabinet
+        :param Any content: Content to serialize
+        :param Union[bool, Type[Parser]] parser: `True` for parsing using default
+            file extension Parser, `False` for no parsing, a `Parser` subclass for
+            parsing using given parser
+        :param dict parser_kwargs: Extra keyword arguments for `Parser` subclass
+            methods
+        :return Any: Serialized payload
+        """
         if parser is True:
             payload = Parser.dump(path, content, **parser_kwargs)
         elif parser is False:
@@ -110,8 +461,7 @@ class Cabinet(ABC):
         else:
             raise CabinetError(
                 'Argument `parser` must be `True`, `False` or a `Parser` subclass')
-
-        return cls.create_content(path, payload, **cabinet_kwargs)
+        return payload
 
     @classmethod
     def delete(cls, path: Union[str, Path], **kwargs):
@@ -122,7 +472,52 @@ class Cabinet(ABC):
         :param dict kwargs: Extra keyword arguments for `Cabinet` or `Parser` subclass
             methods
         """
-        cls.delete_content(path, **kwargs)
+        try:
+            return cls.delete_content(path, **kwargs)
+        finally:
+            cls._invalidate(path)
+
+    @classmethod
+    def delete_many(cls, paths: Iterable[Union[str, Path]], max_workers: int = None,
+                    **kwargs) -> List[BatchResult]:
+        """
+        Delete many files concurrently. A file which cannot be deleted is reported
+        in its `BatchResult` and does not abort the rest of the batch. Cabinets with
+        a bulk delete API should override this; by default each file is deleted by
+        its own task on a bounded thread pool.
+
+        :param Iterable[Union[str, Path]] paths: Paths to files within cabinet
+        :param int max_workers: Maximum number of concurrent deletes
+        :param dict kwargs: Extra keyword arguments for `Cabinet` subclass methods
+        :return List[BatchResult]: Result for each path, in input order
+        """
+        tasks = [(path, functools.partial(cls._delete_or_raise, path, **kwargs))
+                 for path in paths]
+        return run_batch(tasks, max_workers=max_workers)
+
+    @classmethod
+    def _delete_or_raise(cls, path, **kwargs):
+        result = cls.delete(path, **kwargs)
+        if result is False:
+            raise CabinetError(f"Cannot delete '{path}'")
+        return result
+
+    @classmethod
+    def delete_prefix(cls, directory: Union[str, Path], max_workers: int = None,
+                      **kwargs) -> List[BatchResult]:
+        """
+        Delete all files below a directory, including those in subdirectories.
+        Directories themselves are left in place. By default the directory is
+        listed with `walk` and its files deleted with `delete_many`.
+
+        :param Union[str, Path] directory: Path to directory within cabinet
+        :param int max_workers: Maximum number of concurrent listings and deletes
+        :param dict kwargs: Extra keyword arguments for `Cabinet` subclass methods
+        :return List[BatchResult]: Result for the path of each file found
+        """
+        paths = [cls._join(directory, path)
+                 for path in cls.walk(directory, max_workers=max_workers, **kwargs)]
+        return cls.delete_many(paths, max_workers=max_workers, **kwargs)
 
     @classmethod
     def list(cls, directory: Union[str, Path], **kwargs) -> List[str]:
@@ -136,17 +531,273 @@ class Cabinet(ABC):
         """
         pass  # pragma: no cover
 
+    @classmethod
+    def iter_list(cls, directory: Union[str, Path], **kwargs) -> Iterator[str]:
+        """
+        Lazily list all files in a directory, yielding filenames as they are found.
+        Cabinets which can list incrementally should override this; by default the
+        whole listing is built with `list`.
+
+        :param Union[str, Path] directory: Path to directory within cabinet
+        :param dict kwargs: Extra keyword arguments for `Cabinet` subclass methods
+        :return Iterator[str]: Filenames in directory
+        """
+        yield from cls.list(directory, **kwargs)
+
+    @classmethod
+    def list_detailed(cls, directory: Union[str, Path], **kwargs) -> List[FileInfo]:
+        """
+        List all files in a directory along with their size, modification time and
+        ETag, as returned by the listing itself. This method will not list
+        folders (subdirectories), only files.
+
+        :param Union[str, Path] directory: Path to directory within cabinet
+        :param dict kwargs: Extra keyword arguments for `Cabinet` subclass methods
+        :return List[FileInfo]: Metadata of the files in directory
+        """
+        return [*cls.iter_list_detailed(directory, **kwargs)]
+
+    @classmethod
+    def iter_list_detailed(cls, directory: Union[str, Path],
+                           **kwargs) -> Iterator[FileInfo]:
+        """
+        Lazily list all files in a directory along with their metadata. Cabinets
+        whose listings include metadata should override this; by default each
+        listed file is passed to `stat`.
+
+        :param Union[str, Path] directory: Path to directory within cabinet
+        :param dict kwargs: Extra keyword arguments for `Cabinet` subclass methods
+        :return Iterator[FileInfo]: Metadata of the files in directory
+        """
+        for name in cls.iter_list(directory, **kwargs):
+            yield cls.stat(cls._join(directory, name), **kwargs)._replace(name=name)
+
+    @classmethod
+    def stat(cls, path: Union[str, Path], **kwargs) -> FileInfo:
+        """
+        Get the metadata of a file. Cabinets should override this; by default the
+        whole file is read to find its size.
+
+        :param Union[str, Path] path: Path to file within cabinet
+        :param dict kwargs: Extra keyword arguments for `Cabinet` subclass methods
+        :return FileInfo: Metadata of the file
+        """
+        debug(f'{cls.__name__} cannot stat files: reading {path} to find its size')
+        metrics.increment('stat.fallback')
+        content = cls.read_content(path, **kwargs)
+        return FileInfo(str(path).rsplit('/', 1)[-1], len(content))
+
+    @classmethod
+    def walk(cls, directory: Union[str, Path], max_depth: int = None,
+             max_workers: int = None, detailed: bool = False,
+             **kwargs) -> Iterator[Union[str, FileInfo]]:
+        """
+        Recursively list all files below a directory, scanning subdirectories
+        concurrently. Files are yielded as soon as their directory is scanned, so
+        their order is not deterministic.
+
+        :param Union[str, Path] directory: Path to directory within cabinet
+        :param int max_depth: Maximum number of subdirectory levels to descend
+            into, `None` for no limit; `0` lists the directory itself only
+        :param int max_workers: Maximum number of directories scanned at once
+        :param bool detailed: `True` to yield the metadata of each file, as
+            `list_detailed` does, rather than its path
+        :param dict kwargs: Extra keyword arguments for `Cabinet` subclass methods
+        :return Iterator[Union[str, FileInfo]]: File paths relative to the
+            directory, or metadata named by those paths
+        """
+        def scan(relative):
+            return cls._scan(cls._join(directory, relative), detailed=detailed,
+                             **kwargs)
+
+        tree = iter_tree(scan, cls._join, max_depth=max_depth,
+                         max_workers=max_workers)
+        if detailed:
+            return (file._replace(name=cls._join(relative, file.name))
+                    for relative, file in tree)
+        return (cls._join(relative, file) for relative, file in tree)
+
+    @classmethod
+    def _scan(cls, directory, detailed: bool = False,
+              **kwargs) -> Tuple[List[Union[str, FileInfo]], List[str]]:
+        """
+        List the files and the names of the subdirectories directly within a
+        directory, files as names or, if `detailed`, as `FileInfo`. Cabinets
+        override this to support `walk`.
+        """
+        raise CabinetError(f'{cls.__name__} cannot list subdirectories')
+
+    @classmethod
+    def _join(cls, directory, name) -> str:
+        """Join a directory and a name within it, as `walk` reports them"""
+        if not directory:
+            return name
+        if not name:
+            return str(directory)
+        return f"{str(directory).rstrip('/')}/{name}"
+
     @classmethod
     @abstractmethod
     def read_content(cls, path, **kwargs) -> bytes:
         pass  # pragma: no cover
 
+    @classmethod
+    def read_content_conditional(cls, path, byte_range=None, if_none_match=None,
+                                 if_modified_since=None,
+                                 **kwargs) -> Tuple[bytes, FileInfo]:
+        """
+        Read raw file contents unless unchanged, along with the `FileInfo` of the
+        version read. Cabinets which can check conditions before transferring
+        contents should override this; by default the whole file is read and its
+        ETag is a digest of its contents, so only parsing is saved, and
+        `if_modified_since` never matches.
+
+        :raises NotModified: If the file is unchanged according to the conditions
+        """
+        debug(f'{cls.__name__} cannot read conditionally: reading all of {path}')
+        metrics.increment('conditional_read.fallback')
+        content = cls.read_content(path, **kwargs)
+        etag = f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+        info = FileInfo(str(path).rsplit('/', 1)[-1], len(content), etag=etag)
+        _check_modified(path, info, if_none_match, if_modified_since)
+        if byte_range is not None:
+            start, end = _check_byte_range(byte_range)
+            content = content[start:end]
+        return content, info
+
+    @classmethod
+    def open_content(cls, path, **kwargs) -> BinaryIO:
+        """
+        Open a binary file-like object for reading raw file contents. Cabinets
+        which can stream should override this; by default the whole file is read
+        with `read_content` and wrapped in memory.
+        """
+        return io.BytesIO(cls.read_content(path, **kwargs))
+
     @classmethod
     @abstractmethod
     def create_content(cls, path, content, **kwargs):
         pass  # pragma: no cover
 
+    @classmethod
+    def create_stream(cls, path, chunks: Iterable[bytes], **kwargs):
+        """
+        Write raw file contents from an iterable of byte chunks. Cabinets which
+        can stream should override this; by default the chunks are joined in
+        memory and written with `create_content`.
+        """
+        return cls.create_content(path, b''.join(chunks), **kwargs)
+
+    @classmethod
+    def copy_content(cls, src, dst, **kwargs):
+        """
+        Copy raw file contents within the cabinet. Cabinets which can copy without
+        transferring the contents through this process should override this; by
+        default the file is streamed from `open_content` into `create_stream`.
+        """
+        with closing(cls.open_content(src, **kwargs)) as file:
+            return cls.create_stream(dst, _iter_chunks(file), **kwargs)
+
+    @classmethod
+    def move_content(cls, src, dst, **kwargs):
+        """
+        Move raw file contents within the cabinet. Cabinets which can rename files
+        should override this; by default the file is copied with `copy_content`,
+        then deleted unless the copy returned `False`.
+        """
+        result = cls.copy_content(src, dst, **kwargs)
+        if result is not False:
+            cls.delete_content(src, **kwargs)
+        return result
+
     @classmethod
     @abstractmethod
     def delete_content(cls, path, **kwargs):
         pass  # pragma: no cover
+
+    @classmethod
+    async def read_async(cls, path: Union[str, Path],
+                         parser: Union[bool, Type[Parser]] = True,
+                         byte_range: Tuple[int, Union[int, None]] = None,
+                         **kwargs) -> Any:
+        """
+        Read file contents using a specific protocol without blocking the event
+        loop. See `read`.
+        """
+        # coalescing relies on threads waiting for each other, so coalesced reads
+        # run in the executor as a whole
+        if (cls._single_flight is not None
+                or {'if_none_match', 'if_modified_since', 'with_info'} & kwargs.keys()):
+            return await _run_in_executor(cls._executor, cls.read, path,
+                                          parser=parser, byte_range=byte_range,
+                                          **kwargs)
+        cabinet_kwargs, parser_kwargs = _separate_kwargs(**kwargs)
+        if byte_range is None and cls._cache is None:
+            content = await cls.read_content_async(path, **cabinet_kwargs)
+        else:
+            content = await _run_in_executor(cls._executor, cls._fetch_content, path,
+                                             byte_range=byte_range, **cabinet_kwargs)
+        return cls.parse(path, content, parser=parser, **parser_kwargs)
+
+    @classmethod
+    async def create_async(cls, path: Union[str, Path], content: Any,
+                           parser: Union[bool, Type[Parser]] = True, **kwargs):
+        """
+        Create a file using a specific protocol without blocking the event loop.
+        See `create`.
+        """
+        cabinet_kwargs, parser_kwargs = _separate_kwargs(**kwargs)
+        payload = cls.serialize(path, content, parser=parser, **parser_kwargs)
+        try:
+            if _is_stream(payload):
+                return await _run_in_executor(cls._executor, cls.create_stream, path,
+                                              _iter_chunks(payload), **cabinet_kwargs)
+            return await cls.create_content_async(path, payload, **cabinet_kwargs)
+        finally:
+            cls._invalidate(path)
+
+    @classmethod
+    async def delete_async(cls, path: Union[str, Path], **kwargs):
+        """
+        Delete a file using a specific protocol without blocking the event loop.
+        See `delete`.
+        """
+        try:
+            return await cls.delete_content_async(path, **kwargs)
+        finally:
+            cls._invalidate(path)
+
+    @classmethod
+    async def list_async(cls, directory: Union[str, Path], **kwargs) -> List[str]:
+        """
+        List all files in a directory using a specific protocol without blocking
+        the event loop. See `list`.
+        """
+        return await _run_in_executor(cls._executor, cls.list, directory, **kwargs)
+
+    @classmethod
+    async def read_content_async(cls, path, **kwargs) -> bytes:
+        """
+        Coroutine version of `read_content`. Cabinets without a native
+        implementation run `read_content` in `_executor`.
+        """
+        return await _run_in_executor(cls._executor, cls.read_content, path,
+                                      **kwargs)
+
+    @classmethod
+    async def create_content_async(cls, path, content, **kwargs):
+        """
+        Coroutine version of `create_content`. Cabinets without a native
+        implementation run `create_content` in `_executor`.
+        """
+        return await _run_in_executor(cls._executor, cls.create_content, path,
+                                      content, **kwargs)
+
+    @classmethod
+    async def delete_content_async(cls, path, **kwargs):
+        """
+        Coroutine version of `delete_content`. Cabinets without a native
+        implementation run `delete_content` in `_executor`.
+        """
+        return await _run_in_executor(cls._executor, cls.delete_content, path,
+                                      **kwargs)
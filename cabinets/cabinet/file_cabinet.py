@@ -1,31 +1,147 @@
+import errno
+import mmap
 import os
-from typing import List
+import shutil
+from typing import List, BinaryIO, Iterable, Iterator, Tuple, Union
 
-from cabinets.cabinet import register_protocols, Cabinet
+from cabinets.cabinet import register_protocols, Cabinet, FileInfo, _check_modified
+
+
+def _map_file(file, byte_range=None) -> memoryview:
+    """Map a file into memory, returning a read-only view of its contents"""
+    try:
+        view = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+    except ValueError:
+        # empty files cannot be mapped
+        view = memoryview(b'')
+    if byte_range is None:
+        return view
+    start, end = byte_range
+    return view[start:end]
 
 
 @register_protocols('file')
 class FileCabinet(Cabinet):
+    _native_byte_range = True
+
+    @classmethod
+    def _normalize_path(cls, path) -> str:
+        return os.path.abspath(os.path.normpath(path))
+
     @classmethod
-    def read_content(cls, path, **kwargs) -> bytes:
+    def read_content(cls, path, byte_range=None, mmap=False, **kwargs) -> bytes:
         # TODO: Investigate if binary read mode is always okay
         with open(os.path.normpath(path), 'rb') as file:
-            return file.read()
+            if mmap:
+                return _map_file(file, byte_range)
+            if byte_range is None:
+                return file.read()
+            start, end = byte_range
+            file.seek(start)
+            return file.read(-1 if end is None else end - start)
 
     @classmethod
-    def create_content(cls, path, content, **kwargs):
+    def read_content_conditional(cls, path, byte_range=None, if_none_match=None,
+                                 if_modified_since=None, **kwargs):
+        # a file changing between the stat and the read is returned with the
+        # older metadata, so it is at worst read again by the next conditional read
+        info = cls.stat(path)
+        _check_modified(path, info, if_none_match, if_modified_since)
+        return cls.read_content(path, byte_range=byte_range, **kwargs), info
+
+    @classmethod
+    def open_content(cls, path, **kwargs) -> BinaryIO:
+        return open(os.path.normpath(path), 'rb')
+
+    @classmethod
+    def _ensure_parent_exists(cls, path):
         dirs = os.path.dirname(os.path.normpath(path))
         if dirs:
             os.makedirs(dirs, exist_ok=True)
+
+    @classmethod
+    def create_content(cls, path, content, **kwargs):
+        cls._ensure_parent_exists(path)
         mode = 'w' if isinstance(content, str) else 'wb'
         with open(os.path.normpath(path), mode) as file:
             file.write(content)
 
+    @classmethod
+    def create_stream(cls, path, chunks: Iterable[bytes], **kwargs):
+        cls._ensure_parent_exists(path)
+        with open(os.path.normpath(path), 'wb') as file:
+            for chunk in chunks:
+                file.write(chunk)
+
+    @classmethod
+    def copy_content(cls, src, dst, **kwargs):
+        cls._ensure_parent_exists(dst)
+        # copies within the kernel (`sendfile` on Linux, `fcopyfile` on macOS)
+        shutil.copyfile(os.path.normpath(src), os.path.normpath(dst))
+
+    @classmethod
+    def move_content(cls, src, dst, **kwargs):
+        cls._ensure_parent_exists(dst)
+        try:
+            os.replace(os.path.normpath(src), os.path.normpath(dst))
+        except OSError as ex:
+            # files cannot be renamed across filesystems
+            if ex.errno != errno.EXDEV:
+                raise
+            super().move_content(src, dst, **kwargs)
+
     @classmethod
     def delete_content(cls, path, **kwargs):
         os.remove(os.path.normpath(path))
 
     @classmethod
     def list(cls, directory, **kwargs) -> List[str]:
-        return [f for f in os.listdir(directory) if
-                os.path.isfile(os.path.join(directory, f))]
+        return [*cls.iter_list(directory, **kwargs)]
+
+    @classmethod
+    def iter_list(cls, directory, **kwargs) -> Iterator[str]:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    yield entry.name
+
+    @classmethod
+    def iter_list_detailed(cls, directory, **kwargs) -> Iterator[FileInfo]:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    yield cls._file_info(entry.name, entry.stat())
+
+    @classmethod
+    def stat(cls, path, **kwargs) -> FileInfo:
+        return cls._file_info(os.path.basename(path), os.stat(path))
+
+    @staticmethod
+    def _file_info(name, stat: os.stat_result) -> FileInfo:
+        # files have no ETag of their own: like web servers, derive a weak one from
+        # the modification time and size, which changes whenever the file does
+        etag = f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        return FileInfo(name, stat.st_size, stat.st_mtime, etag)
+
+    @classmethod
+    def _scan(cls, directory, detailed: bool = False,
+              **kwargs) -> Tuple[List[Union[str, FileInfo]], List[str]]:
+        files, subdirectories = [], []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # like `os.walk`, do not follow symbolic links to directories,
+                # which could lead into cycles
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.name)
+                elif entry.is_file():
+                    files.append(cls._file_info(entry.name, entry.stat()) if detailed
+                                 else entry.name)
+        return files, subdirectories
+
+    @classmethod
+    def _join(cls, directory, name) -> str:
+        if not directory:
+            return name
+        if not name:
+            return str(directory)
+        return os.path.join(directory, name)
@@ -1,30 +1,329 @@
-from typing import List
+import io
+import itertools
+import threading
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import (Callable, Dict, List, BinaryIO, Iterable, Iterator, Tuple,
+                    TypeVar, Union)
 
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
-from cabinets.cabinet import register_protocols, Cabinet
+from cabinets.batch import BatchResult
+from cabinets.cabinet import (register_protocols, Cabinet, CabinetError, FileInfo,
+                              NotModified, _check_modified)
+from cabinets.disk_cache import DiskCache
+from cabinets.latency import Attempt, LatencyTracker, hedged_call
+from cabinets.limiter import AdaptiveLimiter, get_limiter
 from cabinets.logger import info, error
+from cabinets.parser import is_bytes_like
+
+
+MB = 1024 * 1024
+# maximum number of parts of a multipart upload
+MAX_PARTS = 10000
+T = TypeVar('T')
+_DONE = object()
+# default of configuration parameters which may be set to `None`
+_UNSET = object()
+_CREDENTIALS = ('aws_access_key_id', 'aws_secret_access_key', 'aws_session_token')
+# listings fetch their next page here while the current one is being consumed;
+# these threads only ever call S3, so they cannot deadlock on each other
+_list_executor = ThreadPoolExecutor(max_workers=4,
+                                    thread_name_prefix='cabinets-s3-list')
+
+
+def _prefetch(items: Iterable[T]) -> Iterator[T]:
+    """Iterate over `items`, fetching each next item in the background"""
+    items = iter(items)
+    future = _list_executor.submit(next, items, _DONE)
+    while True:
+        item = future.result()
+        if item is _DONE:
+            return
+        future = _list_executor.submit(next, items, _DONE)
+        yield item
+
+
+def _iter_parts(chunks: Iterable[bytes], part_size: int) -> Iterator[bytes]:
+    """Regroup byte chunks into parts of `part_size` bytes, except the last"""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= part_size:
+            yield bytes(buffer[:part_size])
+            del buffer[:part_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+class _BufferReader(io.RawIOBase):
+    """Seekable binary file reading a slice of a buffer, without copying it"""
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._view[self._position:self._position + len(buffer)]
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position,
+                io.SEEK_END: len(self._view)}[whence]
+        self._position = max(base + offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+
+def _buffer_parts(content, part_size: int) -> Iterator[_BufferReader]:
+    """Split bytes-like content into parts of `part_size` bytes, except the last"""
+    view = memoryview(content).cast('B')
+    for offset in range(0, len(view), part_size):
+        yield _BufferReader(view[offset:offset + part_size])
+
+
+def _part_size(size: int, chunksize: int) -> int:
+    """
+    Size of the parts of a multipart transfer of `size` bytes: `chunksize`, or
+    larger whole megabytes if that would need more than `MAX_PARTS` parts
+    """
+    minimum = -(-size // MAX_PARTS)
+    if minimum <= chunksize:
+        return chunksize
+    return -(-minimum // MB) * MB
+
+
+def _error_code(ex: ClientError) -> str:
+    return ex.response.get('Error', {}).get('Code')
+
+
+_THROTTLE_CODES = frozenset({'SlowDown', 'Throttling', 'ThrottlingException',
+                             'RequestLimitExceeded', 'ServiceUnavailable', '503'})
+
+
+def _mark_sent(request, **kwargs):
+    """botocore `before-send` handler, recording when each attempt is sent"""
+    request.context['cabinets_sent'] = time.monotonic()
+
+
+def _object_size(response) -> int:
+    """Total size of an object from a ranged `get_object` response"""
+    content_range = response.get('ContentRange')
+    if not content_range:
+        return response.get('ContentLength')
+    return int(content_range.rsplit('/', 1)[1])
 
 
 @register_protocols('s3')
 class S3Cabinet(Cabinet):
+    # default client, used for every request
     client = None
+    # session shared by all clients, and clients created from it by region and
+    # endpoint; botocore clients are thread-safe, so each is created only once
+    _session: boto3.session.Session = None
+    _credentials = {}
+    _clients = {}
+    _client_lock = threading.RLock()
+    region_name = None
+    endpoint_url = None
+    # connection pool of each client, large enough for the async executor and a
+    # multipart transfer to run at the same time without discarding connections
+    max_pool_connections = 50
+    connect_timeout = 10
+    read_timeout = 60
+    tcp_keepalive = True
+    # throttling (`SlowDown`, 503) and transient errors are retried by botocore
+    # with jittered exponential backoff, up to `max_attempts` requests in total
+    retry_mode = 'standard'
+    max_attempts = 5
+    # when set, a GET whose response has not started within this percentile of
+    # recent times to first byte is sent a second time, and the first response
+    # is used
+    hedge_percentile = None
+    _latency = LatencyTracker()
+    # hedged GETs run here, on as many threads as pooled connections, together
+    # with the size it was created for; these threads only ever call S3, so they
+    # cannot deadlock on each other
+    _hedge_pool: Tuple[int, ThreadPoolExecutor] = (0, None)
+    _native_byte_range = True
+    # S3 calls of the async interface get their own threads, so they neither
+    # starve nor are starved by other work on the event loop's default executor;
+    # there are fewer of them than pooled connections, leaving connections for a
+    # multipart transfer running at the same time
+    _executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix='cabinets-s3')
+
+    # uploads at least this large use a multipart upload, and objects larger
+    # than this are downloaded as concurrent ranged GETs
+    multipart_threshold = 8 * MB
+    # size of each part of a multipart transfer, at least 5 MB for uploads as
+    # required by S3
+    multipart_chunksize = 8 * MB
+    # maximum number of parts transferred at once, which also bounds the number
+    # of part buffers held in memory
+    max_concurrency = 10
+    # maximum number of keys S3 accepts in one `delete_objects` request
+    delete_batch_size = 1000
+    # persistent local cache of downloaded objects, revalidated by ETag
+    _disk_cache: DiskCache = None
 
     @classmethod
     def _ensure_client_exists(cls):
         if not cls.client:
-            cls.client = boto3.client('s3')
+            with cls._client_lock:
+                if not cls.client:
+                    cls.client = cls.get_client()
+
+    @classmethod
+    def get_client(cls, region_name=None, endpoint_url=None):
+        """
+        Get the client of a region and endpoint, created from the shared session on
+        first use and reused afterwards.
+
+        :param str region_name: AWS region, the configured region by default
+        :param str endpoint_url: S3 endpoint, the configured endpoint by default
+        :return: boto3 S3 client
+        """
+        region_name = region_name or cls.region_name
+        endpoint_url = endpoint_url or cls.endpoint_url
+        key = (region_name, endpoint_url)
+        client = cls._clients.get(key)
+        if client is not None:
+            return client
+        with cls._client_lock:
+            if key not in cls._clients:
+                if cls._session is None:
+                    cls._session = boto3.session.Session()
+                config = Config(max_pool_connections=cls.max_pool_connections,
+                                connect_timeout=cls.connect_timeout,
+                                read_timeout=cls.read_timeout,
+                                tcp_keepalive=cls.tcp_keepalive,
+                                retries={'mode': cls.retry_mode,
+                                         'total_max_attempts': cls.max_attempts})
+                client = cls._session.client(
+                    's3', region_name=region_name, endpoint_url=endpoint_url,
+                    config=config)
+                # throttled attempts are retried within botocore, so they are
+                # reported to the limiter as they happen rather than once raised
+                client.meta.events.register('before-send.s3', _mark_sent)
+                client.meta.events.register('needs-retry.s3', cls._report_throttle)
+                cls._clients[key] = client
+            return cls._clients[key]
+
+    @classmethod
+    def _report_throttle(cls, response=None, request_dict=None, **kwargs):
+        """
+        botocore `needs-retry` handler, reporting every throttled attempt to the
+        limiter of its bucket. It never decides whether to retry, so returns `None`.
+        """
+        if response is None:
+            return None
+        _, parsed = response
+        context = request_dict['context']
+        bucket = context.get('input_params', {}).get('Bucket')
+        if bucket and parsed.get('Error', {}).get('Code') in _THROTTLE_CODES:
+            cls._limiter(bucket).record_throttle(
+                context.get('cabinets_sent', time.monotonic()))
+        return None
+
+    @classmethod
+    def _limiter(cls, bucket) -> AdaptiveLimiter:
+        """
+        Concurrency limiter shared by every request to a bucket, starting at
+        `max_concurrency` and bounded by the connection pool. Throttled attempts,
+        including the last one of a request that fails, are reported by
+        `_report_throttle`.
+        """
+        return get_limiter(f's3://{bucket}', initial=cls.max_concurrency,
+                           maximum=cls.max_pool_connections)
+
+    @classmethod
+    def _request(cls, operation: str, measure: bool = True, **params):
+        """
+        Call a client operation through the concurrency limiter of its bucket.
+        Operations transferring data, whose duration depends on its size, pass
+        `measure=False` so that it is not taken for rising latency.
+        """
+        with cls._limiter(params['Bucket']).slot(measure=measure):
+            return getattr(cls.client, operation)(**params)
 
     @classmethod
-    def set_configuration(cls, region_name=None, aws_access_key_id=None,
-                          aws_secret_access_key=None, aws_session_token=None):
-        cls.client = boto3.client('s3', region_name=region_name,
-                                  aws_access_key_id=aws_access_key_id,
-                                  aws_secret_access_key=aws_secret_access_key,
-                                  aws_session_token=aws_session_token)
+    def set_configuration(cls, region_name=_UNSET, aws_access_key_id=_UNSET,
+                          aws_secret_access_key=_UNSET, aws_session_token=_UNSET,
+                          multipart_threshold=None, multipart_chunksize=None,
+                          max_concurrency=None, cache_dir=None,
+                          cache_max_bytes=10 * 1024 * MB, endpoint_url=_UNSET,
+                          max_pool_connections=None, connect_timeout=None,
+                          read_timeout=None, tcp_keepalive=None, retry_mode=None,
+                          max_attempts=None, hedge_percentile=_UNSET):
+        """
+        Change the settings passed, keeping the others as previously configured.
+        Passing `None` as the region, endpoint or a credential resets it to its
+        default, and as `hedge_percentile` disables hedging.
+        """
+        resettable = {'region_name': region_name,
+                      'aws_access_key_id': aws_access_key_id,
+                      'aws_secret_access_key': aws_secret_access_key,
+                      'aws_session_token': aws_session_token,
+                      'endpoint_url': endpoint_url}
+        tunable = {'max_pool_connections': max_pool_connections,
+                   'connect_timeout': connect_timeout,
+                   'read_timeout': read_timeout,
+                   'tcp_keepalive': tcp_keepalive,
+                   'retry_mode': retry_mode,
+                   'max_attempts': max_attempts}
+        client_settings = {
+            **{name: value for name, value in resettable.items()
+               if value is not _UNSET},
+            **{name: value for name, value in tunable.items() if value is not None}}
+        # transfer and cache settings apply to existing clients, which are only
+        # replaced when the session or the clients themselves are reconfigured
+        if client_settings:
+            cls._configure_clients(**client_settings)
+        if multipart_threshold is not None:
+            cls.multipart_threshold = multipart_threshold
+        if multipart_chunksize is not None:
+            cls.multipart_chunksize = multipart_chunksize
+        if max_concurrency is not None:
+            cls.max_concurrency = max_concurrency
+        if cache_dir is not None:
+            cls._disk_cache = DiskCache(cache_dir, cache_max_bytes)
+        if hedge_percentile is not _UNSET:
+            cls.hedge_percentile = hedge_percentile
 
     @classmethod
-    def read_content(cls, path, **kwargs) -> bytes:
+    def _configure_clients(cls, **settings):
+        with cls._client_lock:
+            credentials = {name: settings.pop(name) for name in _CREDENTIALS
+                           if name in settings}
+            if credentials or cls._session is None:
+                cls._credentials = {**cls._credentials, **credentials}
+                cls._session = boto3.session.Session(**cls._credentials)
+            for name, value in settings.items():
+                setattr(cls, name, value)
+            cls._clients = {}
+            cls.client = cls.get_client()
+
+    @classmethod
+    def _invalidate(cls, path):
+        super()._invalidate(path)
+        if cls._disk_cache is not None:
+            cls._disk_cache.invalidate(path)
+
+    @classmethod
+    def read_content(cls, path, byte_range=None, **kwargs) -> bytes:
         cls._ensure_client_exists()
 
         bucket, *key = path.split('/')
@@ -33,8 +332,185 @@ class S3Cabinet(Cabinet):
         key = '/'.join(key)
         info(f'Downloading {key} from Bucket {bucket}')
         try:
-            resp = cls.client.get_object(Bucket=bucket, Key=key)
-            return resp.get('Body').read()
+            if byte_range is None and cls._disk_cache is not None:
+                return cls._download_cached(path, bucket, key)
+            content, _ = cls._download(bucket, key, *(byte_range or ()))
+            return content
+        except Exception as ex:
+            error(f"Cannot download {path} from S3 Bucket '{bucket}': {ex}")
+            raise ex
+
+    @classmethod
+    def read_content_conditional(cls, path, byte_range=None, if_none_match=None,
+                                 if_modified_since=None, **kwargs):
+        cls._ensure_client_exists()
+
+        bucket, *key = path.split('/')
+        if not key:
+            raise ValueError('S3 path needs bucket')
+        key = '/'.join(key)
+        conditions = {}
+        if if_none_match is not None:
+            conditions['IfNoneMatch'] = if_none_match
+        if if_modified_since is not None:
+            conditions['IfModifiedSince'] = datetime.fromtimestamp(if_modified_since,
+                                                                   timezone.utc)
+        info(f'Downloading {key} from Bucket {bucket} unless unchanged')
+        try:
+            content, resp = cls._download(bucket, key, *(byte_range or ()),
+                                          **conditions)
+            if not resp:
+                # nothing was downloaded (an empty object or range), so neither
+                # were the conditions checked
+                resp = cls._request('head_object', Bucket=bucket, Key=key)
+                file_info = cls._response_info(key, resp)
+                _check_modified(path, file_info, if_none_match, if_modified_since)
+                return content, file_info
+        except ClientError as ex:
+            if _error_code(ex) != '304':
+                error(f"Cannot download {path} from S3 Bucket '{bucket}': {ex}")
+                raise ex
+            raise NotModified(f'{path} is not modified') from None
+        if byte_range is None and cls._disk_cache is not None and resp.get('ETag'):
+            cls._disk_cache.put(path, resp['ETag'], content)
+        return content, cls._response_info(key, resp)
+
+    @staticmethod
+    def _response_info(key, resp: dict) -> FileInfo:
+        """Metadata of an object from a `get_object` or `head_object` response"""
+        return FileInfo(key.rsplit('/', 1)[-1], _object_size(resp),
+                        resp['LastModified'].timestamp(), resp.get('ETag'))
+
+    @classmethod
+    def _download_cached(cls, path, bucket, key) -> bytes:
+        cached = cls._disk_cache.get(path)
+        if cached is None:
+            content, resp = cls._download(bucket, key)
+        else:
+            etag, cached_content = cached
+            try:
+                content, resp = cls._download(bucket, key, IfNoneMatch=etag)
+            except ClientError as ex:
+                if _error_code(ex) != '304':
+                    raise
+                info(f'{key} in Bucket {bucket} is unchanged: using cached copy')
+                return cached_content
+        if resp.get('ETag'):
+            cls._disk_cache.put(path, resp.get('ETag'), content)
+        return content
+
+    @classmethod
+    def _download(cls, bucket, key, start=0, end=None,
+                  **conditions) -> Tuple[bytes, dict]:
+        """
+        Download a range of an object, returning its contents and the response
+        metadata of the first request. Extra keyword arguments are conditions
+        such as `IfNoneMatch` applied to the first request.
+        """
+        # the first request covers the whole range unless it is larger than the
+        # threshold, in which case it also tells us the size of the object
+        first_end = start + cls.multipart_threshold
+        if end is not None:
+            first_end = min(first_end, end)
+        if first_end <= start:
+            return b'', {}
+        try:
+            resp, head = cls._get_object(Bucket=bucket, Key=key,
+                                         Range=f'bytes={start}-{first_end - 1}',
+                                         **conditions)
+        except ClientError as ex:
+            # ranges starting at or past the end of the object (including any
+            # range of an empty object) are unsatisfiable, and contain no bytes
+            if _error_code(ex) != 'InvalidRange':
+                raise
+            return b'', {}
+        stop = _object_size(resp)
+        if end is not None:
+            stop = min(stop, end)
+        if start + len(head) >= stop:
+            return head, resp
+        content = cls._download_parts(bucket, key, head, start, stop,
+                                      resp.get('ETag'))
+        return content, resp
+
+    @classmethod
+    def _get_object(cls, **params) -> Tuple[dict, bytes]:
+        """
+        Get an object and read its body, hedging the request once enough GET
+        latencies have been observed if `hedge_percentile` is set.
+        """
+        def get(attempt: Attempt):
+            with cls._limiter(params['Bucket']).slot() as slot:
+                attempt.send()
+                started = time.monotonic()
+                resp = cls.client.get_object(**params)
+                # time to first byte, which unlike the time to read the body does
+                # not depend on the size of the object
+                cls._latency.record(time.monotonic() - started)
+                slot.respond()
+                attempt.respond()
+                body = resp.pop('Body').read()
+            return resp, body
+
+        if cls.hedge_percentile is None:
+            return get(Attempt())
+        delay = cls._latency.percentile(cls.hedge_percentile)
+        if delay is None:
+            return get(Attempt())
+        return hedged_call(get, delay, cls._hedge_executor())
+
+    @classmethod
+    def _hedge_executor(cls) -> ThreadPoolExecutor:
+        size, executor = cls._hedge_pool
+        if size == cls.max_pool_connections:
+            return executor
+        with cls._client_lock:
+            size, executor = cls._hedge_pool
+            if size != cls.max_pool_connections:
+                if executor is not None:
+                    executor.shutdown(wait=False)
+                executor = ThreadPoolExecutor(max_workers=cls.max_pool_connections,
+                                              thread_name_prefix='cabinets-s3-hedge')
+                cls._hedge_pool = (cls.max_pool_connections, executor)
+            return executor
+
+    @classmethod
+    def _download_parts(cls, bucket, key, head: bytes, start: int, stop: int,
+                        etag: str) -> bytes:
+        # parts are written into one preallocated buffer rather than concatenated
+        stream = io.BytesIO(bytes(stop - start))
+        view = stream.getbuffer()
+        view[:len(head)] = head
+
+        def download_part(offset, length):
+            _, body = cls._get_object(
+                Bucket=bucket, Key=key, IfMatch=etag,
+                Range=f'bytes={start + offset}-{start + offset + length - 1}')
+            view[offset:offset + length] = body
+
+        chunksize = cls.multipart_chunksize
+        with ThreadPoolExecutor(max_workers=cls.max_concurrency) as executor:
+            futures = [executor.submit(download_part, offset,
+                                       min(chunksize, len(view) - offset))
+                       for offset in range(len(head), len(view), chunksize)]
+            for future in futures:
+                future.result()
+        view.release()
+        # once no view of it remains, the buffer is returned as immutable `bytes`
+        # without copying it
+        return stream.getvalue()
+
+    @classmethod
+    def open_content(cls, path, **kwargs) -> BinaryIO:
+        cls._ensure_client_exists()
+
+        bucket, *key = path.split('/')
+        if not key:
+            raise ValueError('S3 path needs bucket')
+        key = '/'.join(key)
+        info(f'Streaming {key} from Bucket {bucket}')
+        try:
+            return cls._request('get_object', Bucket=bucket, Key=key).get('Body')
         except Exception as ex:
             error(f"Cannot download {path} from S3 Bucket '{bucket}': {ex}")
             raise ex
@@ -45,14 +521,152 @@ class S3Cabinet(Cabinet):
 
         bucket, *key = path.split('/')
         key = '/'.join(key)
-        info(f"Uploading {key} to {bucket}")
+        if isinstance(content, str):
+            # as botocore would encode it, but before telling its size
+            content = content.encode('utf-8')
+        size = len(memoryview(content).cast('B')) if is_bytes_like(content) else 0
+        try:
+            if size >= cls.multipart_threshold:
+                info(f"Uploading {key} to {bucket} in parts")
+                parts = _buffer_parts(content,
+                                      _part_size(size, cls.multipart_chunksize))
+                cls._upload_parts(bucket, key, parts)
+                return True
+            info(f"Uploading {key} to {bucket}")
+            cls._request('put_object', measure=False, Bucket=bucket, Key=key,
+                         Body=content)
+            return True
+        except Exception as ex:
+            error(f"Cannot upload {path} to S3 Bucket '{bucket}': {ex}")
+            return False
+
+    @classmethod
+    def create_stream(cls, path, chunks: Iterable[bytes], **kwargs):
+        cls._ensure_client_exists()
+
+        bucket, *key = path.split('/')
+        key = '/'.join(key)
+        chunks = iter(chunks)
+        head = bytearray()
+        for chunk in chunks:
+            head += chunk
+            if len(head) >= cls.multipart_threshold:
+                break
+        else:
+            return cls.create_content(path, bytes(head), **kwargs)
+
+        info(f"Uploading {key} to {bucket} in parts")
+        parts = _iter_parts(itertools.chain([head], chunks), cls.multipart_chunksize)
         try:
-            cls.client.put_object(Bucket=bucket, Key=key, Body=content)
+            cls._upload_parts(bucket, key, parts)
             return True
         except Exception as ex:
             error(f"Cannot upload {path} to S3 Bucket '{bucket}': {ex}")
             return False
 
+    @classmethod
+    def _upload_parts(cls, bucket, key, parts: Iterable[Union[bytes, BinaryIO]]):
+        cls._multipart_upload(bucket, key, lambda upload_id: (
+            cls._upload_parts_concurrently(bucket, key, upload_id, parts)))
+
+    @classmethod
+    def _multipart_upload(cls, bucket, key,
+                          send_parts: Callable[[str], List[str]], **extra):
+        """
+        Run a multipart upload, completing it with the ETags of the parts sent by
+        `send_parts`, or aborting it if sending them fails.
+        """
+        upload_id = cls.client.create_multipart_upload(
+            Bucket=bucket, Key=key, **extra)['UploadId']
+        try:
+            etags = send_parts(upload_id)
+            cls.client.complete_multipart_upload(
+                Bucket=bucket, Key=key, UploadId=upload_id,
+                MultipartUpload={'Parts': [{'ETag': etag, 'PartNumber': number}
+                                           for number, etag in enumerate(etags, 1)]})
+        except Exception:
+            cls.client.abort_multipart_upload(Bucket=bucket, Key=key,
+                                              UploadId=upload_id)
+            raise
+
+    @classmethod
+    def _upload_parts_concurrently(cls, bucket, key, upload_id,
+                                   parts: Iterable[Union[bytes, BinaryIO]]
+                                   ) -> List[str]:
+        # a part is only read from the stream once a buffer slot is free, so at
+        # most `max_concurrency` parts are held in memory at once
+        slots = threading.BoundedSemaphore(cls.max_concurrency)
+        failed = threading.Event()
+
+        def release(future):
+            if future.exception():
+                failed.set()
+            slots.release()
+
+        futures = []
+        with ThreadPoolExecutor(max_workers=cls.max_concurrency) as executor:
+            for number, part in enumerate(parts, 1):
+                slots.acquire()
+                if failed.is_set():
+                    break
+                future = executor.submit(cls._request, 'upload_part', measure=False,
+                                         Bucket=bucket, Key=key, UploadId=upload_id,
+                                         PartNumber=number, Body=part)
+                future.add_done_callback(release)
+                futures.append(future)
+        return [future.result()['ETag'] for future in futures]
+
+    @classmethod
+    def copy_content(cls, src, dst, **kwargs):
+        """
+        Copy an object server-side, so its contents never pass through this
+        process. Objects larger than `multipart_threshold` are copied as concurrent
+        parts of `multipart_chunksize` bytes.
+        """
+        cls._ensure_client_exists()
+
+        src_bucket, _, src_key = src.partition('/')
+        dst_bucket, _, dst_key = dst.partition('/')
+        source = {'Bucket': src_bucket, 'Key': src_key}
+        info(f'Copying {src} to {dst}')
+        try:
+            head = cls._request('head_object', **source)
+            if head['ContentLength'] <= cls.multipart_threshold:
+                cls._request('copy_object', measure=False, Bucket=dst_bucket,
+                             Key=dst_key, CopySource=source)
+            else:
+                cls._copy_parts(source, dst_bucket, dst_key, head)
+            return True
+        except Exception as ex:
+            error(f'Cannot copy {src} to {dst} in S3: {ex}')
+            return False
+
+    @classmethod
+    def _copy_parts(cls, source: dict, bucket, key, head: dict):
+        size = head['ContentLength']
+        chunksize = _part_size(size, cls.multipart_chunksize)
+
+        def copy_part(upload_id, number, offset):
+            end = min(offset + chunksize, size) - 1
+            resp = cls._request(
+                'upload_part_copy', measure=False, Bucket=bucket, Key=key,
+                UploadId=upload_id, PartNumber=number, CopySource=source,
+                CopySourceRange=f'bytes={offset}-{end}', CopySourceIfMatch=head['ETag'])
+            return resp['CopyPartResult']['ETag']
+
+        def send_parts(upload_id):
+            with ThreadPoolExecutor(max_workers=cls.max_concurrency) as executor:
+                futures = [executor.submit(copy_part, upload_id, number, offset)
+                           for number, offset
+                           in enumerate(range(0, size, chunksize), 1)]
+                return [future.result() for future in futures]
+
+        # unlike `copy_object`, multipart uploads do not copy metadata themselves
+        extra = {'Metadata': head.get('Metadata', {})}
+        if head.get('ContentType'):
+            extra['ContentType'] = head['ContentType']
+        cls._multipart_upload(bucket, key, send_parts, **extra)
+
     @classmethod
     def delete_content(cls, path, **kwargs):
         cls._ensure_client_exists()
@@ -61,33 +675,193 @@ class S3Cabinet(Cabinet):
         key = '/'.join(key)
         info(f"Deleting {key} from {bucket}")
         try:
-            cls.client.delete_object(Bucket=bucket, Key=key)
+            cls._request('delete_object', Bucket=bucket, Key=key)
             return True
         except Exception as ex:
             error(f"Cannot delete {path} from S3 Bucket '{bucket}': {ex}")
             return False
 
+    @classmethod
+    def delete_many(cls, paths, max_workers: int = None,
+                    **kwargs) -> List[BatchResult]:
+        """
+        Delete many objects with `delete_objects` requests of up to
+        `delete_batch_size` keys each, sent concurrently. Keys S3 fails to delete
+        are reported in their `BatchResult`.
+        """
+        cls._ensure_client_exists()
+
+        paths = [*paths]
+        results = {}
+        batches = {}
+        for path in paths:
+            bucket, _, key = path.partition('/')
+            if not key:
+                results[path] = BatchResult(path,
+                                            error=ValueError('S3 path needs bucket'))
+            else:
+                batches.setdefault(bucket, []).append(path)
+        size = cls.delete_batch_size
+        max_workers = max_workers or cls.max_concurrency
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(cls._delete_batch, bucket, batch[i:i + size])
+                       for bucket, batch in batches.items()
+                       for i in range(0, len(batch), size)]
+            for future in futures:
+                results.update(future.result())
+        return [results[path] for path in paths]
+
+    @classmethod
+    def delete_prefix(cls, directory, max_workers: int = None,
+                      **kwargs) -> List[BatchResult]:
+        """
+        Delete all objects whose key starts with a directory. Each page of the
+        listing is deleted by one `delete_objects` request, sent while later pages
+        are still being listed.
+        """
+        bucket = directory.split('/')[0]
+        _, pages = cls._list_pages(directory, None, cls.delete_batch_size)
+        results = []
+        max_workers = max_workers or cls.max_concurrency
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(cls._delete_batch, bucket,
+                                       [f"{bucket}/{content['Key']}"
+                                        for content in page['Contents']])
+                       for page in _prefetch(pages) if page.get('Contents')]
+            for future in futures:
+                results.extend(future.result().values())
+        return results
+
+    @classmethod
+    def _delete_batch(cls, bucket, paths: List[str]) -> Dict[str, BatchResult]:
+        keys = {path.partition('/')[2]: path for path in paths}
+        info(f'Deleting {len(keys)} keys from {bucket}')
+        try:
+            # quiet mode only reports the keys which could not be deleted
+            resp = cls._request(
+                'delete_objects', Bucket=bucket,
+                Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True})
+        except Exception as ex:
+            error(f"Cannot delete {len(keys)} keys from S3 Bucket '{bucket}': {ex}")
+            return {path: BatchResult(path, error=ex) for path in paths}
+        finally:
+            for path in paths:
+                cls._invalidate(path)
+        results = {path: BatchResult(path, value=True) for path in paths}
+        for failure in resp.get('Errors', []):
+            path = keys[failure['Key']]
+            results[path] = BatchResult(path, error=CabinetError(
+                f"Cannot delete '{path}': {failure.get('Code')} "
+                f"{failure.get('Message')}"))
+        return results
+
     @classmethod
     def list(cls, directory, delimiter: str = '/', **kwargs) -> List[str]:
+        return list(cls.iter_list(directory, delimiter=delimiter, **kwargs))
+
+    @classmethod
+    def iter_list(cls, directory, delimiter: str = '/', page_size: int = None,
+                  **kwargs) -> Iterator[str]:
+        """
+        Lazily list the files directly within a directory, one page of up to 1,000
+        keys per request. Names of a page are yielded while the next page is
+        requested.
+
+        :param str directory: Bucket, optionally followed by a directory
+        :param str delimiter: Separator of directories within keys
+        :param int page_size: Maximum number of keys requested per page
+        :return Iterator[str]: Filenames in directory
+        """
+        for file, _ in cls._iter_contents(directory, delimiter, page_size):
+            yield file
+
+    @classmethod
+    def iter_list_detailed(cls, directory, delimiter: str = '/',
+                           page_size: int = None, **kwargs) -> Iterator[FileInfo]:
+        for file, content in cls._iter_contents(directory, delimiter, page_size):
+            yield cls._file_info(file, content)
+
+    @staticmethod
+    def _file_info(name, content: dict) -> FileInfo:
+        """Metadata of a file from its `Contents` entry of a listing"""
+        return FileInfo(name, content['Size'], content['LastModified'].timestamp(),
+                        content.get('ETag'))
+
+    @classmethod
+    def stat(cls, path, **kwargs) -> FileInfo:
         cls._ensure_client_exists()
 
-        bucket, *dir = directory.split(delimiter)
-        dir = '/'.join(dir)
+        bucket, *key = path.split('/')
+        if not key:
+            raise ValueError('S3 path needs bucket')
+        key = '/'.join(key)
+        try:
+            resp = cls._request('head_object', Bucket=bucket, Key=key)
+        except Exception as ex:
+            error(f"Cannot stat {path} in S3 Bucket '{bucket}': {ex}")
+            raise ex
+        return cls._response_info(key, resp)
 
-        files = []
-        response = cls.client.list_objects_v2(Bucket=bucket, Prefix=dir)
+    @classmethod
+    def _iter_contents(cls, directory, delimiter,
+                       page_size) -> Iterator[Tuple[str, dict]]:
+        """Names and `Contents` entries of the files directly within a directory"""
+        prefix, pages = cls._list_pages(directory, delimiter, page_size)
+        for page in _prefetch(pages):
+            for content in page.get('Contents', []):
+                file = content['Key'][len(prefix):]
+                # skip the placeholder object of the directory itself
+                if file:
+                    yield file, content
+
+    @classmethod
+    def _scan(cls, directory, detailed: bool = False, delimiter: str = '/',
+              page_size: int = None,
+              **kwargs) -> Tuple[List[Union[str, FileInfo]], List[str]]:
+        prefix, pages = cls._list_pages(directory, delimiter, page_size)
+        files, subdirectories = [], []
+        for page in pages:
+            for content in page.get('Contents', []):
+                file = content['Key'][len(prefix):]
+                # skip the placeholder object of the directory itself
+                if file:
+                    files.append(cls._file_info(file, content) if detailed else file)
+            # subdirectories keep their trailing delimiter, since a key may contain
+            # an empty segment (`a//b`), whose name would otherwise be empty and
+            # join back to the directory containing it
+            subdirectories.extend(common['Prefix'][len(prefix):]
+                                  for common in page.get('CommonPrefixes', []))
+        return files, subdirectories
+
+    @classmethod
+    def _join(cls, directory, name) -> str:
+        # keys may contain empty segments, so at most one delimiter is dropped
+        if not directory:
+            return name
+        if not name:
+            return str(directory)
+        directory = str(directory)
+        return directory + name if directory.endswith('/') else f'{directory}/{name}'
+
+    @classmethod
+    def _list_pages(cls, directory, delimiter, page_size) -> Tuple[str, Iterator]:
+        """
+        Start listing a directory. With a delimiter, keys within subdirectories are
+        grouped into the `CommonPrefixes` of each page rather than listed.
 
-        # ensure dir ends in slash for prefix stripping
-        if not dir.endswith('/'):
-            dir += '/'
+        :return: Prefix of the keys within the directory, and iterator of pages
+        """
+        cls._ensure_client_exists()
 
-        for content in response.get('Contents', []):
-            file: str = content.get('Key')
-            # strip directory prefix
-            file = file.lstrip(dir)
-            # ignore subdirectory files
-            if delimiter in file:
-                continue
-            files.append(file)
+        bucket, *dir = directory.split('/')
+        prefix = '/'.join(dir)
+        # ensure prefix ends in delimiter, so that it only matches this directory
+        separator = delimiter or '/'
+        if prefix and not prefix.endswith(separator):
+            prefix += separator
 
-        return files
+        grouping = {'Delimiter': delimiter} if delimiter else {}
+        pagination = {'PageSize': page_size} if page_size else {}
+        pages = cls.client.get_paginator('list_objects_v2').paginate(
+            Bucket=bucket, Prefix=prefix, PaginationConfig=pagination, **grouping)
+        return prefix, cls._limiter(bucket).iterate(iter(pages))
@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache, bounded by the total size of its values
+    in bytes rather than by the number of entries.
+
+    :param int max_bytes: Maximum total size of cached values
+    :param float ttl: Seconds after which an entry expires, `None` to never expire
+    """
+
+    def __init__(self, max_bytes: int, ttl: float = None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # incremented on every invalidation, so a value read from storage before
+        # an invalidation is not cached after it
+        self._version = 0
+        self._hits = self._misses = self._evictions = self._expirations = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value, marking it as most recently used.
+
+        :param Hashable key: Key of the entry
+        :param Any default: Value returned if the key is not cached
+        :return Any: Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                self._remove(key)
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int = None, version: int = None):
+        """
+        Cache a value, evicting least recently used entries to stay within
+        `max_bytes`. Values larger than `max_bytes` are not cached.
+
+        :param Hashable key: Key of the entry
+        :param Any value: Value to cache
+        :param int size: Size of the value in bytes, `len(value)` by default
+        :param int version: `version` observed before the value was produced; the
+            value is not cached if the cache was invalidated since
+        """
+        size = len(value) if size is None else size
+        if size > self.max_bytes:
+            return
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            self._remove(key)
+            self._entries[key] = (value, size, expires)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """
+        Remove an entry, if cached.
+
+        :param Hashable key: Key of the entry
+        """
+        with self._lock:
+            self._version += 1
+            self._remove(key)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        :return Dict[str, int]: Numbers of hits, misses, evictions and expirations,
+            and the current number of entries and their total size in bytes
+        """
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses,
+                    'evictions': self._evictions, 'expirations': self._expirations,
+                    'entries': len(self._entries), 'bytes': self._bytes}
+
+    def _expired(self, entry) -> bool:
+        expires = entry[2]
+        return expires is not None and expires <= time.monotonic()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
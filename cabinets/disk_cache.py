@@ -0,0 +1,116 @@
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+
+class DiskCache:
+    """
+    Persistent cache of file contents and their validators (such as an S3 ETag) in
+    a local directory, bounded by total size with least-recently-used eviction.
+
+    Each entry is a single file holding a JSON header line followed by the content,
+    and is only ever replaced by an atomic rename, so readers never see a partial
+    entry. Writes and evictions hold an exclusive lock file, so several processes
+    can share one directory.
+
+    :param str directory: Directory holding the cache, created if missing
+    :param int max_bytes: Maximum total size of cache entries on disk
+    """
+    _lock_name = '.lock'
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        """
+        Get a cached entry, marking it as most recently used.
+
+        :param str key: Key of the entry
+        :return Optional[Tuple[str, bytes]]: Validator and content, or `None` if
+            not cached
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                header = json.loads(file.readline())
+                content = file.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        if header.get('key') != key or header.get('size') != len(content):
+            return None
+        return header.get('validator'), content
+
+    def put(self, key: str, validator: str, content: bytes):
+        """
+        Cache content with its validator, evicting least recently used entries to
+        stay within `max_bytes`. Content larger than `max_bytes` is not cached.
+
+        :param str key: Key of the entry
+        :param str validator: Validator of the content, such as an ETag
+        :param bytes content: Content to cache
+        """
+        if len(content) > self.max_bytes:
+            return
+        header = json.dumps({'key': key, 'validator': validator,
+                             'size': len(content)}).encode()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(header + b'\n')
+                file.write(content)
+            with self._locked():
+                os.replace(tmp_path, self._path(key))
+                self._evict()
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def invalidate(self, key: str):
+        """
+        Remove an entry, if cached.
+
+        :param str key: Key of the entry
+        """
+        with self._locked():
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory,
+                            hashlib.sha256(key.encode()).hexdigest() + '.entry')
+
+    @contextmanager
+    def _locked(self):
+        with open(os.path.join(self.directory, self._lock_name), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _evict(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith('.entry'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,104 @@
+import math
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from typing import Any, Callable, Optional
+
+from cabinets import metrics
+
+
+class LatencyTracker:
+    """
+    Thread-safe record of the latencies of recent requests, to estimate the
+    latency of the next ones.
+
+    :param int window: Number of most recent latencies kept
+    :param int min_samples: Number of latencies needed before estimating any
+        percentile
+    """
+
+    def __init__(self, window: int = 1000, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """
+        Record the latency of a request.
+
+        :param float seconds: Duration of the request
+        """
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Estimate a percentile of recent latencies.
+
+        :param float percent: Percentile between 0 and 100
+        :return Optional[float]: Latency in seconds, `None` if fewer than
+            `min_samples` latencies were recorded
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        index = math.ceil(percent / 100 * len(latencies)) - 1
+        return latencies[min(max(index, 0), len(latencies) - 1)]
+
+
+class Attempt:
+    """
+    Progress of one call of a hedged request, reported by the call itself so that
+    time spent waiting for a thread or for a concurrency limit is not mistaken for
+    a slow response.
+    """
+
+    def __init__(self):
+        self.sent = threading.Event()
+        self.responded = threading.Event()
+
+    def send(self):
+        """Mark the request as sent"""
+        self.sent.set()
+
+    def respond(self):
+        """Mark the response as started, such as once its headers are received"""
+        self.sent.set()
+        self.responded.set()
+
+
+def hedged_call(fn: Callable[[Attempt], Any], delay: float,
+                executor: Executor) -> Any:
+    """
+    Call a function sending a request, and call it again if no response started
+    within `delay` seconds of sending the request, returning whichever result comes
+    first. The slower call is not interrupted, its result is discarded. Both calls
+    run on `executor`.
+
+    :param fn: Idempotent callable, reporting its progress to the `Attempt` it is
+        given
+    :param float delay: Seconds to wait for a response before the second call
+    :param Executor executor: Executor running the calls
+    :return Any: Result of the first call to succeed
+    :raises Exception: Exception of the first call to fail, if both fail
+    """
+    attempt = Attempt()
+    first = executor.submit(fn, attempt)
+    # a call that failed or returned without reporting progress is done
+    first.add_done_callback(lambda _: attempt.respond())
+    attempt.sent.wait()
+    if attempt.responded.wait(delay):
+        return first.result()
+    metrics.increment('hedge.sent')
+    second = executor.submit(fn, Attempt())
+    pending, error = {first, second}, None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is second:
+                    metrics.increment('hedge.won')
+                return future.result()
+            error = error or future.exception()
+    raise error
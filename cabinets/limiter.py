@@ -0,0 +1,238 @@
+"""
+Adaptive limits on the number of concurrent requests sent to a storage backend,
+such as an S3 bucket. Each limit follows AIMD (additive increase, multiplicative
+decrease): it grows by about one request per round of requests while latency is
+stable, and is halved when a request is throttled or latency rises well above its
+usual level. Limiters are shared by key, so that every operation against the same
+backend adapts to it together.
+
+Latency is only compared between requests when it does not depend on their payload:
+a request either reports when its response started, which is then its latency, or
+is measured as a whole only if it carries no payload of varying size. Transfers
+that cannot report a response, such as uploads, only decrease the limit when
+throttled.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, TypeVar
+
+from cabinets import metrics
+
+T = TypeVar('T')
+_DONE = object()
+
+
+class LimiterStats(NamedTuple):
+    """
+    Snapshot of the state of a limiter.
+
+    :param int limit: Current maximum number of concurrent requests
+    :param int in_flight: Number of requests currently running
+    :param int throttles: Number of requests throttled so far
+    :param int requests: Number of requests completed so far
+    """
+    limit: int
+    in_flight: int
+    throttles: int
+    requests: int
+
+
+class Slot:
+    """Request admitted by a limiter, which may report when its response started"""
+
+    def __init__(self):
+        self.responded: Optional[float] = None
+
+    def respond(self):
+        """Mark the response as started, such as once its headers are received"""
+        if self.responded is None:
+            self.responded = time.monotonic()
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit adjusted to the throttling and latency of the requests it
+    admits.
+
+    :param int initial: Initial limit
+    :param int minimum: Lowest limit
+    :param int maximum: Highest limit
+    :param float decrease_factor: Factor applied to the limit when decreasing it
+    :param float latency_tolerance: Ratio of recent to usual latency above which the
+        limit is decreased
+    :param is_throttle: Whether an exception raised by a request means that it was
+        throttled; by default, no exception does
+    """
+    # number of latencies observed before rising latency decreases the limit
+    warmup = 10
+
+    def __init__(self, initial: int = 8, minimum: int = 1, maximum: int = 64,
+                 decrease_factor: float = 0.5, latency_tolerance: float = 2.0,
+                 is_throttle: Callable[[BaseException], bool] = None):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.is_throttle = is_throttle or (lambda ex: False)
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._in_flight = 0
+        self._throttles = 0
+        self._requests = 0
+        self._samples = 0
+        # fast and slow moving averages of latency, and the time of the last decrease
+        self._recent: Optional[float] = None
+        self._usual: Optional[float] = None
+        self._last_decrease = float('-inf')
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current maximum number of concurrent requests"""
+        return int(self._limit)
+
+    def stats(self) -> LimiterStats:
+        with self._condition:
+            return LimiterStats(int(self._limit), self._in_flight, self._throttles,
+                                self._requests)
+
+    @contextmanager
+    def slot(self, measure: bool = True) -> Iterator[Slot]:
+        """
+        Wait until a request may be sent, and record its outcome once the block
+        exits. The latency of the request runs until `Slot.respond` is called on
+        the slot yielded, or until the block exits.
+
+        :param bool measure: `False` if the duration of the request depends on
+            the size of its payload and it does not report its response, such as
+            an upload; its latency is then ignored
+        """
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+        slot = Slot()
+        started = time.monotonic()
+        try:
+            yield slot
+        except BaseException as ex:
+            self._release(started, succeeded=False, throttled=self.is_throttle(ex))
+            raise
+        if slot.responded is not None:
+            self._release(started, latency=slot.responded - started)
+        elif measure:
+            self._release(started, latency=time.monotonic() - started)
+        else:
+            self._release(started)
+
+    def call(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Call a function sending one request without a payload, once the limit
+        allows it.
+
+        :param fn: Function sending the request
+        :return: Result of the function
+        """
+        with self.slot():
+            return fn(*args, **kwargs)
+
+    def iterate(self, items: Iterator[T]) -> Iterator[T]:
+        """
+        Iterate over items each fetched by one request, such as pages of a listing,
+        fetching each once the limit allows it.
+
+        :param Iterator items: Iterator sending a request for each item
+        """
+        while True:
+            with self.slot():
+                item = next(items, _DONE)
+            if item is _DONE:
+                return
+            yield item
+
+    def record_throttle(self, started: float):
+        """
+        Record that a request was throttled without raising through its slot, such
+        as an attempt retried by a client library before the request completes.
+
+        :param float started: When the throttled request was sent, as given by
+            `time.monotonic`
+        """
+        with self._condition:
+            self._throttle(started)
+
+    def _release(self, started: float, latency: float = None,
+                 succeeded: bool = True, throttled: bool = False):
+        with self._condition:
+            self._in_flight -= 1
+            if throttled:
+                self._throttle(started)
+            elif succeeded:
+                self._requests += 1
+                if latency is None or not self._observe(started, latency):
+                    # grows by one once a full limit's worth of requests succeeded
+                    self._limit = min(self._limit + 1 / self._limit, self.maximum)
+            self._condition.notify_all()
+
+    def _throttle(self, started: float):
+        self._throttles += 1
+        metrics.increment('limiter.throttled')
+        self._decrease(started)
+
+    def _observe(self, started: float, latency: float) -> bool:
+        """Record a latency, decreasing the limit if latency is rising"""
+        self._samples += 1
+        if self._recent is None:
+            self._recent = self._usual = latency
+        self._recent += 0.2 * (latency - self._recent)
+        self._usual += 0.02 * (latency - self._usual)
+        if (self._samples > self.warmup
+                and self._recent > self.latency_tolerance * self._usual):
+            self._decrease(started)
+            return True
+        return False
+
+    def _decrease(self, started: float):
+        # requests sent before the last decrease reflect the previous limit, and
+        # were already accounted for by that decrease
+        if started < self._last_decrease:
+            return
+        self._limit = max(self._limit * self.decrease_factor, self.minimum)
+        self._last_decrease = time.monotonic()
+        metrics.increment('limiter.decreased')
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_lock = threading.Lock()
+
+
+def get_limiter(key: str, **settings) -> AdaptiveLimiter:
+    """
+    Get the limiter shared by every request to a backend, created on first use.
+
+    :param str key: Identifier of the backend, such as `s3://bucket`
+    :param settings: Arguments of `AdaptiveLimiter`, used if the limiter is created
+    :rtype: AdaptiveLimiter
+    """
+    limiter = _limiters.get(key)
+    if limiter is None:
+        with _lock:
+            limiter = _limiters.setdefault(key, AdaptiveLimiter(**settings))
+    return limiter
+
+
+def get_limiter_stats() -> Dict[str, LimiterStats]:
+    """
+    Get a snapshot of every limiter.
+
+    :return Dict[str, LimiterStats]: Mapping of limiter key to its state
+    """
+    with _lock:
+        limiters = dict(_limiters)
+    return {key: limiter.stats() for key, limiter in limiters.items()}
+
+
+def reset_limiters():
+    """Discard every limiter, so that limits are learned again."""
+    with _lock:
+        _limiters.clear()
@@ -2,20 +2,12 @@ import logging
 import os
 import sys
 
-import colorama
 
+def _color(name):
+    # imported on first use so that `import cabinets` does not pay for it
+    import colorama
+    return getattr(colorama.Fore, name.upper())
 
-COLORS = {
-    'BLACK': colorama.Fore.BLACK,
-    'RED': colorama.Fore.RED,
-    'GREEN': colorama.Fore.GREEN,
-    'YELLOW': colorama.Fore.YELLOW,
-    'BLUE': colorama.Fore.BLUE,
-    'MAGENTA': colorama.Fore.MAGENTA,
-    'CYAN': colorama.Fore.CYAN,
-    'WHITE': colorama.Fore.WHITE,
-    'RESET': colorama.Fore.RESET,
-}
 
 # Set up stdout logging
 LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
@@ -33,7 +25,7 @@ def style(*msgs, color=None):
     if not color:
         return msg
     else:
-        return f'{COLORS[color.upper()]}' + msg + str(COLORS['RESET'])
+        return _color(color) + msg + _color('RESET')
 
 
 def debug(*msgs, color=None, name=None):
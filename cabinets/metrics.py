@@ -0,0 +1,37 @@
+"""
+Counters recording notable events inside `cabinets`, such as a cabinet falling
+back to a slower generic code path. Counters are process-wide and thread-safe.
+"""
+import threading
+from collections import Counter
+from typing import Dict
+
+_counters = Counter()
+_lock = threading.Lock()
+
+
+def increment(name: str, value: int = 1):
+    """
+    Increase a counter.
+
+    :param str name: Name of the counter, dot-separated by convention
+    :param int value: Amount to add to the counter
+    """
+    with _lock:
+        _counters[name] += value
+
+
+def get_metrics() -> Dict[str, int]:
+    """
+    Get a snapshot of all counters.
+
+    :return Dict[str, int]: Mapping of counter name to its current value
+    """
+    with _lock:
+        return dict(_counters)
+
+
+def reset_metrics():
+    """Reset all counters to zero."""
+    with _lock:
+        _counters.clear()
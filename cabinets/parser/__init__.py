@@ -1,14 +1,28 @@
+import copy
+import hashlib
 import os
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Union
 
-SUPPORTED_EXTENSIONS = {}
+from cabinets.cache import LRUCache
+from cabinets.registry import LazyRegistry
+
+SUPPORTED_EXTENSIONS = LazyRegistry()
 
 
 class ParserError(Exception):
     pass
 
 
+def is_bytes_like(content) -> bool:
+    """Whether content supports the buffer protocol, like `bytes` or `memoryview`"""
+    try:
+        memoryview(content)
+    except TypeError:
+        return False
+    return True
+
+
 def register_extensions(*file_types):
     def decorate_parser(parser):
         try:
@@ -29,8 +43,57 @@ def register_extensions(*file_types):
     return decorate_parser
 
 
+def _memo_key(parser, content, kwargs):
+    """Key of parsed content, or `None` if the keyword arguments are unhashable"""
+    key = (parser, hashlib.blake2b(content, digest_size=16).digest(),
+           tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
 class Parser(ABC):
     _extensions = set()
+    # memoized parse results shared by all parsers, see `set_memoization`
+    _memo: LRUCache = None
+    _memo_copy = True
+
+    @classmethod
+    def set_memoization(cls, max_bytes: Union[int, None],
+                        copy: bool = True) -> LRUCache:
+        """
+        Memoize parsed objects of all parsers, keyed by parser, a digest of the
+        content and the parser keyword arguments, so byte-identical content is
+        only parsed once. The budget is measured by the size of the parsed
+        content, and least recently used results are evicted first.
+
+        :param Union[int, None] max_bytes: Maximum total size of content whose
+            parsed objects are kept, `None` to disable memoization
+        :param bool copy: `True` to return a deep copy of the memoized object on
+            every load, `False` to return the memoized object itself, which must
+            then not be modified
+        :return LRUCache: New cache, or `None` if memoization was disabled
+        """
+        Parser._memo = None if max_bytes is None else LRUCache(max_bytes)
+        Parser._memo_copy = copy
+        return Parser._memo
+
+    @classmethod
+    def _load_content(cls, content: bytes, **kwargs):
+        """Load content using `load_content`, or its memoized result"""
+        memo = Parser._memo
+        key = None if memo is None else _memo_key(cls, content, kwargs)
+        if key is None:
+            return cls.load_content(content, **kwargs)
+        version = memo.version
+        data = memo.get(key, memo)
+        if data is memo:
+            data = cls.load_content(content, **kwargs)
+            memo.put(key, data, size=len(memoryview(content).cast('B')),
+                     version=version)
+        return copy.deepcopy(data) if Parser._memo_copy else data
 
     @classmethod
     def _split_path(cls, path: str) -> (str, str):
@@ -42,10 +105,10 @@ class Parser(ABC):
 
     @classmethod
     def load(cls, path, content: bytes, **kwargs):
-        if not isinstance(content, bytes):
-            raise ValueError("Content must have type `bytes`")
+        if not is_bytes_like(content):
+            raise ValueError("Content must be a bytes-like object")
         _, ext = cls._split_path(path)
-        return SUPPORTED_EXTENSIONS[ext].load_content(content, **kwargs)
+        return SUPPORTED_EXTENSIONS[ext]._load_content(content, **kwargs)
 
     @classmethod
     @abstractmethod
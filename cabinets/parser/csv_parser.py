@@ -9,7 +9,7 @@ class CSVParser(Parser):
 
     @classmethod
     def load_content(cls, content, **kwargs):
-        return list(csv.reader(content.decode('utf-8').splitlines()))
+        return list(csv.reader(str(content, 'utf-8').splitlines()))
 
     @classmethod
     def dump_content(cls, data, **kwargs):
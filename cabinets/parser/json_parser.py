@@ -8,6 +8,9 @@ class JSONParser(Parser):
 
     @classmethod
     def load_content(cls, content, **kwargs):
+        # `json` does not read other bytes-like objects such as `memoryview`
+        if not isinstance(content, (bytes, bytearray)):
+            content = bytes(content)
         return json.loads(content)
 
     @classmethod
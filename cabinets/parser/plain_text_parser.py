@@ -6,7 +6,7 @@ class PlainTextParser(Parser):
 
     @classmethod
     def load_content(cls, content, encoding='utf-8', **kwargs):
-        return content.decode(encoding=encoding)
+        return str(content, encoding=encoding)
 
     @classmethod
     def dump_content(cls, data, encoding='utf-8', **kwargs):
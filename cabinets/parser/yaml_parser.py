@@ -8,6 +8,9 @@ class YAMLParser(Parser):
 
     @classmethod
     def load_content(cls, content, **kwargs):
+        # PyYAML only reads `str` or `bytes` streams
+        if not isinstance(content, bytes):
+            content = bytes(content)
         return yaml.safe_load(content)
 
     @classmethod
@@ -1,13 +1,37 @@
+import hashlib
 import importlib
+import importlib.machinery
 import importlib.util
+import json
 import os
 import pkgutil
 import sys
 import inspect
+import tempfile
 
 import cabinets.cabinet
 import cabinets.parser
 from cabinets.logger import debug
+from cabinets.registry import LazyRegistry
+
+# built-in classes are registered by name, and only imported on first use so that
+# `import cabinets` does not pay for dependencies such as `boto3` or `yaml`
+BUILT_IN_PROTOCOLS = {
+    'file': ('cabinets.cabinet.file_cabinet', 'FileCabinet'),
+    's3': ('cabinets.cabinet.s3_cabinet', 'S3Cabinet'),
+}
+BUILT_IN_EXTENSIONS = {
+    'csv': ('cabinets.parser.csv_parser', 'CSVParser'),
+    'json': ('cabinets.parser.json_parser', 'JSONParser'),
+    'pickle': ('cabinets.parser.pickle_parser', 'PickleParser'),
+    'txt': ('cabinets.parser.plain_text_parser', 'PlainTextParser'),
+    'yaml': ('cabinets.parser.yaml_parser', 'YAMLParser'),
+    'yml': ('cabinets.parser.yaml_parser', 'YAMLParser'),
+}
+
+# bumped whenever the layout of the plugin index changes
+INDEX_VERSION = 1
+PLUGIN_PACKAGES = ('cabinet', 'parser')
 
 
 class CabinetsPluginError(Exception):
@@ -41,36 +65,181 @@ def load_to_cache(cls, cache: dict, allowed_type: type):
             f"No {allowed_type.__name__}s registered to '{cls.__name__}'")
     for key in keys:
         if key in cache:
+            current = cache.describe(key) if isinstance(cache, LazyRegistry) \
+                else cache[key].__qualname__
             raise CabinetsPluginError(
                 f"Plugin already registered: {allowed_type.__name__} '{key}' is "
-                f"currently associated with {cache[key].__qualname__}")
+                f"currently associated with {current}")
         cache[key] = cls
     debug(f"Loaded {allowed_type.__name__} plugin '{cls.__name__}'")
 
 
-def discover_all(custom_plugin_path=None):
-    modules = set()
-    built_in_cabinet_modules = discover(cabinets.cabinet.__path__,
-                                        prefix=cabinets.cabinet.__name__ + '.')
-    built_in_parser_modules = discover(cabinets.parser.__path__,
-                                       prefix=cabinets.parser.__name__ + '.')
-    modules.update(built_in_cabinet_modules)
-    modules.update(built_in_parser_modules)
-    if custom_plugin_path:
-        for pkg in ('cabinet', 'parser'):
-            path = os.path.join(custom_plugin_path, pkg)
-            sys.path.insert(1, path)
-            custom_modules = discover((path,))
-            modules.update(custom_modules)
-
-    PROTOCOLS, EXTENSIONS = {}, {}
+def built_ins():
+    """
+    Registries of the built-in protocols and extensions, whose modules are only
+    imported on first lookup.
+
+    :return: Protocol and extension registries
+    :rtype: (LazyRegistry, LazyRegistry)
+    """
+    PROTOCOLS, EXTENSIONS = LazyRegistry(), LazyRegistry()
+    for key, (module, attribute) in BUILT_IN_PROTOCOLS.items():
+        PROTOCOLS.register_lazy(key, module, attribute)
+    for key, (module, attribute) in BUILT_IN_EXTENSIONS.items():
+        EXTENSIONS.register_lazy(key, module, attribute)
+    return PROTOCOLS, EXTENSIONS
+
+
+def plugin_files(custom_plugin_path):
+    """
+    Fingerprint the plugin sources in a plugin path, so that a discovery index can
+    tell whether it is still up to date.
+
+    :param str custom_plugin_path: Path holding the `cabinet` and `parser` plugin
+        directories
+    :return: Mapping of each importable file, relative to the plugin path, to its
+        modification time in nanoseconds and its size
+    :rtype: Dict[str, List[int]]
+    """
+    suffixes = tuple(importlib.machinery.all_suffixes())
+    files = {}
+    for pkg in PLUGIN_PACKAGES:
+        for root, dirs, names in os.walk(os.path.join(custom_plugin_path, pkg)):
+            dirs[:] = [name for name in dirs if name != '__pycache__']
+            for name in names:
+                if not name.endswith(suffixes):
+                    continue
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                files[os.path.relpath(path, custom_plugin_path)] = [stat.st_mtime_ns,
+                                                                    stat.st_size]
+    return files
+
+
+def index_file(index_dir, custom_plugin_path):
+    """
+    Path of the discovery index of a plugin path. Each plugin path has its own
+    index, so several projects can share one index directory.
+
+    :param str index_dir: Directory holding discovery indexes
+    :param str custom_plugin_path: Path holding the plugin directories
+    :rtype: str
+    """
+    digest = hashlib.sha256(os.path.abspath(custom_plugin_path).encode()).hexdigest()
+    return os.path.join(index_dir, f'plugins-{digest[:16]}.json')
+
+
+def read_index(path, files):
+    """
+    Read a discovery index, if it exists and was built from the same plugin files.
+
+    :param str path: Path of the index
+    :param files: Current fingerprint of the plugin files, see `plugin_files`
+    :return: Index, or `None` if missing, unreadable or out of date
+    :rtype: Optional[dict]
+    """
+    try:
+        with open(path) as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index, dict) or index.get('version') != INDEX_VERSION \
+            or index.get('files') != files:
+        return None
+    return index
+
+
+def write_index(path, files, protocols, extensions):
+    """
+    Atomically write a discovery index. Failing to write it (such as on a read-only
+    filesystem) is not an error, discovery will simply not be cached.
+
+    :param str path: Path of the index
+    :param files: Fingerprint of the plugin files, see `plugin_files`
+    :param protocols: Mapping of protocol to the module and name of its class
+    :param extensions: Mapping of extension to the module and name of its class
+    """
+    index = {'version': INDEX_VERSION, 'files': files,
+             'protocols': protocols, 'extensions': extensions}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as file:
+                json.dump(index, file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError as ex:
+        debug(f"Cannot write plugin index '{path}': {ex}")
+
+
+def load_modules(modules, PROTOCOLS, EXTENSIONS):
+    """
+    Register the `Cabinet` and `Parser` subclasses found in plugin modules.
+
+    :return: Mappings of each registered protocol and extension to the module and
+        name of its class, as recorded in a discovery index
+    :rtype: (Dict[str, List[str]], Dict[str, List[str]])
+    """
+    protocols, extensions = {}, {}
     for module in modules:
         for name, obj in inspect.getmembers(module):
             if not inspect.isclass(obj):
                 continue
             if issubclass(obj, cabinets.Cabinet) and obj is not cabinets.Cabinet:
                 load_to_cache(obj, PROTOCOLS, cabinets.Cabinet)
+                protocols.update({key: [module.__name__, name]
+                                  for key in obj._protocols})
             elif issubclass(obj, cabinets.Parser) and obj is not cabinets.Parser:
                 load_to_cache(obj, EXTENSIONS, cabinets.Parser)
+                extensions.update({key: [module.__name__, name]
+                                   for key in obj._extensions})
+    return protocols, extensions
+
+
+def discover_all(custom_plugin_path=None, index_dir=None):
+    """
+    Build the registries of built-in and custom protocols and extensions.
+
+    With an `index_dir`, the classes found in the custom plugin path are recorded in
+    a discovery index. As long as the plugin files are unchanged, later calls read
+    the index instead of importing every plugin module, and plugin modules are only
+    imported when their protocol or extension is first used.
+
+    :param str custom_plugin_path: Path holding `cabinet` and `parser` plugin
+        directories
+    :param str index_dir: Directory holding discovery indexes, `None` to always
+        import and inspect every plugin module
+    :return: Protocol and extension registries
+    :rtype: (LazyRegistry, LazyRegistry)
+    """
+    PROTOCOLS, EXTENSIONS = built_ins()
+    if not custom_plugin_path:
+        return PROTOCOLS, EXTENSIONS
+
+    paths = [os.path.join(custom_plugin_path, pkg) for pkg in PLUGIN_PACKAGES]
+    for path in paths:
+        sys.path.insert(1, path)
+
+    files = plugin_files(custom_plugin_path) if index_dir else None
+    if files:
+        index_path = index_file(index_dir, custom_plugin_path)
+        index = read_index(index_path, files)
+        if index is not None:
+            debug(f"Loaded plugin index '{index_path}'")
+            for key, (module, attribute) in index['protocols'].items():
+                PROTOCOLS.register_lazy(key, module, attribute)
+            for key, (module, attribute) in index['extensions'].items():
+                EXTENSIONS.register_lazy(key, module, attribute)
+            return PROTOCOLS, EXTENSIONS
+
+    modules = set()
+    for path in paths:
+        modules.update(discover((path,)))
+    protocols, extensions = load_modules(modules, PROTOCOLS, EXTENSIONS)
+    if files:
+        write_index(index_path, files, protocols, extensions)
 
     return PROTOCOLS, EXTENSIONS
@@ -0,0 +1,84 @@
+import importlib
+from collections.abc import MutableMapping
+from typing import Any, NamedTuple
+
+
+class LazyEntry(NamedTuple):
+    """
+    Class registered by name, imported on first lookup.
+
+    :param str module: Absolute name of the module defining the class
+    :param str attribute: Name of the class within the module
+    """
+    module: str
+    attribute: str
+
+    def load(self) -> Any:
+        return getattr(importlib.import_module(self.module), self.attribute)
+
+
+class LazyRegistry(MutableMapping):
+    """
+    Mapping of protocol or extension identifiers to the classes handling them.
+    Classes may be registered as a `LazyEntry`, in which case their module is
+    only imported when the identifier is first looked up.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._entries = {}
+        self.update(*args, **kwargs)
+
+    def register_lazy(self, key: str, module: str, attribute: str):
+        """
+        Register a class by module and class name without importing it.
+
+        :param str key: Protocol or extension identifier
+        :param str module: Absolute name of the module defining the class
+        :param str attribute: Name of the class within the module
+        """
+        self._entries[key] = LazyEntry(module, attribute)
+
+    def is_loaded(self, key: str) -> bool:
+        """Whether the class registered to an identifier has been imported"""
+        return not isinstance(self._entries[key], LazyEntry)
+
+    def describe(self, key: str) -> str:
+        """Name of the class registered to an identifier, without importing it"""
+        value = self._entries[key]
+        if isinstance(value, LazyEntry):
+            return f'{value.module}.{value.attribute}'
+        return value.__qualname__
+
+    def update(self, *args, **kwargs):
+        # copy lazy entries of other registries as they are, rather than
+        # importing them through `__getitem__`
+        if len(args) == 1 and isinstance(args[0], LazyRegistry):
+            self._entries.update(args[0]._entries)
+            args = ()
+        super().update(*args, **kwargs)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._entries[key]
+        if isinstance(value, LazyEntry):
+            value = value.load()
+            self._entries[key] = value
+        return value
+
+    def __contains__(self, key) -> bool:
+        # `MutableMapping` would look the key up, importing lazy entries
+        return key in self._entries
+
+    def __setitem__(self, key: str, value: Any):
+        self._entries[key] = value
+
+    def __delitem__(self, key: str):
+        del self._entries[key]
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self._entries!r})'
@@ -0,0 +1,44 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from cabinets import metrics
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key, so that only the first runs and
+    the others wait for and share its result. Calls made after it completed run
+    again, so no result outlives its call.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Call a function, unless a call for the same key is in flight.
+
+        :param Hashable key: Identifier of the call
+        :param fn: Zero-argument callable
+        :return: Result of the call, and whether it was shared with an earlier
+            caller
+        :raises Exception: Exception raised by the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            shared = call is not None
+            if not shared:
+                call = self._calls[key] = Future()
+        if shared:
+            metrics.increment('single_flight.coalesced')
+            return call.result(), True
+        try:
+            call.set_result(fn())
+        except BaseException as ex:
+            call.set_exception(ex)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return call.result(), False
@@ -0,0 +1,46 @@
+from typing import List, NamedTuple
+
+from cabinets.batch import BatchResult
+from cabinets.cabinet import FileInfo
+
+
+class SyncResult(NamedTuple):
+    """
+    Outcome of a directory sync.
+
+    :param List[BatchResult] copied: Result for each destination file copied
+    :param List[BatchResult] deleted: Result for each destination file deleted
+    :param int unchanged: Number of files already up to date
+    """
+    copied: List[BatchResult]
+    deleted: List[BatchResult]
+    unchanged: int
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.copied + self.deleted)
+
+
+def is_modified(src: FileInfo, dst: FileInfo) -> bool:
+    """
+    Whether a source file differs from its copy at a destination, judged from
+    listing metadata alone.
+
+    Files of different sizes differ, and files with equal ETags are the same. ETags
+    are not always comparable (those of local files are derived from their
+    modification time, and S3 multipart ETags depend on the part size), so
+    otherwise a source modified after its copy is considered changed. Copies are
+    always written after their source was modified, so they are newer as long as
+    the source did not change since.
+
+    :param FileInfo src: Metadata of the source file
+    :param FileInfo dst: Metadata of the destination file
+    :rtype: bool
+    """
+    if src.size != dst.size:
+        return True
+    if src.etag is not None and src.etag == dst.etag:
+        return False
+    if src.last_modified is None or dst.last_modified is None:
+        return True
+    return src.last_modified > dst.last_modified
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import boto3
+from moto import mock_s3
+
+from cabinets import aio, Cabinet, NotModified
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class SyncOnlyCabinet(Cabinet):
+    contents = {}
+    threads = set()
+
+    @classmethod
+    def set_configuration(cls, **kwargs):
+        return NotImplemented
+
+    @classmethod
+    def read_content(cls, path, **kwargs) -> bytes:
+        cls.threads.add(threading.get_ident())
+        return cls.contents[path]
+
+    @classmethod
+    def create_content(cls, path, content, **kwargs):
+        cls.threads.add(threading.get_ident())
+        cls.contents[path] = content.encode() if isinstance(content, str) else content
+
+    @classmethod
+    def delete_content(cls, path, **kwargs):
+        del cls.contents[path]
+
+    @classmethod
+    def list(cls, directory, **kwargs):
+        return sorted(cls.contents)
+
+
+class TestAsyncFileCabinet(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_read_create_delete_list(self):
+        filename = os.path.join(self.tmp.name, 'test.json')
+        data = {'I': {'am': ['nested', 1, 'object', None]}}
+        run(aio.create(f'file://{filename}', data))
+        self.assertDictEqual(run(aio.read(f'file://{filename}')), data)
+        self.assertEqual(run(aio.list(self.tmp.name)), ['test.json'])
+
+    def test_conditional_read(self):
+        filename = os.path.join(self.tmp.name, 'test.json')
+        run(aio.create(filename, [1]))
+        data, info = run(aio.read(filename, with_info=True))
+        self.assertEqual(data, [1])
+        with self.assertRaises(NotModified):
+            run(aio.read(filename, if_none_match=info.etag))
+        run(aio.delete(filename))
+        self.assertFalse(os.path.exists(filename))
+
+    def test_concurrent_reads(self):
+        filenames = [os.path.join(self.tmp.name, f'{i}.txt') for i in range(10)]
+
+        async def create_then_read():
+            await asyncio.gather(*(aio.create(f, str(i))
+                                   for i, f in enumerate(filenames)))
+            return await asyncio.gather(*(aio.read(f) for f in filenames))
+
+        self.assertEqual(run(create_then_read()), [str(i) for i in range(10)])
+
+
+class TestAsyncFallback(unittest.TestCase):
+
+    def tearDown(self):
+        SyncOnlyCabinet.contents = {}
+        SyncOnlyCabinet.threads = set()
+
+    def test_sync_cabinet_runs_in_executor(self):
+        run(SyncOnlyCabinet.create_async('a.json', {'a': 1}))
+        self.assertEqual(run(SyncOnlyCabinet.read_async('a.json')), {'a': 1})
+        self.assertEqual(run(SyncOnlyCabinet.list_async('')), ['a.json'])
+        self.assertNotIn(threading.get_ident(), SyncOnlyCabinet.threads)
+        run(SyncOnlyCabinet.delete_async('a.json'))
+        self.assertEqual(SyncOnlyCabinet.contents, {})
+
+
+@mock_s3
+@patch.dict(os.environ, {'AWS_ACCESS_KEY_ID': 'testing',
+                         'AWS_SECRET_ACCESS_KEY': 'testing',
+                         'AWS_SECURITY_TOKEN': 'testing',
+                         'AWS_SESSION_TOKEN': 'testing', })
+class TestAsyncS3Cabinet(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._bucket = 'mock-bucket'
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+
+    def test_read_create_delete_list(self):
+        uri = f's3://{self._bucket}/test.yml'
+        data = {'I': {'am': ['nested', 1, 'object', None]}}
+        run(aio.create(uri, data))
+        self.assertDictEqual(run(aio.read(uri)), data)
+        self.assertEqual(run(aio.list(f's3://{self._bucket}')), ['test.yml'])
+        run(aio.delete(uri))
+        self.assertEqual(run(aio.list(f's3://{self._bucket}')), [])
@@ -1,7 +1,12 @@
+import errno
 import json
 import os
+import shutil
 import unittest
 import pathlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from types import SimpleNamespace
 from unittest.mock import patch
 
@@ -10,7 +15,9 @@ from moto import mock_s3
 from pyfakefs import fake_filesystem_unittest
 
 import cabinets
-from cabinets import InvalidURIError, CabinetError
+from cabinets import metrics
+from cabinets import InvalidURIError, CabinetError, Cabinet, FileInfo, NotModified
+from cabinets.batch import iter_prefetched
 from cabinets.cabinet.file_cabinet import FileCabinet
 from cabinets.cabinet.s3_cabinet import S3Cabinet
 
@@ -105,6 +112,45 @@ class TestFileCabinet(fake_filesystem_unittest.TestCase):
             data = fh.read()
         self.assertEqual(content, data)
 
+    def test_read_stream(self):
+        filename = os.path.join(self.fixture_path, 'sample.txt')
+        with open(filename, 'rb') as fh:
+            expected = fh.read()
+        chunks = [*cabinets.read_stream(f'file://{filename}', chunk_size=16)]
+        self.assertTrue(all(len(chunk) <= 16 for chunk in chunks))
+        self.assertEqual(b''.join(chunks), expected)
+
+    def test_open(self):
+        filename = os.path.join(self.fixture_path, 'sample.json')
+        with cabinets.open(f'file://{filename}') as fh:
+            self.assertEqual(json.load(fh), {'hello': 'world'})
+
+    def test_create_from_iterator(self):
+        filename = 'tmp/streamed.txt'
+        chunks = (f'line {i}\n'.encode() for i in range(100))
+        cabinets.create(f'file://{filename}', chunks, parser=False)
+        with open(filename) as fh:
+            self.assertEqual(fh.read(), ''.join(f'line {i}\n' for i in range(100)))
+
+    def test_create_from_file_object(self):
+        source = os.path.join(self.fixture_path, 'sample.txt')
+        with open(source, 'rb') as fh:
+            cabinets.create('file://tmp/copy.txt', fh, parser=False)
+        with open(source, 'rb') as src, open('tmp/copy.txt', 'rb') as dst:
+            self.assertEqual(src.read(), dst.read())
+
+    def test_read_byte_range(self):
+        filename = os.path.join(self.fixture_path, 'sample.txt')
+        uri = f'file://{filename}'
+        self.assertEqual(cabinets.read(uri, byte_range=(5, 16)), 'sample text')
+        self.assertEqual(cabinets.read(uri, parser=False, byte_range=(0, 4)), b'I am')
+        self.assertEqual(cabinets.read(uri, parser=False, byte_range=(1000, None)),
+                         b'')
+        with open(filename, 'rb') as fh:
+            fh.seek(100)
+            self.assertEqual(
+                cabinets.read(uri, parser=False, byte_range=(100, None)), fh.read())
+
     def test_list(self):
         self.assertCountEqual(
             cabinets.list(os.path.join(self.fixture_path, 'example')),
@@ -119,6 +165,367 @@ class TestFileCabinet(fake_filesystem_unittest.TestCase):
             cabinets.list(os.path.join(self.fixture_path, 'example', 'empty_subdir')),
             [])
 
+    def test_stat_and_list_detailed(self):
+        directory = os.path.join(self.fixture_path, 'example')
+        filename = os.path.join(directory, 'test.json')
+        info = cabinets.stat(filename)
+        self.assertEqual(info.name, 'test.json')
+        self.assertEqual(info.size, os.path.getsize(filename))
+        self.assertEqual(info.last_modified, os.path.getmtime(filename))
+        self.assertTrue(info.etag.startswith('W/"'))
+        detailed = cabinets.list_detailed(directory)
+        self.assertCountEqual([file.name for file in detailed],
+                              cabinets.list(directory))
+        self.assertIn(info, detailed)
+        with self.assertRaises(FileNotFoundError):
+            cabinets.stat(os.path.join(directory, 'missing.json'))
+
+    def test_conditional_read(self):
+        filename = os.path.join(self.fixture_path, 'sample.json')
+        data, info = cabinets.read(filename, with_info=True)
+        self.assertEqual(data, {'hello': 'world'})
+        self.assertEqual(info, cabinets.stat(filename))
+        with patch.object(FileCabinet, 'read_content') as read_content:
+            with self.assertRaises(NotModified):
+                cabinets.read(filename, if_none_match=info.etag)
+            with self.assertRaises(NotModified):
+                cabinets.read(filename, if_modified_since=info.last_modified)
+        read_content.assert_not_called()
+        self.assertEqual(cabinets.read(filename, if_none_match='"other"',
+                                       if_modified_since=info.last_modified),
+                         {'hello': 'world'})
+        self.assertEqual(cabinets.read(filename, parser=False, byte_range=(2, 7),
+                                       if_modified_since=info.last_modified - 1),
+                         b'hello')
+
+    def test_iter_list(self):
+        listing = cabinets.iter_list(os.path.join(self.fixture_path, 'example'))
+        self.assertNotIsInstance(listing, list)
+        self.assertCountEqual(listing, ['test.json', 'test2.yaml'])
+
+
+class MemoryCabinet(Cabinet):
+    """Cabinet implementing only the required methods, for testing fallbacks"""
+    contents = {}
+
+    @classmethod
+    def set_configuration(cls, **kwargs):
+        return NotImplemented
+
+    @classmethod
+    def read_content(cls, path, **kwargs) -> bytes:
+        return cls.contents[path]
+
+    @classmethod
+    def create_content(cls, path, content, **kwargs):
+        if isinstance(content, str):
+            content = content.encode()
+        cls.contents[path] = content
+
+    @classmethod
+    def delete_content(cls, path, **kwargs):
+        del cls.contents[path]
+
+    @classmethod
+    def list(cls, directory, **kwargs):
+        return [path for path in cls.contents if '/' not in path]
+
+
+class TestCabinetFallbacks(unittest.TestCase):
+
+    def tearDown(self):
+        MemoryCabinet.contents = {}
+
+    def test_read_stream(self):
+        MemoryCabinet.contents['a.txt'] = b'0123456789'
+        chunks = [*MemoryCabinet.read_stream('a.txt', chunk_size=4)]
+        self.assertEqual(chunks, [b'0123', b'4567', b'89'])
+
+    def test_create_stream(self):
+        chunks = iter([b'01', b'23', b'45'])
+        MemoryCabinet.create('a.txt', chunks, parser=False)
+        self.assertEqual(MemoryCabinet.contents['a.txt'], b'012345')
+
+    def test_read_byte_range_falls_back_to_slicing(self):
+        MemoryCabinet.contents['a.txt'] = b'0123456789'
+        metrics.reset_metrics()
+        self.assertEqual(MemoryCabinet.read('a.txt', parser=False,
+                                            byte_range=(2, 5)), b'234')
+        self.assertEqual(MemoryCabinet.read('a.txt', byte_range=(7, None)), '789')
+        self.assertEqual(metrics.get_metrics()['byte_range.fallback'], 2)
+
+    def test_read_invalid_byte_range(self):
+        MemoryCabinet.contents['a.txt'] = b'0123456789'
+        for byte_range in [(5, 2), (-1, 2), 3, (1, 2, 3)]:
+            with self.assertRaises(CabinetError):
+                MemoryCabinet.read('a.txt', byte_range=byte_range)
+
+    def test_stat_and_list_detailed_fall_back_to_reading(self):
+        MemoryCabinet.contents['a.txt'] = b'0123456789'
+        MemoryCabinet.contents['b.txt'] = b''
+        metrics.reset_metrics()
+        self.assertEqual(MemoryCabinet.stat('a.txt'), FileInfo('a.txt', 10))
+        self.assertCountEqual(MemoryCabinet.list_detailed(''),
+                              [FileInfo('a.txt', 10), FileInfo('b.txt', 0)])
+        self.assertEqual(metrics.get_metrics()['stat.fallback'], 3)
+
+    def test_delete_many(self):
+        MemoryCabinet.contents.update({'a.txt': b'a', 'b.txt': b'b'})
+        results = MemoryCabinet.delete_many(['a.txt', 'missing.txt', 'b.txt'])
+        self.assertEqual([r.ok for r in results], [True, False, True])
+        self.assertIsInstance(results[1].error, KeyError)
+        self.assertEqual(MemoryCabinet.contents, {})
+
+    def test_copy_and_move_stream_contents(self):
+        MemoryCabinet.contents['a.txt'] = b'0123456789'
+        MemoryCabinet.copy('a.txt', 'b.txt')
+        MemoryCabinet.move('b.txt', 'c.txt')
+        self.assertEqual(MemoryCabinet.contents, {'a.txt': b'0123456789',
+                                                  'c.txt': b'0123456789'})
+
+    def test_conditional_read_falls_back_to_content_digest(self):
+        MemoryCabinet.contents['a.txt'] = b'0123456789'
+        metrics.reset_metrics()
+        data, info = MemoryCabinet.read('a.txt', with_info=True)
+        self.assertEqual((data, info.size, info.last_modified),
+                         ('0123456789', 10, None))
+        with self.assertRaises(NotModified):
+            MemoryCabinet.read('a.txt', if_none_match=info.etag)
+        # without a modification time, the file is always considered modified
+        self.assertEqual(MemoryCabinet.read('a.txt', if_modified_since=1e12,
+                                            byte_range=(2, 4)), '23')
+        MemoryCabinet.contents['a.txt'] = b'changed'
+        self.assertEqual(MemoryCabinet.read('a.txt', if_none_match=info.etag),
+                         'changed')
+        self.assertEqual(metrics.get_metrics()['conditional_read.fallback'], 4)
+
+    def test_walk_unsupported(self):
+        with self.assertRaises(CabinetError):
+            [*MemoryCabinet.walk('')]
+
+
+class TestBatch(unittest.TestCase):
+    fixture_path = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+    # concurrent tests use a real temporary directory since the fake filesystem
+    # is not thread-safe
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_read_many_in_order(self):
+        uris = [f'file://{self.tmp.name}/{i}.json' for i in range(20)]
+        for i, uri in enumerate(uris):
+            cabinets.create(uri, {'index': i})
+        results = cabinets.read_many(uris, max_workers=4)
+        self.assertEqual([r.uri for r in results], uris)
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual([r.value for r in results],
+                         [{'index': i} for i in range(20)])
+
+    def test_read_many_reports_failures_per_uri(self):
+        good = os.path.join(self.fixture_path, 'sample.json')
+        missing = os.path.join(self.tmp.name, 'missing.json')
+        uris = [good, missing, 'foo://unknown.json', good]
+        results = cabinets.read_many(uris, parser=False)
+        self.assertEqual([r.ok for r in results], [True, False, False, True])
+        self.assertIsInstance(results[1].error, FileNotFoundError)
+        self.assertIsInstance(results[2].error, InvalidURIError)
+        self.assertEqual(results[0].value, b'{"hello": "world"}')
+
+    def test_read_many_unordered(self):
+        uris = [os.path.join(self.tmp.name, f'{i}.txt') for i in range(10)]
+        for i, uri in enumerate(uris):
+            cabinets.create(uri, str(i))
+        results = cabinets.read_many(uris, ordered=False)
+        self.assertNotIsInstance(results, type([]))
+        self.assertCountEqual([(r.uri, r.value) for r in results],
+                              [(uri, str(i)) for i, uri in enumerate(uris)])
+
+    def test_iter_read_in_listing_order(self):
+        for i in range(10):
+            cabinets.create(os.path.join(self.tmp.name, f'{i}.json'), {'index': i})
+        os.mkdir(os.path.join(self.tmp.name, 'sub'))
+        pairs = [*cabinets.iter_read(self.tmp.name, prefetch=3)]
+        self.assertEqual([name for name, _ in pairs], cabinets.list(self.tmp.name))
+        self.assertCountEqual([data for _, data in pairs],
+                              [{'index': i} for i in range(10)])
+
+    def test_iter_read_raises_failed_read(self):
+        cabinets.create(os.path.join(self.tmp.name, 'bad.json'), b'{', parser=False)
+        with self.assertRaises(ValueError):
+            [*cabinets.iter_read(self.tmp.name)]
+        self.assertEqual([*cabinets.iter_read(self.tmp.name, parser=False)],
+                         [('bad.json', b'{')])
+
+    def test_iter_prefetched_is_bounded(self):
+        lock = threading.Lock()
+        started, peak = [0], [0]
+
+        def task(i):
+            def run():
+                with lock:
+                    started[0] += 1
+                return i
+            return i, run
+
+        pairs = iter_prefetched((task(i) for i in range(20)), prefetch=3)
+        for key, value in pairs:
+            self.assertEqual(key, value)
+            with lock:
+                peak[0] = max(peak[0], started[0] - key - 1)
+        self.assertEqual(started[0], 20)
+        self.assertLessEqual(peak[0], 3)
+        with self.assertRaises(ValueError):
+            next(iter_prefetched([], prefetch=0))
+
+    def test_create_many(self):
+        items = [(os.path.join(self.tmp.name, 'out', f'{i}.json'), {'index': i})
+                 for i in range(20)]
+        results = cabinets.create_many(items, max_workers=4)
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual([r.uri for r in results], [uri for uri, _ in items])
+        for uri, content in items:
+            with open(uri) as fh:
+                self.assertEqual(json.load(fh), content)
+
+    def test_create_many_reports_failures_per_uri(self):
+        blocker = os.path.join(self.tmp.name, 'blocker')
+        cabinets.create(blocker, b'', parser=False)
+        items = [(os.path.join(self.tmp.name, 'a.txt'), 'a'),
+                 (os.path.join(blocker, 'b.txt'), 'b'),
+                 (os.path.join(self.tmp.name, 'c.unknown'), 'c')]
+        results = cabinets.create_many(items)
+        self.assertEqual([r.ok for r in results], [True, False, False])
+        self.assertIsInstance(results[2].error, KeyError)
+
+
+class TestFileCabinetWalk(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.files = ['a.txt', os.path.join('x', 'b.txt'),
+                      os.path.join('x', 'y', 'c.txt'), os.path.join('z', 'd.txt')]
+        for file in self.files:
+            cabinets.create(os.path.join(self.tmp.name, file), b'', parser=False)
+        os.makedirs(os.path.join(self.tmp.name, 'empty'))
+
+    def test_walk(self):
+        self.assertCountEqual(cabinets.walk(self.tmp.name, max_workers=3), self.files)
+
+    def test_walk_max_depth(self):
+        self.assertCountEqual(cabinets.walk(self.tmp.name, max_depth=0), ['a.txt'])
+        self.assertCountEqual(cabinets.walk(self.tmp.name, max_depth=1),
+                              ['a.txt', os.path.join('x', 'b.txt'),
+                               os.path.join('z', 'd.txt')])
+
+    def test_walk_does_not_follow_directory_links(self):
+        os.symlink(self.tmp.name, os.path.join(self.tmp.name, 'x', 'loop'))
+        self.assertCountEqual(cabinets.walk(self.tmp.name), self.files)
+
+    def test_delete_many(self):
+        uris = [os.path.join(self.tmp.name, 'a.txt'),
+                os.path.join(self.tmp.name, 'missing.txt'),
+                f"file://{os.path.join(self.tmp.name, 'x', 'b.txt')}", 'foo://bar']
+        results = cabinets.delete_many(uris, max_workers=2)
+        self.assertEqual([r.uri for r in results], uris)
+        self.assertEqual([r.ok for r in results], [True, False, True, False])
+        self.assertIsInstance(results[1].error, FileNotFoundError)
+        self.assertIsInstance(results[3].error, InvalidURIError)
+        self.assertCountEqual(cabinets.walk(self.tmp.name), self.files[2:])
+
+    def test_delete_prefix(self):
+        results = cabinets.delete_prefix(os.path.join(self.tmp.name, 'x'))
+        self.assertTrue(all(r.ok for r in results))
+        self.assertCountEqual([r.uri for r in results],
+                              [os.path.join(self.tmp.name, file)
+                               for file in self.files[1:3]])
+        self.assertCountEqual(cabinets.walk(self.tmp.name),
+                              [self.files[0], self.files[3]])
+
+    def test_walk_missing_directory(self):
+        with self.assertRaises(FileNotFoundError):
+            [*cabinets.walk(os.path.join(self.tmp.name, 'missing'))]
+
+
+class TestFileCabinetCopy(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.src = os.path.join(self.tmp.name, 'src.bin')
+        self.content = os.urandom(1000)
+        with open(self.src, 'wb') as file:
+            file.write(self.content)
+
+    def _read(self, path):
+        with open(path, 'rb') as file:
+            return file.read()
+
+    def test_copy(self):
+        dst = os.path.join(self.tmp.name, 'new', 'dst.bin')
+        with patch('shutil.copyfile', wraps=shutil.copyfile) as copyfile:
+            cabinets.copy(self.src, f'file://{dst}')
+        copyfile.assert_called_once()
+        self.assertEqual(self._read(dst), self.content)
+        self.assertTrue(os.path.exists(self.src))
+
+    def test_move_renames(self):
+        dst = os.path.join(self.tmp.name, 'new', 'dst.bin')
+        with patch('os.replace', wraps=os.replace) as replace:
+            cabinets.move(self.src, dst)
+        replace.assert_called_once()
+        self.assertEqual(self._read(dst), self.content)
+        self.assertFalse(os.path.exists(self.src))
+
+    def test_move_across_filesystems_copies(self):
+        dst = os.path.join(self.tmp.name, 'dst.bin')
+        with patch('os.replace', side_effect=OSError(errno.EXDEV, 'cross-device')):
+            cabinets.move(self.src, dst)
+        self.assertEqual(self._read(dst), self.content)
+        self.assertFalse(os.path.exists(self.src))
+
+    def test_copy_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            cabinets.copy(os.path.join(self.tmp.name, 'missing'),
+                          os.path.join(self.tmp.name, 'dst'))
+
+
+class TestFileCabinetMemoryMap(unittest.TestCase):
+
+    # memory mapping needs real file descriptors, which the fake filesystem
+    # does not provide
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_read_mmap_returns_read_only_view(self):
+        filename = os.path.join(self.tmp.name, 'data.bin')
+        content = os.urandom(4096)
+        cabinets.create(filename, content, parser=False)
+        view = cabinets.read(filename, parser=False, mmap=True)
+        self.assertIsInstance(view, memoryview)
+        self.assertTrue(view.readonly)
+        self.assertEqual(view, content)
+        self.assertEqual(
+            cabinets.read(filename, parser=False, mmap=True, byte_range=(10, 20)),
+            content[10:20])
+
+    def test_read_mmap_parsed(self):
+        nested = {'I': ['am', 1, None]}
+        samples = {'test.json': nested, 'test.yml': nested, 'test.pickle': nested,
+                   'test.txt': 'text', 'test.csv': [['a', 'b'], ['1', '2']]}
+        for name, data in samples.items():
+            filename = os.path.join(self.tmp.name, name)
+            cabinets.create(filename, data)
+            self.assertEqual(cabinets.read(filename, mmap=True), data)
+
+    def test_read_mmap_empty_file(self):
+        filename = os.path.join(self.tmp.name, 'empty.txt')
+        cabinets.create(filename, '')
+        self.assertEqual(cabinets.read(filename, mmap=True), '')
+
 
 class TestFileCabinetWithPathObjects(fake_filesystem_unittest.TestCase):
     fixture_path = os.path.join(os.path.dirname(__file__), 'fixtures')
@@ -217,6 +624,153 @@ class TestS3CabinetNoRegion(unittest.TestCase):
         result = cabinets.read(f'{protocol}://{filename}')
         self.assertDictEqual(data, result)
 
+    def test_create_many_read_many(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        items = [(f's3://{self._bucket}/batch/{i}.json', {'index': i})
+                 for i in range(10)]
+        items.append(('s3://missing-bucket/batch/x.json', {}))
+        results = cabinets.create_many(items, max_workers=4)
+        self.assertEqual([r.ok for r in results], [True] * 10 + [False])
+        self.assertIsInstance(results[-1].error, CabinetError)
+
+        results = cabinets.read_many([uri for uri, _ in items], max_workers=4)
+        self.assertEqual([r.value for r in results[:-1]],
+                         [content for _, content in items[:-1]])
+        self.assertFalse(results[-1].ok)
+
+    def test_read_stream(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        content = os.urandom(100)
+        self.client.put_object(Bucket=self._bucket, Key='data.bin', Body=content)
+        chunks = [*cabinets.read_stream(f's3://{self._bucket}/data.bin',
+                                        chunk_size=32)]
+        self.assertEqual([len(chunk) for chunk in chunks], [32, 32, 32, 4])
+        self.assertEqual(b''.join(chunks), content)
+
+    def test_create_stream_single_put_below_threshold(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        chunks = iter([b'a' * 10, b'b' * 10])
+        with patch.object(S3Cabinet, 'multipart_threshold', 64):
+            cabinets.create(f's3://{self._bucket}/small.bin', chunks, parser=False)
+        resp = self.client.get_object(Bucket=self._bucket, Key='small.bin')
+        self.assertEqual(resp['Body'].read(), b'a' * 10 + b'b' * 10)
+        self.assertNotIn('-', resp['ETag'])
+
+    @patch('moto.s3.models.S3_UPLOAD_PART_MIN_SIZE', 16)
+    def test_create_stream_multipart(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        content = os.urandom(1000)
+        chunks = (content[i:i + 7] for i in range(0, len(content), 7))
+        with patch.multiple(S3Cabinet, multipart_threshold=64,
+                            multipart_chunksize=64, max_concurrency=3):
+            created = cabinets.create(f's3://{self._bucket}/large.bin', chunks,
+                                      parser=False)
+        self.assertTrue(created)
+        resp = self.client.get_object(Bucket=self._bucket, Key='large.bin')
+        self.assertEqual(resp['Body'].read(), content)
+        # multipart ETags are suffixed with the number of parts
+        self.assertTrue(resp['ETag'].strip('"').endswith('-16'))
+
+    @patch('moto.s3.models.S3_UPLOAD_PART_MIN_SIZE', 16)
+    def test_create_multipart(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        data = [{'index': i} for i in range(100)]
+        S3Cabinet._ensure_client_exists()
+        with patch.multiple(S3Cabinet, multipart_threshold=64,
+                            multipart_chunksize=64, max_concurrency=3), \
+                patch.object(S3Cabinet.client, 'upload_part',
+                             wraps=S3Cabinet.client.upload_part) as upload_part:
+            created = cabinets.create(f's3://{self._bucket}/large.json', data)
+        self.assertTrue(created)
+        self.assertGreater(upload_part.call_count, 1)
+        self.assertEqual(cabinets.read(f's3://{self._bucket}/large.json'), data)
+        resp = self.client.head_object(Bucket=self._bucket, Key='large.json')
+        self.assertTrue(resp['ETag'].strip('"').endswith(f'-{upload_part.call_count}'))
+
+    @patch('moto.s3.models.S3_UPLOAD_PART_MIN_SIZE', 16)
+    def test_create_stream_multipart_failure_aborts(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        chunks = iter([b'x' * 100] * 10)
+        S3Cabinet._ensure_client_exists()
+        with patch.multiple(S3Cabinet, multipart_threshold=64,
+                            multipart_chunksize=64), \
+                patch.object(S3Cabinet.client, 'upload_part',
+                             side_effect=RuntimeError('boom')):
+            created = cabinets.create(f's3://{self._bucket}/large.bin', chunks,
+                                      parser=False)
+        self.assertFalse(created)
+        uploads = self.client.list_multipart_uploads(Bucket=self._bucket)
+        self.assertEqual(uploads.get('Uploads', []), [])
+
+    def test_read_ranged_parts(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        content = os.urandom(1000)
+        self.client.put_object(Bucket=self._bucket, Key='large.bin', Body=content)
+        S3Cabinet._ensure_client_exists()
+        with patch.multiple(S3Cabinet, multipart_threshold=100,
+                            multipart_chunksize=64, max_concurrency=4), \
+                patch.object(S3Cabinet.client, 'get_object',
+                             wraps=S3Cabinet.client.get_object) as get_object:
+            result = cabinets.read(f's3://{self._bucket}/large.bin', parser=False)
+        self.assertEqual(result, content)
+        self.assertIsInstance(result, bytes)
+        # one request for the first 100 bytes, then 900 bytes in 64 byte parts
+        self.assertEqual(get_object.call_count, 1 + 15)
+
+    def test_read_ranged_parts_cannot_change_cache(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        content = os.urandom(1000)
+        self.client.put_object(Bucket=self._bucket, Key='large.bin', Body=content)
+        S3Cabinet.set_cache(max_bytes=2000)
+        self.addCleanup(S3Cabinet.set_cache, None)
+        uri = f's3://{self._bucket}/large.bin'
+        with patch.multiple(S3Cabinet, multipart_threshold=100,
+                            multipart_chunksize=64):
+            result = cabinets.read(uri, parser=False)
+            with self.assertRaises(TypeError):
+                result[0:5] = b'EVIL!'
+            self.assertEqual(cabinets.read(uri, parser=False), content)
+        self.assertEqual(S3Cabinet._cache.stats()['bytes'], 1000)
+
+    def test_read_byte_range(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        content = os.urandom(1000)
+        self.client.put_object(Bucket=self._bucket, Key='data.bin', Body=content)
+        self.client.put_object(Bucket=self._bucket, Key='empty.bin', Body=b'')
+        uri = f's3://{self._bucket}/data.bin'
+        for byte_range in [(0, 10), (990, None), (500, 2000), (1000, None), (5, 5)]:
+            start, end = byte_range
+            self.assertEqual(cabinets.read(uri, parser=False, byte_range=byte_range),
+                             content[start:end])
+        self.assertEqual(cabinets.read(f's3://{self._bucket}/empty.bin',
+                                       parser=False, byte_range=(0, 10)), b'')
+
+        # large ranges are downloaded in parts too
+        with patch.multiple(S3Cabinet, multipart_threshold=100,
+                            multipart_chunksize=64):
+            self.assertEqual(
+                cabinets.read(uri, parser=False, byte_range=(150, 875)),
+                content[150:875])
+
+    def test_read_small_and_empty_objects(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        self.client.put_object(Bucket=self._bucket, Key='small.bin', Body=b'abc')
+        self.client.put_object(Bucket=self._bucket, Key='empty.bin', Body=b'')
+        self.assertEqual(
+            cabinets.read(f's3://{self._bucket}/small.bin', parser=False), b'abc')
+        self.assertEqual(
+            cabinets.read(f's3://{self._bucket}/empty.bin', parser=False), b'')
+
     def test_list_bucket_level(self):
         self.client = boto3.client('s3', 'us-east-2')
         self.client.create_bucket(
@@ -257,6 +811,235 @@ class TestS3CabinetNoRegion(unittest.TestCase):
         listed_files = cabinets.list(f's3://{self._bucket}/subdir')
         self.assertCountEqual(listed_files, ['file2.txt', 'file3'])
 
+    def test_list_strips_prefix_not_characters(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        files = ['data/ada.txt', 'data/data.csv', 'data/', 'database/other.txt']
+        for file in files:
+            self.client.put_object(Bucket=self._bucket, Key=file, Body=b'abcd')
+
+        listed_files = cabinets.list(f's3://{self._bucket}/data')
+        self.assertCountEqual(listed_files, ['ada.txt', 'data.csv'])
+
+    def test_copy_and_move(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        self.client.put_object(Bucket=self._bucket, Key='a.txt', Body=b'abcd')
+
+        S3Cabinet._ensure_client_exists()
+        with patch.object(S3Cabinet.client, 'copy_object',
+                          wraps=S3Cabinet.client.copy_object) as copy_object:
+            self.assertTrue(cabinets.copy(f's3://{self._bucket}/a.txt',
+                                          f's3://{self._bucket}/b.txt'))
+        copy_object.assert_called_once()
+        self.assertTrue(cabinets.move(f's3://{self._bucket}/b.txt',
+                                      f's3://{self._bucket}/dir/c.txt'))
+        self.assertCountEqual(cabinets.walk(f's3://{self._bucket}'),
+                              ['a.txt', 'dir/c.txt'])
+        self.assertEqual(cabinets.read(f's3://{self._bucket}/dir/c.txt'), 'abcd')
+
+    def test_copy_and_move_missing_object(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        self.assertFalse(cabinets.copy(f's3://{self._bucket}/missing.txt',
+                                       f's3://{self._bucket}/b.txt'))
+        self.assertFalse(cabinets.move(f's3://{self._bucket}/missing.txt',
+                                       f's3://{self._bucket}/b.txt'))
+
+    @patch('moto.s3.models.S3_UPLOAD_PART_MIN_SIZE', 16)
+    def test_copy_multipart(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        content = os.urandom(1000)
+        self.client.put_object(Bucket=self._bucket, Key='large.bin', Body=content,
+                               ContentType='application/x-test',
+                               Metadata={'origin': 'test'})
+
+        with patch.multiple(S3Cabinet, multipart_threshold=64,
+                            multipart_chunksize=64, max_concurrency=3):
+            self.assertTrue(cabinets.copy(f's3://{self._bucket}/large.bin',
+                                          f's3://{self._bucket}/copy.bin'))
+        resp = self.client.get_object(Bucket=self._bucket, Key='copy.bin')
+        self.assertEqual(resp['Body'].read(), content)
+        self.assertTrue(resp['ETag'].strip('"').endswith('-16'))
+        self.assertEqual(resp['ContentType'], 'application/x-test')
+        self.assertEqual(resp['Metadata'], {'origin': 'test'})
+
+    @patch('moto.s3.models.S3_UPLOAD_PART_MIN_SIZE', 16)
+    @patch('cabinets.cabinet.s3_cabinet.MAX_PARTS', 4)
+    @patch('cabinets.cabinet.s3_cabinet.MB', 100)
+    def test_copy_multipart_stays_within_max_parts(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        content = os.urandom(1000)
+        self.client.put_object(Bucket=self._bucket, Key='large.bin', Body=content)
+
+        # 64 byte parts would need 16 parts, so parts grow to 300 bytes
+        with patch.multiple(S3Cabinet, multipart_threshold=64,
+                            multipart_chunksize=64):
+            self.assertTrue(cabinets.copy(f's3://{self._bucket}/large.bin',
+                                          f's3://{self._bucket}/copy.bin'))
+        resp = self.client.get_object(Bucket=self._bucket, Key='copy.bin')
+        self.assertEqual(resp['Body'].read(), content)
+        self.assertTrue(resp['ETag'].strip('"').endswith('-4'))
+
+    def test_copy_and_move_across_protocols(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        content = os.urandom(1000)
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, 'src.bin')
+            with open(src, 'wb') as file:
+                file.write(content)
+            cabinets.copy(src, f's3://{self._bucket}/up.bin', chunk_size=100)
+            cabinets.move(f's3://{self._bucket}/up.bin', f'file://{tmp}/down.bin')
+            with open(os.path.join(tmp, 'down.bin'), 'rb') as file:
+                self.assertEqual(file.read(), content)
+        self.assertEqual(cabinets.list(f's3://{self._bucket}'), [])
+
+    def test_delete_many(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        keys = [f'bulk/{i}.txt' for i in range(5)]
+        for key in keys:
+            self.client.put_object(Bucket=self._bucket, Key=key, Body=b'abcd')
+
+        uris = [f's3://{self._bucket}/{key}' for key in keys]
+        uris += [f's3://{self._bucket}', 's3://missing-bucket/a.txt']
+        S3Cabinet._ensure_client_exists()
+        with patch.object(S3Cabinet, 'delete_batch_size', 2), \
+                patch.object(S3Cabinet.client, 'delete_objects',
+                             wraps=S3Cabinet.client.delete_objects) as delete_objects:
+            results = cabinets.delete_many(uris)
+        self.assertEqual(delete_objects.call_count, 4)
+        self.assertEqual([r.uri for r in results], uris)
+        self.assertEqual([r.ok for r in results], [True] * 5 + [False, False])
+        self.assertEqual(cabinets.list(f's3://{self._bucket}/bulk'), [])
+
+    def test_delete_many_reports_key_errors(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        S3Cabinet._ensure_client_exists()
+        response = {'Errors': [{'Key': 'b.txt', 'Code': 'AccessDenied',
+                                'Message': 'Access Denied'}]}
+        with patch.object(S3Cabinet.client, 'delete_objects', return_value=response):
+            results = cabinets.delete_many([f's3://{self._bucket}/a.txt',
+                                            f's3://{self._bucket}/b.txt'])
+        self.assertTrue(results[0].ok)
+        self.assertIsInstance(results[1].error, CabinetError)
+        self.assertIn('AccessDenied', str(results[1].error))
+
+    def test_delete_prefix(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        keys = ['dir/a.txt', 'dir/sub/b.txt', 'dir/sub/deeper/c.txt', 'dirx/keep.txt',
+                'keep.txt']
+        for key in keys:
+            self.client.put_object(Bucket=self._bucket, Key=key, Body=b'abcd')
+
+        with patch.object(S3Cabinet, 'delete_batch_size', 2):
+            results = cabinets.delete_prefix(f's3://{self._bucket}/dir')
+        self.assertTrue(all(r.ok for r in results))
+        self.assertCountEqual([r.uri for r in results],
+                              [f'{self._bucket}/{key}' for key in keys[:3]])
+        remaining = self.client.list_objects_v2(Bucket=self._bucket)['Contents']
+        self.assertCountEqual([content['Key'] for content in remaining], keys[3:])
+
+    def test_stat_and_list_detailed(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        for key, body in [('dir/a.txt', b'abcd'), ('dir/b.txt', b''),
+                          ('dir/sub/c.txt', b'c')]:
+            self.client.put_object(Bucket=self._bucket, Key=key, Body=body)
+        head = self.client.head_object(Bucket=self._bucket, Key='dir/a.txt')
+
+        info = cabinets.stat(f's3://{self._bucket}/dir/a.txt')
+        self.assertEqual(info, FileInfo('a.txt', 4, head['LastModified'].timestamp(),
+                                        head['ETag']))
+        S3Cabinet._ensure_client_exists()
+        with patch.object(S3Cabinet.client, 'head_object') as head_object:
+            detailed = cabinets.list_detailed(f's3://{self._bucket}/dir')
+        head_object.assert_not_called()
+        self.assertCountEqual([(file.name, file.size) for file in detailed],
+                              [('a.txt', 4), ('b.txt', 0)])
+        self.assertIn(info, detailed)
+
+    def test_conditional_read(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        self.client.put_object(Bucket=self._bucket, Key='data.json', Body=b'[1, 2]')
+        uri = f's3://{self._bucket}/data.json'
+
+        data, info = cabinets.read(uri, with_info=True)
+        self.assertEqual(data, [1, 2])
+        self.assertEqual(info, cabinets.stat(uri))
+        with self.assertRaises(NotModified):
+            cabinets.read(uri, if_none_match=info.etag)
+        with self.assertRaises(NotModified):
+            cabinets.read(uri, if_modified_since=info.last_modified + 60)
+        self.assertEqual(cabinets.read(uri, if_modified_since=info.last_modified - 60),
+                         [1, 2])
+        content, ranged = cabinets.read(uri, parser=False, byte_range=(1, 2),
+                                        with_info=True)
+        self.assertEqual((content, ranged), (b'1', info))
+
+        self.client.put_object(Bucket=self._bucket, Key='data.json', Body=b'[3]')
+        self.assertEqual(cabinets.read(uri, if_none_match=info.etag), [3])
+
+    def test_conditional_read_empty_object(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        self.client.put_object(Bucket=self._bucket, Key='empty.bin', Body=b'')
+        uri = f's3://{self._bucket}/empty.bin'
+        content, info = cabinets.read(uri, parser=False, with_info=True)
+        self.assertEqual((content, info.size), (b'', 0))
+        with self.assertRaises(NotModified):
+            cabinets.read(uri, if_none_match=info.etag)
+
+    def test_walk(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        files = ['root.txt', 'lake/a.txt', 'lake/year=1/b.txt', 'lake/year=1/m=2/c',
+                 'lake/year=2/d.txt', 'lake/year=2/']
+        for file in files:
+            self.client.put_object(Bucket=self._bucket, Key=file, Body=b'abcd')
+
+        self.assertCountEqual(
+            cabinets.walk(f's3://{self._bucket}/lake', max_workers=4, page_size=1),
+            ['a.txt', 'year=1/b.txt', 'year=1/m=2/c', 'year=2/d.txt'])
+        self.assertCountEqual(cabinets.walk(f's3://{self._bucket}', max_depth=1),
+                              ['root.txt', 'lake/a.txt'])
+
+    def test_walk_keys_with_empty_segments(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        for file in ['data//x.txt', 'data/y.txt', 'data/a///z.txt']:
+            self.client.put_object(Bucket=self._bucket, Key=file, Body=b'abcd')
+
+        data = f's3://{self._bucket}/data'
+        self.assertCountEqual(cabinets.walk(data), ['/x.txt', 'y.txt', 'a///z.txt'])
+        self.assertEqual(cabinets.read(f'{data}//x.txt'), 'abcd')
+        self.assertTrue(all(r.ok for r in cabinets.delete_prefix(data)))
+        self.assertEqual(self.client.list_objects_v2(Bucket=self._bucket)['KeyCount'],
+                         0)
+
+    def test_iter_list_paginates_lazily(self):
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        files = [f'many/file{i}.txt' for i in range(7)] + ['many/sub/file.txt']
+        for file in files:
+            self.client.put_object(Bucket=self._bucket, Key=file, Body=b'abcd')
+
+        S3Cabinet._ensure_client_exists()
+        with patch.object(S3Cabinet.client, 'get_paginator',
+                          wraps=S3Cabinet.client.get_paginator) as get_paginator:
+            listing = cabinets.iter_list(f's3://{self._bucket}/many', page_size=2)
+            get_paginator.assert_not_called()
+            self.assertEqual(next(listing), 'file0.txt')
+            self.assertEqual([*listing], [f'file{i}.txt' for i in range(1, 7)])
+        self.assertEqual(cabinets.list(f's3://{self._bucket}/many', page_size=3),
+                         [f'file{i}.txt' for i in range(7)])
+
 
 @mock_s3
 @patch.dict(os.environ, {'AWS_ACCESS_KEY_ID': 'testing',
@@ -352,3 +1135,115 @@ class TestURI(unittest.TestCase):
 
 if __name__ == '__main__':
     unittest.main()
+
+
+@mock_s3
+@patch.dict(os.environ, {'AWS_ACCESS_KEY_ID': 'testing',
+                         'AWS_SECRET_ACCESS_KEY': 'testing',
+                         'AWS_SECURITY_TOKEN': 'testing',
+                         'AWS_SESSION_TOKEN': 'testing', })
+class TestS3ClientManagement(unittest.TestCase):
+
+    def setUp(self) -> None:
+        S3Cabinet.set_configuration(region_name='us-east-1')
+
+    def tearDown(self) -> None:
+        S3Cabinet.set_configuration(region_name=None, aws_access_key_id=None,
+                                    aws_secret_access_key=None,
+                                    aws_session_token=None)
+
+    def test_get_client_is_cached_per_region_and_endpoint(self):
+        default = S3Cabinet.get_client()
+        self.assertIs(default, S3Cabinet.client)
+        self.assertIs(S3Cabinet.get_client('us-east-1'), default)
+        west = S3Cabinet.get_client('us-west-2')
+        self.assertEqual(west.meta.region_name, 'us-west-2')
+        self.assertIs(S3Cabinet.get_client('us-west-2'), west)
+        local = S3Cabinet.get_client(endpoint_url='http://localhost:9000')
+        self.assertEqual(local.meta.endpoint_url, 'http://localhost:9000')
+        self.assertIsNot(local, default)
+
+    def test_set_configuration_pool_and_timeouts(self):
+        S3Cabinet.set_configuration(max_pool_connections=64, connect_timeout=2,
+                                    read_timeout=5, tcp_keepalive=False)
+        try:
+            config = S3Cabinet.client.meta.config
+            self.assertEqual(config.max_pool_connections, 64)
+            self.assertEqual(config.connect_timeout, 2)
+            self.assertEqual(config.read_timeout, 5)
+            self.assertFalse(config.tcp_keepalive)
+        finally:
+            S3Cabinet.set_configuration(max_pool_connections=50, connect_timeout=10,
+                                        read_timeout=60, tcp_keepalive=True)
+
+    def test_set_configuration_retries(self):
+        S3Cabinet.set_configuration(retry_mode='adaptive', max_attempts=8)
+        try:
+            retries = S3Cabinet.client.meta.config.retries
+            self.assertEqual(retries['mode'], 'adaptive')
+            self.assertEqual(retries['total_max_attempts'], 8)
+        finally:
+            S3Cabinet.set_configuration(retry_mode='standard', max_attempts=5)
+
+    def test_set_configuration_transfer_settings_keep_clients(self):
+        S3Cabinet.set_configuration(region_name='eu-west-1',
+                                    aws_access_key_id='key',
+                                    aws_secret_access_key='secret')
+        client = S3Cabinet.client
+        with patch.multiple(S3Cabinet, multipart_threshold=8 * 2**20,
+                            max_concurrency=10):
+            S3Cabinet.set_configuration(multipart_threshold=16 * 2**20,
+                                        max_concurrency=4)
+            self.assertEqual(S3Cabinet.multipart_threshold, 16 * 2**20)
+            self.assertEqual(S3Cabinet.max_concurrency, 4)
+        self.assertIs(S3Cabinet.client, client)
+        self.assertEqual(S3Cabinet.client.meta.region_name, 'eu-west-1')
+        credentials = S3Cabinet._session.get_credentials()
+        self.assertEqual((credentials.access_key, credentials.secret_key),
+                         ('key', 'secret'))
+
+    def test_set_configuration_keeps_previous_settings(self):
+        S3Cabinet.set_configuration(region_name='eu-west-1', aws_access_key_id='key',
+                                    aws_secret_access_key='secret',
+                                    endpoint_url='http://localhost:9000')
+        S3Cabinet.set_configuration(read_timeout=30, hedge_percentile=95)
+        try:
+            self.assertEqual(S3Cabinet.hedge_percentile, 95)
+            self.assertEqual(S3Cabinet.client.meta.region_name, 'eu-west-1')
+            self.assertEqual(S3Cabinet.client.meta.endpoint_url,
+                             'http://localhost:9000')
+            self.assertEqual(S3Cabinet.client.meta.config.read_timeout, 30)
+            S3Cabinet.set_configuration(aws_session_token='token')
+            credentials = S3Cabinet._session.get_credentials()
+            self.assertEqual((credentials.access_key, credentials.token),
+                             ('key', 'token'))
+            S3Cabinet.set_configuration(hedge_percentile=None, endpoint_url=None)
+            self.assertIsNone(S3Cabinet.hedge_percentile)
+            self.assertEqual(S3Cabinet.client.meta.endpoint_url,
+                             'https://s3.eu-west-1.amazonaws.com')
+        finally:
+            S3Cabinet.set_configuration(read_timeout=60, hedge_percentile=None,
+                                        endpoint_url=None)
+
+    def test_set_configuration_replaces_clients(self):
+        west = S3Cabinet.get_client('us-west-2')
+        S3Cabinet.set_configuration(region_name='us-west-2')
+        self.assertIsNot(S3Cabinet.get_client('us-west-2'), west)
+        self.assertEqual(S3Cabinet.client.meta.region_name, 'us-west-2')
+
+    def test_concurrent_lazy_initialization_creates_one_client(self):
+        S3Cabinet.client = None
+        S3Cabinet._clients = {}
+        barrier = threading.Barrier(8)
+
+        def ensure():
+            barrier.wait()
+            S3Cabinet._ensure_client_exists()
+            return S3Cabinet.client
+
+        with patch.object(S3Cabinet._session, 'client',
+                          wraps=S3Cabinet._session.client) as create_client:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                clients = [*executor.map(lambda _: ensure(), range(8))]
+        self.assertEqual(create_client.call_count, 1)
+        self.assertTrue(all(client is clients[0] for client in clients))
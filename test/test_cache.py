@@ -0,0 +1,136 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import cabinets
+from cabinets import Cabinet, CabinetError
+from cabinets.cabinet.file_cabinet import FileCabinet
+from cabinets.cache import LRUCache
+
+
+class CountingCabinet(Cabinet):
+    contents = {}
+    reads = 0
+
+    @classmethod
+    def set_configuration(cls, **kwargs):
+        return NotImplemented
+
+    @classmethod
+    def read_content(cls, path, **kwargs) -> bytes:
+        cls.reads += 1
+        return cls.contents[path]
+
+    @classmethod
+    def create_content(cls, path, content, **kwargs):
+        cls.contents[path] = content.encode() if isinstance(content, str) else content
+
+    @classmethod
+    def delete_content(cls, path, **kwargs):
+        del cls.contents[path]
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put('a', b'1234')
+        cache.put('b', b'1234')
+        self.assertEqual(cache.get('a'), b'1234')
+        cache.put('c', b'1234')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'1234')
+        self.assertEqual(cache.get('c'), b'1234')
+        self.assertEqual(cache.stats(), {'hits': 3, 'misses': 1, 'evictions': 1,
+                                         'expirations': 0, 'entries': 2, 'bytes': 8})
+
+    def test_does_not_cache_values_larger_than_budget(self):
+        cache = LRUCache(max_bytes=3)
+        cache.put('a', b'1234')
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['bytes'], 0)
+
+    def test_replacing_entry_updates_size(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put('a', b'12345678')
+        cache.put('a', b'12')
+        self.assertEqual(cache.stats()['bytes'], 2)
+
+    def test_ttl(self):
+        cache = LRUCache(max_bytes=10, ttl=5)
+        with patch('cabinets.cache.time.monotonic', return_value=100):
+            cache.put('a', b'1')
+        with patch('cabinets.cache.time.monotonic', return_value=104):
+            self.assertEqual(cache.get('a'), b'1')
+        with patch('cabinets.cache.time.monotonic', return_value=105):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['expirations'], 1)
+
+    def test_put_skipped_after_invalidation(self):
+        cache = LRUCache(max_bytes=10)
+        version = cache.version
+        cache.invalidate('a')
+        cache.put('a', b'stale', version=version)
+        self.assertIsNone(cache.get('a'))
+
+
+class TestCabinetCache(unittest.TestCase):
+
+    def setUp(self):
+        CountingCabinet.set_cache(max_bytes=1024)
+
+    def tearDown(self):
+        CountingCabinet.contents = {}
+        CountingCabinet.reads = 0
+        CountingCabinet.set_cache(None)
+
+    def test_read_through(self):
+        CountingCabinet.contents['a.json'] = b'{"a": 1}'
+        for _ in range(3):
+            self.assertEqual(CountingCabinet.read('a.json'), {'a': 1})
+        self.assertEqual(CountingCabinet.reads, 1)
+        self.assertEqual(CountingCabinet._cache.stats()['hits'], 2)
+
+    def test_byte_range_served_from_cache(self):
+        CountingCabinet.contents['a.txt'] = b'0123456789'
+        CountingCabinet.read('a.txt')
+        self.assertEqual(CountingCabinet.read('a.txt', byte_range=(2, 4)), '23')
+        self.assertEqual(CountingCabinet.reads, 1)
+
+    def test_create_and_delete_invalidate(self):
+        CountingCabinet.create('a.json', {'a': 1})
+        self.assertEqual(CountingCabinet.read('a.json'), {'a': 1})
+        CountingCabinet.create('a.json', {'a': 2})
+        self.assertEqual(CountingCabinet.read('a.json'), {'a': 2})
+        CountingCabinet.delete('a.json')
+        with self.assertRaises(KeyError):
+            CountingCabinet.read('a.json')
+        self.assertEqual(CountingCabinet.reads, 3)
+
+
+class TestTopLevelCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(cabinets.set_cache, 'file', None)
+
+    def test_set_cache_normalizes_paths(self):
+        cache = cabinets.set_cache('file', max_bytes=1024)
+        filename = os.path.join(self.tmp.name, 'a.json')
+        cabinets.create(filename, {'a': 1})
+        with patch.object(FileCabinet, 'read_content',
+                          wraps=FileCabinet.read_content) as read_content:
+            cabinets.read(filename)
+            cabinets.read(f'file://{self.tmp.name}/./a.json')
+            cabinets.read(os.path.join(self.tmp.name, 'sub', '..', 'a.json'))
+        self.assertEqual(read_content.call_count, 1)
+        self.assertEqual(cache.stats()['hits'], 2)
+
+        cabinets.create(f'file://{self.tmp.name}//a.json', {'a': 2})
+        self.assertEqual(cabinets.read(filename), {'a': 2})
+
+    def test_set_cache_bad_protocol(self):
+        with self.assertRaises(CabinetError):
+            cabinets.set_cache('s4', max_bytes=1024)
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import boto3
+from moto import mock_s3
+
+import cabinets
+from cabinets.cabinet.s3_cabinet import S3Cabinet
+from cabinets.disk_cache import DiskCache
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_put_get(self):
+        cache = DiskCache(self.tmp.name, max_bytes=1024)
+        self.assertIsNone(cache.get('bucket/a'))
+        cache.put('bucket/a', '"etag"', b'content')
+        self.assertEqual(cache.get('bucket/a'), ('"etag"', b'content'))
+
+    def test_survives_new_instance(self):
+        DiskCache(self.tmp.name, max_bytes=1024).put('bucket/a', '"etag"', b'data')
+        self.assertEqual(DiskCache(self.tmp.name, max_bytes=1024).get('bucket/a'),
+                         ('"etag"', b'data'))
+
+    def test_evicts_least_recently_used(self):
+        # entries are a little larger than their content because of the header
+        cache = DiskCache(self.tmp.name, max_bytes=350)
+        for i, key in enumerate(['a', 'b']):
+            cache.put(key, 'etag', b'x' * 100)
+            os.utime(cache._path(key), (i, i))
+        cache.put('c', 'etag', b'x' * 100)
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+
+    def test_ignores_truncated_entry(self):
+        cache = DiskCache(self.tmp.name, max_bytes=1024)
+        cache.put('a', 'etag', b'content')
+        with open(cache._path('a'), 'r+b') as file:
+            file.truncate(os.path.getsize(cache._path('a')) - 1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_invalidate(self):
+        cache = DiskCache(self.tmp.name, max_bytes=1024)
+        cache.put('a', 'etag', b'content')
+        cache.invalidate('a')
+        cache.invalidate('a')
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual([name for name in os.listdir(self.tmp.name)
+                          if not name.startswith('.')], [])
+
+
+@mock_s3
+@patch.dict(os.environ, {'AWS_ACCESS_KEY_ID': 'testing',
+                         'AWS_SECRET_ACCESS_KEY': 'testing',
+                         'AWS_SECURITY_TOKEN': 'testing',
+                         'AWS_SESSION_TOKEN': 'testing', })
+class TestS3DiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self._bucket = 'mock-bucket'
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        S3Cabinet.set_configuration(cache_dir=self.tmp.name, cache_max_bytes=1024)
+        self.addCleanup(setattr, S3Cabinet, '_disk_cache', None)
+
+    def test_revalidates_with_etag(self):
+        uri = f's3://{self._bucket}/data.json'
+        self.client.put_object(Bucket=self._bucket, Key='data.json', Body=b'[1]')
+        self.assertEqual(cabinets.read(uri), [1])
+        with patch.object(S3Cabinet.client, 'get_object',
+                          wraps=S3Cabinet.client.get_object) as get_object:
+            self.assertEqual(cabinets.read(uri), [1])
+        self.assertIn('IfNoneMatch', get_object.call_args[1])
+
+        # changed by someone else
+        self.client.put_object(Bucket=self._bucket, Key='data.json', Body=b'[2]')
+        self.assertEqual(cabinets.read(uri), [2])
+        self.assertEqual(S3Cabinet._disk_cache.get(f'{self._bucket}/data.json')[1],
+                         b'[2]')
+
+    def test_create_and_delete_invalidate(self):
+        uri = f's3://{self._bucket}/data.json'
+        cabinets.create(uri, [1])
+        cabinets.read(uri)
+        self.assertIsNotNone(S3Cabinet._disk_cache.get(f'{self._bucket}/data.json'))
+        cabinets.delete(uri)
+        self.assertIsNone(S3Cabinet._disk_cache.get(f'{self._bucket}/data.json'))
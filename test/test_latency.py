@@ -0,0 +1,176 @@
+import io
+import os
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import boto3
+from moto import mock_s3
+
+import cabinets
+from cabinets import metrics
+from cabinets.cabinet.s3_cabinet import S3Cabinet
+from cabinets.latency import LatencyTracker, hedged_call
+from cabinets.limiter import reset_limiters
+
+
+class TestLatencyTracker(unittest.TestCase):
+
+    def test_percentile_needs_min_samples(self):
+        tracker = LatencyTracker(min_samples=3)
+        tracker.record(1.0)
+        tracker.record(2.0)
+        self.assertIsNone(tracker.percentile(50))
+        tracker.record(3.0)
+        self.assertEqual(tracker.percentile(50), 2.0)
+
+    def test_percentile_of_recent_window(self):
+        tracker = LatencyTracker(window=100, min_samples=1)
+        for latency in range(1, 201):
+            tracker.record(float(latency))
+        self.assertEqual(tracker.percentile(0), 101.0)
+        self.assertEqual(tracker.percentile(95), 195.0)
+        self.assertEqual(tracker.percentile(100), 200.0)
+
+
+class TestHedgedCall(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(self.executor.shutdown)
+        metrics.reset_metrics()
+
+    def _calls(self, *behaviours):
+        """
+        Function taking the delay of its next behaviour to respond, then returning
+        or raising its result after the delay of its body
+        """
+        behaviours = iter(behaviours)
+        lock = threading.Lock()
+
+        def fn(attempt):
+            with lock:
+                delay, result, body_delay = (*next(behaviours), 0)[:3]
+            attempt.send()
+            time.sleep(delay)
+            attempt.respond()
+            time.sleep(body_delay)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return fn
+
+    def test_fast_call_is_not_hedged(self):
+        fn = self._calls((0, 'first'), (0, 'second'))
+        self.assertEqual(hedged_call(fn, 1, self.executor), 'first')
+        self.assertNotIn('hedge.sent', metrics.get_metrics())
+
+    def test_slow_call_is_hedged(self):
+        fn = self._calls((1, 'first'), (0, 'second'))
+        self.assertEqual(hedged_call(fn, 0.05, self.executor), 'second')
+        self.assertEqual(metrics.get_metrics()['hedge.sent'], 1)
+        self.assertEqual(metrics.get_metrics()['hedge.won'], 1)
+
+    def test_slow_body_is_not_hedged(self):
+        fn = self._calls((0, 'first', 0.2), (0, 'second'))
+        self.assertEqual(hedged_call(fn, 0.05, self.executor), 'first')
+        self.assertNotIn('hedge.sent', metrics.get_metrics())
+
+    def test_queued_call_is_not_hedged(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        executor.submit(time.sleep, 0.2)
+        fn = self._calls((0.01, 'first'), (0, 'second'))
+        self.assertEqual(hedged_call(fn, 0.05, executor), 'first')
+
+        def waits_before_sending(attempt):
+            time.sleep(0.2)
+            attempt.send()
+            attempt.respond()
+            return 'sent late'
+
+        self.assertEqual(hedged_call(waits_before_sending, 0.05, self.executor),
+                         'sent late')
+        self.assertNotIn('hedge.sent', metrics.get_metrics())
+
+    def test_failed_call_waits_for_the_other(self):
+        fn = self._calls((0.1, ValueError('first')), (0.2, 'second'))
+        self.assertEqual(hedged_call(fn, 0.05, self.executor), 'second')
+
+    def test_both_calls_fail(self):
+        fn = self._calls((0.1, ValueError('first')), (0, KeyError('second')))
+        with self.assertRaises(KeyError):
+            hedged_call(fn, 0.05, self.executor)
+
+    def test_call_failing_before_sending(self):
+        def fn(attempt):
+            raise ValueError('not sent')
+
+        with self.assertRaises(ValueError):
+            hedged_call(fn, 0.05, self.executor)
+
+
+@mock_s3
+@patch.dict(os.environ, {'AWS_ACCESS_KEY_ID': 'testing',
+                         'AWS_SECRET_ACCESS_KEY': 'testing',
+                         'AWS_SECURITY_TOKEN': 'testing',
+                         'AWS_SESSION_TOKEN': 'testing', })
+class TestS3Hedging(unittest.TestCase):
+
+    def setUp(self):
+        reset_limiters()
+        self.addCleanup(reset_limiters)
+        self._bucket = 'mock-bucket'
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        self.client.put_object(Bucket=self._bucket, Key='a.txt', Body=b'abcd')
+        S3Cabinet._ensure_client_exists()
+        tracker = LatencyTracker(min_samples=1)
+        tracker.record(0.5)
+        patcher = patch.multiple(S3Cabinet, hedge_percentile=99, _latency=tracker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        metrics.reset_metrics()
+
+    def test_slow_get_is_hedged(self):
+        get_object = S3Cabinet.client.get_object
+        slow, release = threading.Event(), threading.Event()
+
+        def first_slow(**params):
+            if not slow.is_set():
+                slow.set()
+                release.wait(5)
+                raise RuntimeError('too late')
+            return get_object(**params)
+
+        with patch.object(S3Cabinet.client, 'get_object',
+                          side_effect=first_slow) as mock:
+            self.assertEqual(cabinets.read(f's3://{self._bucket}/a.txt'), 'abcd')
+        release.set()
+        self.assertEqual(mock.call_count, 2)
+        self.assertEqual(metrics.get_metrics()['hedge.won'], 1)
+
+    def test_fast_get_is_not_hedged(self):
+        with patch.object(S3Cabinet.client, 'get_object',
+                          wraps=S3Cabinet.client.get_object) as mock:
+            self.assertEqual(cabinets.read(f's3://{self._bucket}/a.txt'), 'abcd')
+        mock.assert_called_once()
+        self.assertNotIn('hedge.sent', metrics.get_metrics())
+
+    def test_concurrent_gets_are_not_hedged_while_queued(self):
+        # uniform 50 ms responses, more readers than threads or limiter slots
+        def get_object(**params):
+            time.sleep(0.05)
+            return {'Body': io.BytesIO(b'abcd')}
+
+        with patch.object(S3Cabinet.client, 'get_object', side_effect=get_object), \
+                patch.object(S3Cabinet._latency, 'percentile', return_value=0.2), \
+                patch.object(S3Cabinet, 'max_pool_connections', 8):
+            with ThreadPoolExecutor(max_workers=64) as executor:
+                futures = [executor.submit(S3Cabinet._get_object,
+                                           Bucket=self._bucket, Key='a.txt')
+                           for _ in range(64)]
+            self.assertTrue(all(f.result()[1] == b'abcd' for f in futures))
+        self.assertNotIn('hedge.sent', metrics.get_metrics())
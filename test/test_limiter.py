@@ -0,0 +1,211 @@
+import itertools
+import os
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import boto3
+from botocore.awsrequest import AWSResponse
+from moto import mock_s3
+
+import cabinets
+from cabinets.cabinet.s3_cabinet import S3Cabinet
+from cabinets.limiter import (AdaptiveLimiter, get_limiter, get_limiter_stats,
+                              reset_limiters)
+
+
+class Throttled(Exception):
+    pass
+
+
+class TestAdaptiveLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.limiter = AdaptiveLimiter(initial=4, minimum=1, maximum=6,
+                                       is_throttle=lambda ex: isinstance(ex, Throttled))
+
+    def _throttle(self):
+        with self.assertRaises(Throttled):
+            with self.limiter.slot():
+                raise Throttled()
+
+    def test_limit_grows_additively_up_to_maximum(self):
+        # every request takes one tick of a fake clock, so latency is stable
+        with patch('time.monotonic', side_effect=itertools.count()):
+            for _ in range(4):
+                self.limiter.call(lambda: None)
+            self.assertEqual(self.limiter.limit, 4)
+            for _ in range(100):
+                self.limiter.call(lambda: None)
+        self.assertEqual(self.limiter.limit, 6)
+        self.assertEqual(self.limiter.stats().requests, 104)
+
+    def test_throttle_halves_limit(self):
+        self._throttle()
+        self.assertEqual(self.limiter.limit, 2)
+        self._throttle()
+        self._throttle()
+        self.assertEqual(self.limiter.stats(), (1, 0, 3, 0))
+
+    def test_other_errors_leave_limit(self):
+        with self.assertRaises(ValueError):
+            self.limiter.call(int, 'x')
+        self.assertEqual(self.limiter.stats(), (4, 0, 0, 0))
+
+    def test_requests_sent_before_a_decrease_do_not_decrease_again(self):
+        release = threading.Event()
+
+        def throttled():
+            release.wait(5)
+            raise Throttled()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(self.limiter.call, throttled)
+                       for _ in range(4)]
+            time.sleep(0.1)
+            release.set()
+        self.assertTrue(all(isinstance(f.exception(), Throttled) for f in futures))
+        self.assertEqual(self.limiter.limit, 2)
+        self.assertEqual(self.limiter.stats().throttles, 4)
+
+    def test_rising_latency_decreases_limit(self):
+        self.limiter.warmup = 0
+        with patch('time.monotonic', side_effect=[0.0, 1.0] * 5 + [10.0, 20.0, 30.0]):
+            for _ in range(6):
+                self.limiter.call(lambda: None)
+        self.assertEqual(self.limiter.limit, 2)
+
+    def test_large_transfers_after_small_requests_keep_limit(self):
+        limiter = AdaptiveLimiter(initial=20, maximum=64)
+        clock = [0.0]
+        with patch('time.monotonic', lambda: clock[0]):
+            # small requests, 10 ms each
+            for _ in range(200):
+                with limiter.slot():
+                    clock[0] += 0.01
+            limit = limiter.limit
+            # large downloads: 10 ms to first byte, 150 ms in total
+            for _ in range(30):
+                with limiter.slot() as slot:
+                    clock[0] += 0.01
+                    slot.respond()
+                    clock[0] += 0.14
+            # large uploads, 150 ms in total
+            for _ in range(30):
+                with limiter.slot(measure=False):
+                    clock[0] += 0.15
+            self.assertGreater(limiter.limit, limit)
+            # while slow responses still decrease it
+            for _ in range(5):
+                with limiter.slot():
+                    clock[0] += 0.15
+        self.assertLess(limiter.limit, limit)
+
+    def test_concurrency_stays_within_limit(self):
+        self.limiter = AdaptiveLimiter(initial=3, maximum=3)
+        lock = threading.Lock()
+        running, peak = [0], [0]
+
+        def request():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            for _ in range(30):
+                executor.submit(self.limiter.call, request)
+        self.assertEqual(peak[0], 3)
+
+    def test_iterate(self):
+        self.assertEqual([*self.limiter.iterate(iter('abc'))], ['a', 'b', 'c'])
+        self.assertEqual(self.limiter.stats().requests, 4)
+
+
+class TestLimiterRegistry(unittest.TestCase):
+
+    def setUp(self):
+        reset_limiters()
+        self.addCleanup(reset_limiters)
+
+    def test_limiters_are_shared_by_key(self):
+        limiter = get_limiter('memory://a', initial=2)
+        self.assertIs(get_limiter('memory://a', initial=5), limiter)
+        self.assertIsNot(get_limiter('memory://b'), limiter)
+        self.assertEqual(get_limiter_stats()['memory://a'].limit, 2)
+
+
+@mock_s3
+@patch.dict(os.environ, {'AWS_ACCESS_KEY_ID': 'testing',
+                         'AWS_SECRET_ACCESS_KEY': 'testing',
+                         'AWS_SECURITY_TOKEN': 'testing',
+                         'AWS_SESSION_TOKEN': 'testing', })
+class TestS3Limiter(unittest.TestCase):
+
+    def setUp(self):
+        reset_limiters()
+        self.addCleanup(reset_limiters)
+        self._bucket = 'mock-bucket'
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        S3Cabinet._ensure_client_exists()
+
+    def test_requests_are_limited_per_bucket(self):
+        cabinets.create(f's3://{self._bucket}/a.txt', 'abcd')
+        self.assertEqual(cabinets.read(f's3://{self._bucket}/a.txt'), 'abcd')
+        self.assertEqual(cabinets.list(f's3://{self._bucket}'), ['a.txt'])
+        stats = get_limiter_stats()[f's3://{self._bucket}']
+        self.assertEqual(stats.limit, S3Cabinet.max_concurrency)
+        self.assertEqual(stats.in_flight, 0)
+        self.assertGreaterEqual(stats.requests, 3)
+
+    def _slow_down(self, times):
+        """Answer the next `times` requests with 503 SlowDown, below botocore"""
+        remaining = [times]
+
+        def before_send(request, **kwargs):
+            if remaining[0] > 0:
+                remaining[0] -= 1
+                return AWSResponse(request.url, 503, {}, _Raw(
+                    b'<Error><Code>SlowDown</Code><Message>Reduce your request '
+                    b'rate.</Message></Error>'))
+            return None
+
+        events = S3Cabinet.client.meta.events
+        events.register_first('before-send.s3', before_send)
+        self.addCleanup(events.unregister, 'before-send.s3', before_send)
+        # retries are not delayed
+        patcher = patch('botocore.retries.standard.ExponentialBackoff.delay_amount',
+                        return_value=0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_retried_slow_down_decreases_limit(self):
+        self._slow_down(3)
+        self.assertTrue(cabinets.create(f's3://{self._bucket}/a.txt', 'abcd'))
+        stats = get_limiter_stats()[f's3://{self._bucket}']
+        self.assertEqual(stats.throttles, 3)
+        # each retry was sent after the previous decrease, so decreased it again
+        # (10 to 1.25), before the successful attempt grew it back a little
+        self.assertEqual(stats.limit, 2)
+
+    def test_failed_slow_down_counts_each_attempt_once(self):
+        self._slow_down(S3Cabinet.max_attempts)
+        self.assertFalse(cabinets.create(f's3://{self._bucket}/a.txt', 'abcd'))
+        stats = get_limiter_stats()[f's3://{self._bucket}']
+        self.assertEqual(stats.throttles, S3Cabinet.max_attempts)
+        self.assertEqual(stats.limit, 1)
+
+
+class _Raw:
+    """Raw HTTP response body of a fixed content"""
+
+    def __init__(self, content):
+        self._content = content
+
+    def stream(self, **kwargs):
+        yield self._content
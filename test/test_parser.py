@@ -1,11 +1,14 @@
 import os
 import json
 from typing import Any
+from unittest import TestCase
+from unittest.mock import patch
 
 from pyfakefs import fake_filesystem_unittest
 
 import cabinets
 from cabinets import Parser
+from cabinets.parser.json_parser import JSONParser
 
 
 class MockTextParser(Parser):
@@ -112,3 +115,48 @@ class TestParserArgument(fake_filesystem_unittest.TestCase):
             cabinets.create('file://tmp/sample.txt', "foo", parser=1)
         with self.assertRaises(cabinets.CabinetError):
             cabinets.create('file://tmp/sample.txt', "foo", parser=None)
+
+
+class TestMemoization(TestCase):
+
+    def setUp(self):
+        self.memo = cabinets.set_memoization(max_bytes=1024)
+
+    def tearDown(self):
+        cabinets.set_memoization(None)
+
+    def test_identical_content_parsed_once(self):
+        with patch.object(JSONParser, 'load_content',
+                          wraps=JSONParser.load_content) as load_content:
+            first = Parser.load('a.json', b'{"a": [1, 2]}')
+            second = Parser.load('b.json', b'{"a": [1, 2]}')
+            third = Parser.load('c.json', bytearray(b'{"a": [1, 2]}'))
+        self.assertEqual(load_content.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(first, third)
+        self.assertEqual(self.memo.stats()['hits'], 2)
+
+    def test_copy_on_return(self):
+        first = Parser.load('a.json', b'{"a": [1, 2]}')
+        first['a'].append(3)
+        self.assertEqual(Parser.load('a.json', b'{"a": [1, 2]}'), {'a': [1, 2]})
+
+    def test_shared_result_without_copy(self):
+        cabinets.set_memoization(max_bytes=1024, copy=False)
+        first = Parser.load('a.json', b'{"a": [1, 2]}')
+        self.assertIs(Parser.load('b.json', b'{"a": [1, 2]}'), first)
+
+    def test_keyed_by_parser_and_kwargs(self):
+        content = 'caf\xe9'.encode('iso-8859-1')
+        self.assertEqual(Parser.load('a.txt', content, encoding='iso-8859-1'),
+                         'caf\xe9')
+        self.assertEqual(Parser.load('a.txt', content, encoding='cp1252'),
+                         'caf\xe9')
+        self.assertEqual(MockTextParser._load_content(b'x'), {'mock-parser': 'x'})
+        self.assertEqual(self.memo.stats()['entries'], 3)
+
+    def test_memoizes_none(self):
+        with patch('yaml.safe_load', return_value=None) as safe_load:
+            Parser.load('a.yml', b'')
+            Parser.load('a.yml', b'')
+        self.assertEqual(safe_load.call_count, 1)
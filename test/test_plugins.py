@@ -1,5 +1,12 @@
+import importlib
+import json
 import os
-from unittest import TestCase
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase, skipIf
+from unittest.mock import patch
 
 import cabinets
 from cabinets import (register_protocols,
@@ -8,6 +15,7 @@ from cabinets import (register_protocols,
                       Cabinet,
                       Parser)
 from cabinets.parser import ParserError
+from cabinets.registry import LazyRegistry
 
 
 class MockCabinet(Cabinet):
@@ -165,3 +173,130 @@ class TestRegisterExtensions(TestCase):
         with self.assertRaises(ParserError) as err:
             register_extensions('mock')(42)
         self.assertIn('must be a class', str(err.exception))
+
+
+class TestPluginIndex(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index_dir = os.path.join(self.tmp.name, 'index')
+        self.plugin_path = os.path.join(self.tmp.name, 'plugins')
+        shutil.copytree(os.path.join(os.path.dirname(__file__), 'fixtures', 'plugins'),
+                        self.plugin_path)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _discover(self):
+        with patch.object(cabinets.plugins, 'discover',
+                          wraps=cabinets.plugins.discover) as discover:
+            registries = cabinets.plugins.discover_all(self.plugin_path,
+                                                       index_dir=self.index_dir)
+        return registries, discover.called
+
+    def test_first_discovery_writes_index(self):
+        (PROTOCOLS, EXTENSIONS), scanned = self._discover()
+        self.assertTrue(scanned)
+        self.assertTrue(PROTOCOLS.is_loaded('mock'))
+        path = cabinets.plugins.index_file(self.index_dir, self.plugin_path)
+        with open(path) as file:
+            index = json.load(file)
+        self.assertEqual(index['protocols'], {'mock': ['mock_cabinet', 'MockCabinet']})
+        self.assertEqual(index['extensions'], {'mock': ['mock_parser', 'MockParser']})
+
+    def test_index_skips_scan_and_loads_lazily(self):
+        self._discover()
+        (PROTOCOLS, EXTENSIONS), scanned = self._discover()
+        self.assertFalse(scanned)
+        self.assertFalse(PROTOCOLS.is_loaded('mock'))
+        self.assertFalse(EXTENSIONS.is_loaded('mock'))
+        self.assertEqual(PROTOCOLS['mock'].__name__, 'MockCabinet')
+        self.assertEqual(EXTENSIONS['mock'].__name__, 'MockParser')
+        self.assertIn('s3', PROTOCOLS)
+        self.assertIn('json', EXTENSIONS)
+
+    def test_modified_plugin_invalidates_index(self):
+        self._discover()
+        path = os.path.join(self.plugin_path, 'parser', 'mock_parser.py')
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        _, scanned = self._discover()
+        self.assertTrue(scanned)
+        _, scanned = self._discover()
+        self.assertFalse(scanned)
+
+    def test_added_plugin_invalidates_index(self):
+        self._discover()
+        with open(os.path.join(self.plugin_path, 'parser', 'empty.py'), 'w'):
+            pass
+        _, scanned = self._discover()
+        self.assertTrue(scanned)
+
+    def test_corrupt_index_is_rebuilt(self):
+        os.makedirs(self.index_dir)
+        path = cabinets.plugins.index_file(self.index_dir, self.plugin_path)
+        with open(path, 'w') as file:
+            file.write('{not json')
+        (PROTOCOLS, _), scanned = self._discover()
+        self.assertTrue(scanned)
+        self.assertIn('mock', PROTOCOLS)
+        self.assertIsNotNone(cabinets.plugins.read_index(
+            path, cabinets.plugins.plugin_files(self.plugin_path)))
+
+    def test_no_index_without_plugins(self):
+        cabinets.plugins.discover_all(os.path.join(self.tmp.name, 'missing'),
+                                      index_dir=self.index_dir)
+        self.assertFalse(os.path.exists(self.index_dir))
+
+
+class TestLazyImports(TestCase):
+    # cumulative time budget for `import cabinets` in microseconds, well below the
+    # cost of importing `boto3` alone
+    import_time_budget = 200_000
+
+    def _run_fresh(self, code):
+        return subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                              universal_newlines=True, check=True,
+                              cwd=os.path.dirname(__file__),
+                              env=dict(os.environ, PLUGIN_INDEX_DIR=''))
+
+    def test_import_does_not_load_optional_dependencies(self):
+        result = self._run_fresh(
+            'import sys, cabinets; print(" ".join(sorted(sys.modules)))')
+        modules = result.stdout.split()
+        for name in ('boto3', 'botocore', 'yaml', 'colorama', 'asyncio',
+                     'cabinets.cabinet.s3_cabinet', 'cabinets.parser.yaml_parser'):
+            self.assertNotIn(name, modules)
+
+    @skipIf(sys.version_info < (3, 7), '-X importtime requires Python 3.7')
+    def test_import_time_budget(self):
+        result = self._run_fresh('import cabinets')
+        cumulative = [int(line.split('|')[1]) for line in result.stderr.splitlines()
+                      if line.split('|')[-1].strip() == 'cabinets']
+        self.assertLess(cumulative[0], self.import_time_budget)
+
+    def test_first_use_imports_protocol(self):
+        result = self._run_fresh(
+            'import sys, cabinets; cabinets.from_uri("s3://bucket/key"); '
+            'print("boto3" in sys.modules)')
+        self.assertEqual(result.stdout.strip(), 'True')
+
+    def test_built_in_tables_match_registrations(self):
+        for table, attribute in ((cabinets.plugins.BUILT_IN_PROTOCOLS, '_protocols'),
+                                 (cabinets.plugins.BUILT_IN_EXTENSIONS,
+                                  '_extensions')):
+            for key, (module, name) in table.items():
+                cls = getattr(importlib.import_module(module), name)
+                self.assertIn(key, getattr(cls, attribute))
+
+    def test_lazy_registry_update_keeps_entries_lazy(self):
+        source = LazyRegistry()
+        source.register_lazy('lazy', 'not.a.real.module', 'Foo')
+        registry = LazyRegistry()
+        registry.update(source)
+        self.assertIn('lazy', registry)
+        self.assertFalse(registry.is_loaded('lazy'))
+        self.assertEqual(registry.describe('lazy'), 'not.a.real.module.Foo')
+        with self.assertRaises(ImportError):
+            registry['lazy']
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import cabinets
+from cabinets import Cabinet, metrics
+from cabinets.singleflight import SingleFlight
+
+
+class SlowCabinet(Cabinet):
+    contents = {}
+    reads = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def set_configuration(cls, **kwargs):
+        return NotImplemented
+
+    @classmethod
+    def read_content(cls, path, **kwargs) -> bytes:
+        with cls._lock:
+            cls.reads += 1
+        time.sleep(0.2)
+        return cls.contents[path]
+
+    @classmethod
+    def create_content(cls, path, content, **kwargs):
+        cls.contents[path] = content.encode() if isinstance(content, str) else content
+
+    @classmethod
+    def delete_content(cls, path, **kwargs):
+        del cls.contents[path]
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_calls_share_result(self):
+        flight = SingleFlight()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'result'
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = [*executor.map(lambda _: flight.do('key', fn), range(5))]
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in results),
+                         [False, True, True, True, True])
+        self.assertEqual({result for result, _ in results}, {'result'})
+        # completed calls are not remembered
+        self.assertEqual(flight.do('key', lambda: 'again'), ('again', False))
+
+    def test_exception_is_shared(self):
+        flight = SingleFlight()
+
+        def fn():
+            time.sleep(0.2)
+            raise ValueError('boom')
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(flight.do, 'key', fn) for _ in range(3)]
+        for future in futures:
+            self.assertIsInstance(future.exception(), ValueError)
+
+
+class TestCabinetCoalescing(unittest.TestCase):
+
+    def setUp(self):
+        SlowCabinet.contents = {'a.json': b'{"a": [1]}', 'b.json': b'{"b": 2}'}
+        SlowCabinet.reads = 0
+        SlowCabinet.set_coalescing()
+        self.addCleanup(SlowCabinet.set_coalescing, False)
+        metrics.reset_metrics()
+
+    def _read_concurrently(self, paths, **kwargs):
+        with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+            return [*executor.map(lambda p: SlowCabinet.read(p, **kwargs), paths)]
+
+    def test_concurrent_reads_are_coalesced(self):
+        results = self._read_concurrently(['a.json'] * 4 + ['b.json'] * 2)
+        self.assertEqual(SlowCabinet.reads, 2)
+        self.assertEqual(results, [{'a': [1]}] * 4 + [{'b': 2}] * 2)
+        self.assertEqual(metrics.get_metrics()['single_flight.coalesced'], 4)
+        # each caller parses its own object
+        self.assertIsNot(results[0], results[1])
+
+    def test_different_ranges_are_not_coalesced(self):
+        SlowCabinet._native_byte_range = False
+        self.addCleanup(delattr, SlowCabinet, '_native_byte_range')
+        results = self._read_concurrently(['a.json'] * 2, parser=False,
+                                          byte_range=(0, 4))
+        results += self._read_concurrently(['a.json'], parser=False)
+        self.assertEqual(results, [b'{"a"', b'{"a"', b'{"a": [1]}'])
+        self.assertEqual(SlowCabinet.reads, 2)
+
+    def test_coalesced_parse_returns_copies(self):
+        SlowCabinet.set_coalescing(parse=True)
+        results = self._read_concurrently(['a.json'] * 3)
+        self.assertEqual(SlowCabinet.reads, 1)
+        self.assertEqual(results, [{'a': [1]}] * 3)
+        self.assertEqual(len({id(result['a']) for result in results}), 3)
+
+    def test_sequential_reads_are_not_coalesced(self):
+        SlowCabinet.read('a.json')
+        SlowCabinet.read('a.json')
+        self.assertEqual(SlowCabinet.reads, 2)
+
+    def test_async_reads_are_coalesced(self):
+        async def read_all():
+            return await asyncio.gather(
+                *[SlowCabinet.read_async('a.json') for _ in range(3)])
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(read_all())
+        finally:
+            loop.close()
+        self.assertEqual(results, [{'a': [1]}] * 3)
+        self.assertEqual(SlowCabinet.reads, 1)
+
+    def test_top_level_set_coalescing(self):
+        SlowCabinet.set_coalescing(False)
+        SlowCabinet._protocols = {'slow'}
+        self.addCleanup(setattr, SlowCabinet, '_protocols', set())
+        cabinets.SUPPORTED_PROTOCOLS['slow'] = SlowCabinet
+        self.addCleanup(cabinets.SUPPORTED_PROTOCOLS.pop, 'slow')
+        cabinets.set_coalescing('slow', parse=True)
+        self.assertIsNotNone(SlowCabinet._single_flight)
+        self.assertTrue(SlowCabinet._coalesce_parse)
+        with self.assertRaises(cabinets.CabinetError):
+            cabinets.set_coalescing('missing')
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import boto3
+from moto import mock_s3
+
+import cabinets
+from cabinets import FileInfo
+from cabinets.syncing import is_modified
+
+
+class TestIsModified(unittest.TestCase):
+
+    def test_size_differs(self):
+        self.assertTrue(is_modified(FileInfo('a', 1, 10.0, '"x"'),
+                                    FileInfo('a', 2, 20.0, '"x"')))
+
+    def test_same_etag(self):
+        self.assertFalse(is_modified(FileInfo('a', 1, 30.0, '"x"'),
+                                     FileInfo('a', 1, 20.0, '"x"')))
+
+    def test_falls_back_to_modification_time(self):
+        self.assertTrue(is_modified(FileInfo('a', 1, 30.0, '"x"'),
+                                    FileInfo('a', 1, 20.0, '"y"')))
+        self.assertFalse(is_modified(FileInfo('a', 1, 10.0),
+                                     FileInfo('a', 1, 20.0, '"y"')))
+
+    def test_unknown_modification_time(self):
+        self.assertTrue(is_modified(FileInfo('a', 1), FileInfo('a', 1, 20.0)))
+
+    def test_module_does_not_shadow_sync(self):
+        import cabinets.syncing
+        self.assertTrue(callable(cabinets.sync))
+        self.assertIs(cabinets.syncing.is_modified, is_modified)
+
+
+class TestFileSync(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.src = os.path.join(self.tmp.name, 'src')
+        self.dst = os.path.join(self.tmp.name, 'dst')
+        for name in ['a.txt', os.path.join('sub', 'b.txt')]:
+            cabinets.create(os.path.join(self.src, name), name.encode(), parser=False)
+
+    def test_sync_copies_new_and_changed_files(self):
+        result = cabinets.sync(self.src, self.dst, max_workers=2)
+        self.assertTrue(result.ok)
+        self.assertEqual(len(result.copied), 2)
+        self.assertEqual(result.unchanged, 0)
+        self.assertCountEqual(cabinets.walk(self.dst), ['a.txt', 'sub/b.txt'])
+
+        result = cabinets.sync(self.src, self.dst)
+        self.assertEqual((result.copied, result.unchanged), ([], 2))
+
+        cabinets.create(os.path.join(self.src, 'a.txt'), b'changed', parser=False)
+        result = cabinets.sync(self.src, self.dst)
+        self.assertEqual([r.uri for r in result.copied], [f'{self.dst}/a.txt'])
+        self.assertEqual(cabinets.read(os.path.join(self.dst, 'a.txt')), 'changed')
+
+    def test_sync_delete(self):
+        cabinets.create(os.path.join(self.dst, 'stale.txt'), b'', parser=False)
+        result = cabinets.sync(self.src, self.dst)
+        self.assertEqual(result.deleted, [])
+        self.assertIn('stale.txt', cabinets.list(self.dst))
+
+        result = cabinets.sync(self.src, self.dst, delete=True)
+        self.assertEqual([r.uri for r in result.deleted], [f'{self.dst}/stale.txt'])
+        self.assertNotIn('stale.txt', cabinets.list(self.dst))
+
+
+@mock_s3
+@patch.dict(os.environ, {'AWS_ACCESS_KEY_ID': 'testing',
+                         'AWS_SECRET_ACCESS_KEY': 'testing',
+                         'AWS_SECURITY_TOKEN': 'testing',
+                         'AWS_SESSION_TOKEN': 'testing', })
+class TestS3Sync(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self._bucket = 'mock-bucket'
+        self.client = boto3.client('s3')
+        self.client.create_bucket(Bucket=self._bucket)
+        self.local = os.path.join(self.tmp.name, 'local')
+        for name in ['a.txt', os.path.join('sub', 'b.txt')]:
+            cabinets.create(os.path.join(self.local, name), name.encode(),
+                            parser=False)
+        # S3 modification times have a resolution of one second
+        past = time.time() - 10
+        for root, _, files in os.walk(self.local):
+            for name in files:
+                os.utime(os.path.join(root, name), (past, past))
+
+    def test_sync_file_to_s3_to_s3_to_file(self):
+        remote = f's3://{self._bucket}/remote'
+        backup = f's3://{self._bucket}/backup'
+        restored = os.path.join(self.tmp.name, 'restored')
+        for src, dst in [(self.local, remote), (remote, backup), (backup, restored)]:
+            result = cabinets.sync(src, dst)
+            self.assertTrue(result.ok)
+            self.assertEqual(len(result.copied), 2)
+            self.assertEqual(cabinets.sync(src, dst).unchanged, 2)
+        self.assertEqual(cabinets.read(os.path.join(restored, 'sub', 'b.txt')),
+                         os.path.join('sub', 'b.txt'))
+
+    def test_sync_to_s3_copies_changed_and_deletes_stale(self):
+        remote = f's3://{self._bucket}/remote'
+        cabinets.sync(self.local, remote)
+        cabinets.create(f'{remote}/stale.txt', b'', parser=False)
+        cabinets.create(os.path.join(self.local, 'a.txt'), b'changed', parser=False)
+
+        result = cabinets.sync(self.local, remote, delete=True)
+        self.assertEqual([r.uri for r in result.copied], [f'{remote}/a.txt'])
+        self.assertEqual([r.uri for r in result.deleted], [f'{remote}/stale.txt'])
+        self.assertEqual(result.unchanged, 1)
+        self.assertCountEqual(cabinets.walk(remote), ['a.txt', 'sub/b.txt'])